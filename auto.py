@@ -1,18 +1,27 @@
+import argparse
+import asyncio
 import logging
-from typing import Optional
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
+from campaign import ApprovalQueue, CampaignScheduler, ChannelDispatcher, ChannelWorker, ContactIndex, partner_channel, \
+    partner_ids
 from commands import PartnerListCommand
-from config import DEFAULT_MESSAGE_TEMPLATE, MINUTE, MONTH
+from config import DEFAULT_MESSAGE_TEMPLATE, MINUTE, MONTH, DEFAULT_FOLLOWUP_DAYS, CHANNEL_TELEGRAM, CHANNEL_LINKEDIN, \
+    CHANNEL_UPWORK, Config
 from database import DatabaseManager, PartnerFilter
-from framework_inject.page_object.profile_page import ProfilePage
-from framework_inject.utils.time_util import wait_time
-from telegram import TelegramService
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from framework_inject.logger.log_setup import configure_logging, log_context, set_log_fields
+from framework_inject.metrics import MetricsRegistry
+from framework_inject.tracing import Tracer
+from framework_inject.page_object.constants import UPWORK_PROBE
+from telegram import TelegramMessenger, TelegramService
+from templates import MessageTemplate
+
+configure_logging()
 logger = logging.getLogger(__name__)
+tracer = Tracer.shared()
 
 
 class AutoMessenger:
@@ -21,6 +30,9 @@ class AutoMessenger:
         self.min_message_interval = min_message_interval
     
     def update_partner_followup_date(self, partner_id: str, set_datetime=None) -> bool:
+        return self.update_partners_followup_date([partner_id], set_datetime=set_datetime)
+    
+    def update_partners_followup_date(self, partner_ids: List[str], set_datetime=None) -> bool:
         set_date = None
         if set_datetime:
             if hasattr(set_datetime, 'date'):
@@ -29,7 +41,7 @@ class AutoMessenger:
                 set_date = set_datetime
         
         with DatabaseManager() as db:
-            return db.update_last_contacted(partner_id, set_date=set_date)
+            return db.update_last_contacted_many(partner_ids, set_date=set_date)
     
     def send_messages_to_filtered_partners(
         self,
@@ -37,8 +49,12 @@ class AutoMessenger:
         priority: Optional[str] = None,
         days_since_followup: Optional[int] = None,
         message_template: Optional[str] = None,
-        delay_between_messages: int = 2
+        delay_between_messages: int = 2,
+        time_budget: Optional[float] = None,
+        max_sends: Optional[int] = None
     ):
+        template = MessageTemplate.compile(message_template or "Hello {name}!").validate()
+        
         with self.db_manager:
             all_partners = self.db_manager.get_all_partners()
             
@@ -55,47 +71,67 @@ class AutoMessenger:
                 'sent': 0,
                 'skipped_no_telegram': 0,
                 'skipped_too_soon': 0,
-                'failed': 0
+                'failed': 0,
+                'deferred': 0
             }
             
-            for partner in filtered_partners:
-                telegram_link = partner.get('telegramLinkPrimaryLinkUrl')
-                name = partner.get('name', 'Unknown')
-                
-                if not telegram_link:
-                    logger.info(f"Skipping {name} - no Telegram link")
+            scheduler = CampaignScheduler(
+                time_budget=time_budget,
+                max_sends=max_sends,
+                followup_days=days_since_followup or DEFAULT_FOLLOWUP_DAYS
+            )
+            
+            for partner in ContactIndex(filtered_partners).recipients():
+                if not partner.get('telegramLinkPrimaryLinkUrl'):
+                    logger.info(f"Skipping {partner.get('name', 'Unknown')} - no Telegram link")
                     results['skipped_no_telegram'] += 1
                     continue
-                
-                message = message_template.replace('{name}', name) if message_template else f"Hello {name}!"
+                scheduler.push(partner, CHANNEL_TELEGRAM)
+            
+            def send_one(partner, channel) -> bool:
+                with log_context(partner_id=partner.get('id'), channel=channel), \
+                        tracer.track(f"partner {partner.get('name')}"), tracer.span('partner'):
+                    return _send_one(partner)
+            
+            def _send_one(partner) -> bool:
+                name = partner.get('name', 'Unknown')
+                message = template.render(partner)
                 
                 result = TelegramService.send_message_with_time_check(
-                    telegram_link,
+                    partner['telegramLinkPrimaryLinkUrl'],
                     message,
                     self.min_message_interval
                 )
                 
                 if result['sent']:
-                    logger.info(f"Message sent to {name}")
+                    logger.info("Message sent to %s", name)
                     results['sent'] += 1
-                    self.update_partner_followup_date(
-                        partner['id'], 
+                    self.update_partners_followup_date(
+                        partner_ids(partner),
                         set_datetime=result.get('last_msg_time')
                     )
                 elif result['reason'] == 'too_soon':
-                    logger.info(f"Skipped {name} - message sent {result['seconds_since_last']:.0f}s ago")
+                    logger.info("Skipped %s - message sent %.0fs ago", name, result['seconds_since_last'])
                     results['skipped_too_soon'] += 1
                 else:
                     logger.error(f"Failed to send message to {name}")
                     results['failed'] += 1
                 
                 if delay_between_messages > 0:
-                    import time
-                    time.sleep(delay_between_messages)
+                    with tracer.span('delay', seconds=delay_between_messages):
+                        time.sleep(delay_between_messages)
+                
+                return result['sent']
             
+            results['deferred'] = scheduler.run(send_one)['deferred']
             return results
     
-    def send_to_high_priority_needing_followup(self, days: int = 30):
+    def send_to_high_priority_needing_followup(
+        self,
+        days: int = 30,
+        time_budget: Optional[float] = None,
+        max_sends: Optional[int] = None
+    ):
         logger.info(f"Sending messages to HIGH priority partners needing follow-up (>{days} days)")
         
         message = "Hi {name}! Just following up on our previous conversation. How are things going?"
@@ -105,7 +141,9 @@ class AutoMessenger:
             priority='HIGH',
             days_since_followup=days,
             message_template=message,
-            delay_between_messages=3
+            delay_between_messages=3,
+            time_budget=time_budget,
+            max_sends=max_sends
         )
         
         logger.info(f"Results: {results}")
@@ -143,63 +181,152 @@ class AutoMessenger:
 
 
 class Auto:
-    def __init__(self):
+    def __init__(self, time_budget: Optional[float] = None, max_sends: Optional[int] = None,
+                 probe_profiles: bool = UPWORK_PROBE):
         self.auto = AutoMessenger(min_message_interval=MONTH)
         self.tg = 0
-        self.pp = ProfilePage()
+        self.page_pool = None
+        self.probe_profiles = probe_profiles
+        self.probe_executor = None
+        self.time_budget = time_budget
+        self.max_sends = max_sends
 
     def main(self):
+        set_log_fields(campaign_id=time.strftime('auto-%Y%m%d-%H%M%S'))
         partners_from_db = PartnerListCommand().execute()
-        for partner in partners_from_db:
-            if partner.get("status") not in ["DEAD"]:
-                # TELEGRAM:
-                if partner.get("telegramLinkPrimaryLinkUrl") != "":
-                    self.process_telegram_entry(partner)
-                    self.tg += 1
-                    continue
+        scheduler = CampaignScheduler()
+        active_partners = [partner for partner in partners_from_db if partner.get("status") not in ["DEAD"]]
+        for partner in ContactIndex(active_partners).recipients():
+            channel = partner_channel(partner)
+            if channel is None:
+                print(partner.get("name"), partner.get("telegramLinkPrimaryLinkUrl"), partner.get("linkedinLinkPrimaryLinkUrl"), partner.get("upworkLinkPrimaryLinkUrl"))
+                continue
+            if channel == CHANNEL_UPWORK and partner.get("countryAddressCountry") != "Ukraine":
+                continue
+            scheduler.push(partner, channel)
 
-                if partner.get("linkedinLinkPrimaryLinkUrl") != "":
-                    print(f'FOUND LINKEDIN: {partner.get("name")} | {partner.get("linkedinLinkPrimaryLinkUrl")}')
-                    continue
+        return asyncio.run(self.dispatch(scheduler))
 
-                # UPWORK
-                if partner.get("upworkLinkPrimaryLinkUrl") != "":
-                    if partner.get("countryAddressCountry") == "Ukraine":
-                        self.process_upwork_entry(partner)
-                        continue
+    async def dispatch(self, scheduler: CampaignScheduler):
+        workers = {
+            CHANNEL_UPWORK: ChannelWorker.for_channel(CHANNEL_UPWORK, self.process_upwork_entries, batch=True),
+            CHANNEL_LINKEDIN: ChannelWorker.for_channel(CHANNEL_LINKEDIN, self.process_linkedin_entry, blocking=True)
+        }
 
-                else:
-                    print(partner.get("name"), partner.get("telegramLinkPrimaryLinkUrl"), partner.get("linkedinLinkPrimaryLinkUrl"), partner.get("upworkLinkPrimaryLinkUrl"))
+        messenger = TelegramMessenger()
+        if await messenger.connect():
+            workers[CHANNEL_TELEGRAM] = ChannelWorker.for_channel(
+                CHANNEL_TELEGRAM,
+                lambda partner: self.process_telegram_entry(messenger, partner)
+            )
+        else:
+            logger.error("Failed to connect to Telegram, Telegram partners will be skipped")
 
-    def process_telegram_entry(self, partner):
+        try:
+            # Every Telegram partner syncs its history first; watermarks are written once for the whole run
+            with messenger.history.batch():
+                dispatcher = ChannelDispatcher(workers, time_budget=self.time_budget, max_sends=self.max_sends)
+                return await dispatcher.run(scheduler.ordered())
+        finally:
+            await messenger.disconnect()
+
+    async def process_telegram_entry(self, messenger: TelegramMessenger, partner) -> bool:
+        self.tg += 1
         print(partner.get('name'), partner.get("telegramLinkPrimaryLinkUrl"))
-        result = self.auto.message_single_user(partner.get('telegramLinkPrimaryLinkUrl'), DEFAULT_MESSAGE_TEMPLATE)
+        message = MessageTemplate.compile(DEFAULT_MESSAGE_TEMPLATE).render(partner)
+        result = await messenger.send_message_with_time_check(
+            partner.get('telegramLinkPrimaryLinkUrl'),
+            message,
+            self.auto.min_message_interval
+        )
         if result.get('sent'):
-            self.auto.update_partner_followup_date(partner_id=partner.get('id'))
+            await asyncio.to_thread(self.auto.update_partners_followup_date, partner_ids(partner))
             print(result, partner.get('id'), partner.get('name'))
         else:
             print(f"SKIP | USER: {partner.get('name')} WAS MESSAGED BEFORE")
-            self.auto.update_partner_followup_date(partner_id=partner.get('id'),
-                                              set_datetime=result.get('last_msg_time'))
+            await asyncio.to_thread(self.auto.update_partners_followup_date, partner_ids(partner),
+                                    set_datetime=result.get('last_msg_time'))
+        return bool(result.get('sent'))
 
-    def process_upwork_entry(self, partner):
-        print(partner.get('name'), partner.get("upworkLinkPrimaryLinkUrl"))
-        try:
-            # self.pp.open_profile_page(partner.get("upworkLinkPrimaryLinkUrl"))
-            self.pp.open_profile_page(partner.get("upworkLinkPrimaryLinkUrl"))
-            self.pp.open_messanger()
-            wait_time(5)
-            # self.pp.write_and_send_message(DEFAULT_MESSAGE_TEMPLATE)
-            # self.pp.confirm_send_message()
-            input("Confirm message...")
-            wait_time(5)
-        except:
-            print(f"FAILED - {partner}")
-            return
-        self.auto.update_partner_followup_date(partner_id=partner.get('id'))
+    def process_linkedin_entry(self, partner) -> bool:
+        print(f'FOUND LINKEDIN: {partner.get("name")} | {partner.get("linkedinLinkPrimaryLinkUrl")}')
+        return False
+
+    def process_upwork_entries(self, partners, budget=None) -> dict:
+        if self.page_pool is None:
+            # Playwright is only imported once there are Upwork partners to process
+            from framework_inject.browser_pool import PagePool
+            from framework_inject.page_object.profile_page import ProfilePage
+
+            # The browser is launched lazily on first use, and Playwright's sync API is bound to the thread that
+            # starts it, so the pool is created (and the browser started) by the browser worker
+            self.page_pool = PagePool(ProfilePage, size=Config.shared().tuning.browser_pool_size)
 
+        if self.probe_profiles:
+            partners = self.probe_upwork_profiles(partners)
+
+        template = MessageTemplate.compile(DEFAULT_MESSAGE_TEMPLATE)
+        queue = ApprovalQueue(
+            page_factory=self.page_pool.acquire,
+            release=self.page_pool.release,
+            prepare=lambda page, partner: self._prepare_draft(page, partner, template),
+            on_approved=lambda partner: self.auto.update_partners_followup_date(partner_ids(partner)),
+            # Every prepared draft holds a leased tab, so the lookahead can't exceed the pool
+            lookahead=min(Config.shared().tuning.approval_lookahead, self.page_pool.size)
+        )
+        summary = queue.run(partners, budget=budget)
+        self.page_pool.run_browser.save_storage_state()
+        return {'sent': summary['approved'], 'deferred': summary['deferred']}
+
+    @staticmethod
+    def _prepare_draft(page, partner, template):
+        with tracer.track(f"upwork {partner.get('name')}"), tracer.span('partner', partner_id=partner.get('id')):
+            return page.prepare_draft(partner.get("upworkLinkPrimaryLinkUrl"), template.render(partner))
+
+    def probe_upwork_profiles(self, partners) -> list:
+        """
+        Drop partners whose Upwork profile answered with a non-OK status or says it can't be messaged, checked
+        headlessly from the profile XHR before any draft is prepared. Partners whose probe failed are kept.
+        """
+        if self.probe_executor is None:
+            # The headless browser has its own Playwright instance, which can't share a thread with the headful one
+            self.probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upwork-probe")
+        return self.probe_executor.submit(self._probe_upwork_profiles, partners).result()
+
+    @staticmethod
+    def _probe_upwork_profiles(partners) -> list:
+        from framework_inject.page_object.profile_probe import ProfileProbe
+
+        probe = ProfileProbe()
+        reachable = []
+        for partner in partners:
+            result = probe.check(partner.get("upworkLinkPrimaryLinkUrl"))
+            # A failed probe (None) is unknown, not a reason to drop the partner
+            if result["reachable"] is not False and result["messageable"] is not False:
+                reachable.append(partner)
+            else:
+                print(f"SKIP | UPWORK PROFILE {partner.get('name')}: status {result['status']}, "
+                      f"messageable {result['messageable']} {result.get('error', '')}")
+        logger.info(f"Upwork probe: kept {len(reachable)}/{len(partners)} profiles")
+        return reachable
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Dispatch follow-ups to all channels')
+    parser.add_argument('--metrics-port', type=int, default=os.getenv('METRICS_PORT'),
+                        help='Serve Prometheus metrics on 127.0.0.1:PORT while running (env METRICS_PORT)')
+    parser.add_argument('--trace', nargs='?', const='', metavar='PATH',
+                        help='Record spans and write a Chrome trace (traces/auto-<time>.json unless PATH is given)')
+    args = parser.parse_args()
+    if args.metrics_port:
+        MetricsRegistry.shared().serve(int(args.metrics_port))
+    if args.trace is not None:
+        tracer.enable()
+
     a = Auto()
-    a.main()
+    try:
+        a.main()
+    finally:
+        logger.info(f"Run metrics written to {MetricsRegistry.shared().write_summary(run_name='auto')}")
+        if args.trace is not None:
+            logger.info(f"Trace written to {tracer.export(args.trace, run_name='auto')}")
     print(a.tg)
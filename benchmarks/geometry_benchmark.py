@@ -0,0 +1,95 @@
+"""
+Compares BasePage geometry helpers with the per-element protocol calls they replace.
+
+Builds a local fixture page with thousands of result rows (some hidden, most off screen) and times the closest /
+visible / in-viewport queries both ways in a headless Chromium.
+
+    python -m benchmarks.geometry_benchmark --nodes 5000 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("BROWSER", "ChromeBrowser")
+
+from playwright.sync_api import sync_playwright  # noqa: E402
+
+from framework_inject.base.base_page import BasePage  # noqa: E402
+
+ROW_SELECTOR = "//div[contains(@class, 'row')]"
+
+
+def fixture_html(nodes: int) -> str:
+    rows = []
+    for index in range(nodes):
+        style = ' style="display:none"' if index % 10 == 0 else ""
+        rows.append(f'<div class="row"{style}><span>Freelancer {index}</span><button>Message</button></div>')
+    return f"<html><body style='margin:0'>{''.join(rows)}</body></html>"
+
+
+def legacy_closest(page):
+    current_scroll = page.evaluate("window.scrollY")
+    closest, closest_distance, calls = None, float("inf"), 2
+    for element in page.query_selector_all(ROW_SELECTOR):
+        box = element.bounding_box()
+        calls += 1
+        if box and abs(box["y"] - current_scroll) < closest_distance:
+            closest, closest_distance = element, abs(box["y"] - current_scroll)
+    return closest, calls
+
+
+def legacy_in_viewport(page):
+    viewport = page.viewport_size
+    elements = page.query_selector_all(ROW_SELECTOR)
+    visible = []
+    for element in elements:
+        box = element.bounding_box()
+        if box and box["y"] + box["height"] > 0 and box["y"] < viewport["height"]:
+            visible.append(element)
+    return visible, 1 + len(elements)
+
+
+def timed(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(fixture_html(args.nodes))
+        page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
+        base_page = BasePage(page=page)
+
+        _, closest_calls = legacy_closest(page)
+        _, viewport_calls = legacy_in_viewport(page)
+        results = [
+            ("closest (per element)", timed(lambda: legacy_closest(page), args.repeat), closest_calls),
+            ("closest (evaluate)", timed(lambda: base_page.get_closest_element(ROW_SELECTOR), args.repeat), 1),
+            ("in viewport (per element)", timed(lambda: legacy_in_viewport(page), args.repeat), viewport_calls),
+            ("in viewport (evaluate)", timed(lambda: base_page.get_elements_in_viewport(ROW_SELECTOR), args.repeat), 1),
+            ("visible boxes (evaluate)", timed(lambda: base_page.get_element_boxes(ROW_SELECTOR, mode="visible"),
+                                              args.repeat), 1),
+        ]
+        browser.close()
+
+    print(f"{args.nodes} nodes, median of {args.repeat} runs")
+    print(f"{'query':<28}{'ms':>10}{'calls':>10}")
+    for name, seconds, calls in results:
+        print(f"{name:<28}{seconds * 1000:>10.1f}{calls:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Reports how long the CLI entry points take to import, from `python -X importtime`.
+
+Each target is imported in a fresh interpreter `--repeat` times; the median cumulative time of the target and the
+slowest top-level imports it pulls in are printed, and optionally written as JSON to track regressions.
+
+    python -m benchmarks.import_time_benchmark --repeat 5 --top 10
+    python -m benchmarks.import_time_benchmark main commands --output import_times.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGETS = ("main", "commands", "auto")
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(module: str):
+    """
+    Import `module` in a fresh interpreter and return (wall seconds, {module: (self_us, cumulative_us, depth)}).
+    """
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                            capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if result.returncode:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.splitlines()[-1]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return wall, modules
+
+
+def measure(module: str, repeat: int, top: int) -> dict:
+    walls, cumulative = [], defaultdict(list)
+    for _ in range(repeat):
+        wall, modules = import_times(module)
+        walls.append(wall)
+        for name, (_, cumulative_us, depth) in modules.items():
+            if depth <= 1:
+                cumulative[name].append(cumulative_us)
+
+    slowest = sorted(((statistics.median(times), name) for name, times in cumulative.items() if name != module),
+                     reverse=True)[:top]
+    return {
+        "module": module,
+        "import_ms": statistics.median(cumulative[module]) / 1000 if module in cumulative else None,
+        "process_ms": statistics.median(walls) * 1000,
+        "slowest": [{"module": name, "ms": us / 1000} for us, name in slowest]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for target in args.targets:
+        try:
+            result = measure(target, args.repeat, args.top)
+        except RuntimeError as e:
+            print(e)
+            continue
+        results.append(result)
+        print(f"{target}: import {result['import_ms']:.1f} ms, interpreter + import {result['process_ms']:.1f} ms")
+        for entry in result["slowest"]:
+            print(f"  {entry['ms']:8.1f} ms  {entry['module']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from framework_inject.utils.import_util import lazy_exports
+
+# Exported names and the submodule defining each. Submodules are imported on first access, so the dispatcher
+# (and asyncio) is only loaded by the actions that dispatch.
+_EXPORTS = {
+    'partner_channel': '.channels',
+    'partner_link': '.channels',
+    'partner_telegram_target': '.channels',
+    'ContactIndex': '.dedupe',
+    'contact_keys': '.dedupe',
+    'partner_ids': '.dedupe',
+    'CampaignScheduler': '.scheduler',
+    'CampaignPlanner': '.planner',
+    'PlanPrinter': '.planner',
+    'ChannelDispatcher': '.dispatcher',
+    'ChannelWorker': '.dispatcher',
+    'RateLimiter': '.dispatcher',
+    'SendBudget': '.dispatcher',
+    'ApprovalQueue': '.approval',
+    'Console': '.approval'
+}
+
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
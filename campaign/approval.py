@@ -0,0 +1,203 @@
+import logging
+import os
+import sys
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+APPROVE, REJECT, APPROVE_ALL, REJECT_ALL, QUIT = 'y', 'n', 'a', 'r', 'q'
+PROMPT = "[y] send  [n] reject  [a] send all prepared  [r] reject all prepared  [q] quit"
+
+
+class Console:
+    def __init__(self, stream=sys.stdin):
+        self.stream = stream
+        self.interactive = stream.isatty() and os.name == 'posix'
+
+    @contextmanager
+    def cbreak(self):
+        if not self.interactive:
+            yield
+            return
+
+        import termios
+        import tty
+        fd = self.stream.fileno()
+        previous = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            yield
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, previous)
+
+    def poll_key(self, timeout: Optional[float] = None) -> Optional[str]:
+        if not self.interactive:
+            if timeout == 0:
+                return None
+            line = self.stream.readline()
+            if not line:
+                return QUIT
+            return line.strip()[:1].lower() or None
+
+        import select
+        ready, _, _ = select.select([self.stream], [], [], timeout)
+        return self.stream.read(1).lower() if ready else None
+
+
+class Draft:
+    def __init__(self, partner: Dict, page=None, release: Optional[Callable] = None, error: Optional[str] = None):
+        self.partner = partner
+        self.page = page
+        self.release = release
+        self.error = error
+        self.prompted = False
+
+    def close(self):
+        if self.page is not None:
+            try:
+                if self.release:
+                    self.release(self.page)
+                else:
+                    self.page.close_tab()
+            except Exception as e:
+                logger.debug(f"Error closing draft tab: {e}")
+
+
+class ApprovalQueue:
+    """
+    Prepares browser drafts ahead of the operator and sends the approved ones.
+
+    While the operator looks at the current draft, up to `lookahead` further profiles are opened in
+    background tabs with the messenger dialog open and the text filled in. Approval is one keystroke.
+    """
+
+    def __init__(
+        self,
+        page_factory: Callable[[], object],
+        prepare: Callable[[object, Dict], None],
+        on_approved: Callable[[Dict], None],
+        lookahead: int = 3,
+        console: Optional[Console] = None,
+        release: Optional[Callable[[object], None]] = None
+    ):
+        self.page_factory = page_factory
+        self.release = release
+        self.prepare = prepare
+        self.on_approved = on_approved
+        self.lookahead = max(lookahead, 1)
+        self.console = console or Console()
+
+    def run(self, partners: Iterable[Dict], budget=None) -> Dict[str, int]:
+        """
+        Args:
+            partners: Partners to prepare drafts for, in order.
+            budget (Optional[SendBudget]): Shared dispatch budget. A slot is reserved per approved send; once the
+                deadline passes or no slot is left, the remaining partners are reported as deferred.
+        """
+        pending = deque(partners)
+        drafts = deque()
+        summary = {'approved': 0, 'rejected': 0, 'failed': 0, 'skipped': 0, 'deferred': 0}
+
+        with self.console.cbreak():
+            while pending or drafts:
+                if budget is not None and not budget.available():
+                    logger.info("Send budget exhausted, deferring the remaining drafts")
+                    summary['deferred'] += len(pending) + len(drafts)
+                    pending.clear()
+                    break
+
+                while drafts and drafts[0].error:
+                    failed = drafts.popleft()
+                    print(f"FAILED - {failed.partner.get('name')}: {failed.error}")
+                    summary['failed'] += 1
+
+                if drafts and not drafts[0].prompted:
+                    self._show(drafts[0], len(drafts) - 1, len(pending))
+
+                can_prepare = pending and len(drafts) < self.lookahead
+                key = self.console.poll_key(timeout=0 if can_prepare or not drafts else None)
+
+                if key is None:
+                    if can_prepare:
+                        drafts.append(self._prepare(pending.popleft()))
+                    continue
+
+                if key == QUIT:
+                    summary['skipped'] += len(pending) + len(drafts)
+                    pending.clear()
+                    break
+                if not drafts:
+                    continue
+
+                if key == APPROVE:
+                    self._approve(drafts.popleft(), summary, budget)
+                elif key == REJECT:
+                    self._reject(drafts.popleft(), summary)
+                elif key in (APPROVE_ALL, REJECT_ALL):
+                    while drafts:
+                        draft = drafts.popleft()
+                        if draft.error:
+                            summary['failed'] += 1
+                        elif key == APPROVE_ALL:
+                            self._approve(draft, summary, budget)
+                        else:
+                            self._reject(draft, summary)
+
+        for draft in drafts:
+            draft.close()
+
+        logger.info(f"Approval queue finished: {summary}")
+        return summary
+
+    def _prepare(self, partner: Dict) -> Draft:
+        page = None
+        try:
+            page = self.page_factory()
+            self.prepare(page, partner)
+            return Draft(partner, page, self.release)
+        except Exception as e:
+            draft = Draft(partner, page, self.release, error=str(e).splitlines()[0] if str(e) else e.__class__.__name__)
+            draft.close()
+            return draft
+
+    @staticmethod
+    def _show(draft: Draft, prepared: int, pending: int):
+        draft.prompted = True
+        try:
+            draft.page.page.bring_to_front()
+        except Exception as e:
+            logger.debug(f"Error focusing draft tab: {e}")
+        print(f"\n{draft.partner.get('name')} | {draft.partner.get('upworkLinkPrimaryLinkUrl')} "
+              f"({prepared} prepared, {pending} queued)")
+        print(PROMPT)
+
+    def _approve(self, draft: Draft, summary: Dict[str, int], budget=None):
+        if budget is not None and not budget.reserve():
+            print(f"DEFERRED - {draft.partner.get('name')}: send budget exhausted")
+            summary['deferred'] += 1
+            draft.close()
+            return
+
+        sent = False
+        try:
+            draft.page.page.bring_to_front()
+            draft.page.confirm_send_message()
+            sent = True
+            self.on_approved(draft.partner)
+            summary['approved'] += 1
+            print(f"SENT - {draft.partner.get('name')}")
+        except Exception as e:
+            logger.error(f"Failed to send draft to {draft.partner.get('name')}: {e}")
+            summary['failed'] += 1
+        finally:
+            if budget is not None:
+                budget.settle(sent)
+            draft.close()
+
+    @staticmethod
+    def _reject(draft: Draft, summary: Dict[str, int]):
+        draft.close()
+        summary['rejected'] += 1
+        print(f"REJECTED - {draft.partner.get('name')}")
@@ -0,0 +1,21 @@
+from typing import Dict, Optional
+
+from config import CHANNEL_TELEGRAM, CHANNEL_LINKEDIN, CHANNEL_UPWORK, CHANNEL_LINK_FIELDS
+
+CHANNEL_ORDER = (CHANNEL_TELEGRAM, CHANNEL_LINKEDIN, CHANNEL_UPWORK)
+
+
+def partner_link(partner: Dict, channel: str) -> Optional[str]:
+    link = partner.get(CHANNEL_LINK_FIELDS[channel])
+    return link.strip() if link and link.strip() else None
+
+
+def partner_channel(partner: Dict) -> Optional[str]:
+    for channel in CHANNEL_ORDER:
+        if partner_link(partner, channel):
+            return channel
+    return None
+
+
+def partner_telegram_target(partner: Dict) -> Optional[str]:
+    return partner.get('telegram_tag') or partner_link(partner, CHANNEL_TELEGRAM)
@@ -0,0 +1,122 @@
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import unquote, urlparse
+
+from config import CHANNEL_TELEGRAM, CHANNEL_LINKEDIN, CHANNEL_UPWORK, CHANNEL_LINK_FIELDS
+from telegram.identifiers import parse_telegram_identifier
+from .channels import partner_link
+
+logger = logging.getLogger(__name__)
+
+UPWORK_PROFILE_ID = re.compile(r'~[0-9a-z]+', re.IGNORECASE)
+
+
+def _url_path(url: str) -> str:
+    if '://' not in url:
+        url = 'https://' + url
+    return unquote(urlparse(url).path).strip('/').lower()
+
+
+def normalize_telegram(link: str) -> Optional[str]:
+    identifier = parse_telegram_identifier(link)
+    if isinstance(identifier, int):
+        return str(identifier)
+    identifier = identifier.strip('/').lower()
+    return identifier or None
+
+
+def normalize_upwork(link: str) -> Optional[str]:
+    match = UPWORK_PROFILE_ID.search(link)
+    if match:
+        return match.group(0).lower()
+    path = _url_path(link)
+    for prefix in ('freelancers/', 'fl/', 'o/profiles/users/'):
+        if path.startswith(prefix):
+            path = path[len(prefix):]
+    return path or None
+
+
+def normalize_linkedin(link: str) -> Optional[str]:
+    path = _url_path(link)
+    parts = path.split('/')
+    if len(parts) >= 2 and parts[0] in ('in', 'company', 'pub'):
+        return '/'.join(parts[:2])
+    return path or None
+
+
+NORMALIZERS = {
+    CHANNEL_TELEGRAM: normalize_telegram,
+    CHANNEL_UPWORK: normalize_upwork,
+    CHANNEL_LINKEDIN: normalize_linkedin
+}
+
+
+def contact_keys(partner: Dict) -> List[tuple]:
+    keys = []
+    for channel, normalize in NORMALIZERS.items():
+        link = partner_link(partner, channel)
+        if link:
+            key = normalize(link)
+            if key:
+                keys.append((channel, key))
+    return keys
+
+
+class ContactIndex:
+    def __init__(self, partners: Iterable[Dict] = ()):
+        self._partners: List[Dict] = []
+        self._parent: List[int] = []
+        self._by_key: Dict[tuple, int] = {}
+        for partner in partners:
+            self.add(partner)
+
+    def __len__(self):
+        return len(self._partners)
+
+    def add(self, partner: Dict):
+        position = len(self._partners)
+        self._partners.append(partner)
+        self._parent.append(position)
+
+        for key in contact_keys(partner):
+            other = self._by_key.setdefault(key, position)
+            if other != position:
+                self._union(other, position)
+
+    def groups(self) -> List[List[Dict]]:
+        grouped: Dict[int, List[Dict]] = {}
+        for position, partner in enumerate(self._partners):
+            grouped.setdefault(self._find(position), []).append(partner)
+        return list(grouped.values())
+
+    def recipients(self) -> List[Dict]:
+        recipients = []
+        for group in self.groups():
+            recipient = dict(group[0])
+            for duplicate in group[1:]:
+                for channel, field in CHANNEL_LINK_FIELDS.items():
+                    if not partner_link(recipient, channel) and partner_link(duplicate, channel):
+                        recipient[field] = duplicate[field]
+            recipient['partner_ids'] = [partner['id'] for partner in group]
+            recipients.append(recipient)
+
+        duplicates = len(self._partners) - len(recipients)
+        if duplicates:
+            logger.info(f"Merged {duplicates} duplicate partner rows into {len(recipients)} recipients")
+        return recipients
+
+    def _find(self, position: int) -> int:
+        while self._parent[position] != position:
+            self._parent[position] = self._parent[self._parent[position]]
+            position = self._parent[position]
+        return position
+
+    def _union(self, a: int, b: int):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def partner_ids(partner: Dict) -> List:
+    return partner.get('partner_ids') or [partner['id']]
@@ -0,0 +1,220 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from config import Config
+from framework_inject.logger.log_setup import log_context
+from framework_inject.tracing import Tracer
+
+logger = logging.getLogger(__name__)
+tracer = Tracer.shared()
+
+
+class RateLimiter:
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1 / rate if rate else 0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+            self._next_start = max(now, self._next_start) + self.interval
+
+
+class SendBudget:
+    """
+    Time and send-count budget shared by all channel workers.
+
+    A worker reserves a send before starting on a partner and settles it afterwards, so concurrent workers can't
+    all pass the check and overshoot `max_sends`. Thread-safe, as blocking and batch handlers run in executors.
+    """
+
+    def __init__(self, time_budget: Optional[float] = None, max_sends: Optional[int] = None):
+        self.deadline = time.monotonic() + time_budget if time_budget else None
+        self.max_sends = max_sends
+        self.sent = 0
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def reserve(self) -> bool:
+        """Claim one send slot; False once the deadline has passed or every slot is sent or reserved."""
+        with self._lock:
+            if self.expired():
+                return False
+            if self.max_sends is not None and self.sent + self._reserved >= self.max_sends:
+                return False
+            self._reserved += 1
+            return True
+
+    def available(self) -> bool:
+        """Whether a send could still be reserved, without reserving it."""
+        with self._lock:
+            if self.expired():
+                return False
+            return self.max_sends is None or self.sent + self._reserved < self.max_sends
+
+    def settle(self, sent: bool):
+        """Release a reserved slot, counting it as used if the send happened."""
+        with self._lock:
+            self._reserved -= 1
+            if sent:
+                self.sent += 1
+
+
+class ChannelWorker:
+    """
+    Handler for one channel queue.
+
+    Coroutine handlers run on the event loop; blocking handlers (browser, console prompts) run in a
+    dedicated thread pool of `concurrency` threads, so they never stall the other channels.
+    Batch handlers are blocking handlers called as handler(partners, budget) with the whole queue and the shared
+    SendBudget; they reserve/settle a slot per send, stop once the budget is spent, and return a dict with the
+    number 'sent' and 'deferred'.
+    """
+
+    def __init__(
+        self,
+        handler: Callable,
+        concurrency: int = 1,
+        rate: Optional[float] = None,
+        blocking: bool = False,
+        batch: bool = False
+    ):
+        self.handler = handler
+        self.concurrency = 1 if batch else max(concurrency, 1)
+        self.rate = rate
+        self.blocking = blocking or batch
+        self.batch = batch
+
+    @classmethod
+    def for_channel(cls, channel: str, handler: Callable, blocking: bool = False, batch: bool = False) -> 'ChannelWorker':
+        tuning = Config.shared().tuning
+        return cls(
+            handler,
+            concurrency=tuning.dispatch_concurrency.get(channel, 1),
+            rate=tuning.dispatch_rates.get(channel),
+            blocking=blocking,
+            batch=batch
+        )
+
+
+class ChannelDispatcher:
+    def __init__(
+        self,
+        workers: Dict[str, ChannelWorker],
+        time_budget: Optional[float] = None,
+        max_sends: Optional[int] = None
+    ):
+        self.workers = workers
+        self.time_budget = time_budget
+        self.max_sends = max_sends
+        self.budget = None
+
+    async def run(self, tasks: Iterable[Tuple[Dict, Optional[str]]]) -> Dict[str, Dict[str, int]]:
+        queues = {channel: asyncio.Queue() for channel in self.workers}
+        summary = {channel: {'processed': 0, 'sent': 0, 'failed': 0, 'deferred': 0} for channel in self.workers}
+
+        for partner, channel in tasks:
+            if channel in queues:
+                queues[channel].put_nowait(partner)
+            else:
+                logger.info(f"No worker for channel {channel}, skipping {partner.get('name')}")
+
+        self.budget = SendBudget(self.time_budget, self.max_sends)
+        executors = []
+        coroutines = []
+
+        for channel, worker in self.workers.items():
+            logger.info(f"Dispatching {queues[channel].qsize()} {channel} partner(s) to {worker.concurrency} worker(s)")
+            executor = None
+            if worker.blocking:
+                executor = ThreadPoolExecutor(max_workers=worker.concurrency, thread_name_prefix=f"{channel}-worker")
+                executors.append(executor)
+            if worker.batch:
+                coroutines.append(self._work_batch(worker, queues[channel], executor, summary[channel]))
+                continue
+            limiter = RateLimiter(worker.rate)
+            for _ in range(worker.concurrency):
+                coroutines.append(
+                    self._work(channel, worker, queues[channel], limiter, executor, summary[channel])
+                )
+
+        try:
+            await asyncio.gather(*coroutines)
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=False)
+
+        logger.info(f"Dispatch finished: {summary}")
+        return summary
+
+    async def _work_batch(self, worker, queue, executor, stats):
+        partners = []
+        while not queue.empty():
+            partners.append(queue.get_nowait())
+        if not partners:
+            return
+
+        if not self.budget.available():
+            stats['deferred'] += len(partners)
+            return
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, worker.handler, partners, self.budget)
+        except Exception as e:
+            logger.error(f"Batch worker failed: {e}")
+            stats['failed'] += len(partners)
+            return
+
+        # Sends were already counted in the budget by the handler's reserve/settle calls
+        stats['processed'] += len(partners) - result['deferred']
+        stats['sent'] += result['sent']
+        stats['deferred'] += result['deferred']
+
+    async def _work(self, channel, worker, queue, limiter, executor, stats):
+        loop = asyncio.get_running_loop()
+        while not queue.empty():
+            if not self.budget.reserve():
+                stats['deferred'] += queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+                return
+
+            partner = queue.get_nowait()
+            sent = False
+            with tracer.span('rate_limit', channel=channel):
+                await limiter.wait()
+
+            try:
+                with log_context(partner_id=partner.get('id'), channel=channel), \
+                        tracer.track(f"{channel} {partner.get('name')}"), \
+                        tracer.span('partner', channel=channel, partner_id=partner.get('id')):
+                    if worker.blocking:
+                        # run_in_executor doesn't carry context vars over to the worker thread
+                        handler = functools.partial(contextvars.copy_context().run, worker.handler, partner)
+                        sent = await loop.run_in_executor(executor, handler)
+                    else:
+                        sent = await worker.handler(partner)
+            except Exception as e:
+                logger.error(f"Worker failed on {partner.get('name')}: {e}")
+                stats['failed'] += 1
+                continue
+            finally:
+                self.budget.settle(bool(sent))
+
+            stats['processed'] += 1
+            if sent:
+                stats['sent'] += 1
@@ -0,0 +1,84 @@
+import logging
+from collections import Counter
+from typing import Dict, List, Optional
+
+from config import Config, TELEGRAM_CONNECT_SECONDS, TELEGRAM_CALL_LATENCY
+from .channels import partner_channel, partner_telegram_target
+from .dedupe import ContactIndex
+
+logger = logging.getLogger(__name__)
+
+PHASES = ('resolve', 'history', 'upload', 'send')
+
+
+class CampaignPlanner:
+    def __init__(
+        self,
+        latency: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        connect_seconds: float = TELEGRAM_CONNECT_SECONDS
+    ):
+        self.latency = dict(TELEGRAM_CALL_LATENCY, **(latency or {}))
+        self.rate_limits = dict(Config.shared().tuning.telegram_rate_limits, **(rate_limits or {}))
+        self.connect_seconds = connect_seconds
+
+    def call_seconds(self, phase: str) -> float:
+        rate = self.rate_limits.get(phase)
+        min_interval = 1 / rate if rate else 0
+        return max(self.latency.get(phase, 0), min_interval)
+
+    def plan(
+        self,
+        partners: List[Dict],
+        delay: int = 0,
+        attachments: Optional[List[str]] = None,
+        history_check: bool = False
+    ) -> Dict:
+        attachments = attachments or []
+        contacts = ContactIndex(partners).recipients()
+        channels = Counter(partner_channel(contact) or 'none' for contact in contacts)
+        recipients = [contact for contact in contacts if partner_telegram_target(contact)]
+
+        calls = {
+            'resolve': len(recipients),
+            'history': len(recipients) if history_check else 0,
+            'upload': len(set(attachments)) if recipients else 0,
+            'send': len(recipients) * max(len(attachments), 1)
+        }
+        phase_seconds = {phase: calls[phase] * self.call_seconds(phase) for phase in PHASES}
+        delay_seconds = delay * len(recipients) if delay > 0 else 0
+        total_seconds = (self.connect_seconds if recipients else 0) + sum(phase_seconds.values()) + delay_seconds
+
+        return {
+            'partners': len(partners),
+            'duplicates': len(partners) - len(contacts),
+            'channels': dict(channels),
+            'recipients': len(recipients),
+            'skipped_no_telegram': len(contacts) - len(recipients),
+            'calls': calls,
+            'phase_seconds': phase_seconds,
+            'delay_seconds': delay_seconds,
+            'total_seconds': total_seconds
+        }
+
+
+class PlanPrinter:
+    @staticmethod
+    def print(plan: Dict):
+        print("\n" + "="*60)
+        print(f"{'CAMPAIGN PLAN (dry run)':^60}")
+        print("="*60)
+
+        print(f"\nPartners matched: {plan['partners']} ({plan['duplicates']} duplicate rows merged)")
+        for channel, count in sorted(plan['channels'].items()):
+            print(f"  {channel:<10} {count}")
+        print(f"Telegram recipients: {plan['recipients']} (skipped without Telegram: {plan['skipped_no_telegram']})")
+
+        print(f"\n{'Phase':<10}{'API calls':>12}{'Seconds':>12}")
+        for phase in PHASES:
+            print(f"{phase:<10}{plan['calls'][phase]:>12}{plan['phase_seconds'][phase]:>12.1f}")
+        print(f"{'delay':<10}{'':>12}{plan['delay_seconds']:>12.1f}")
+
+        total = plan['total_seconds']
+        print(f"\nProjected wall-clock time: {total:.0f}s (~{total / 60:.1f} min)")
+        print("="*60 + "\n")
@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import logging
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from config import PRIORITY_WEIGHTS, DEFAULT_PRIORITY_WEIGHT, DEFAULT_FOLLOWUP_DAYS, CHANNEL_COSTS
+from .channels import partner_channel
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignScheduler:
+    COST_SMOOTHING = 0.3
+
+    def __init__(
+        self,
+        time_budget: Optional[float] = None,
+        max_sends: Optional[int] = None,
+        followup_days: int = DEFAULT_FOLLOWUP_DAYS,
+        channel_costs: Optional[Dict[str, float]] = None
+    ):
+        self.time_budget = time_budget
+        self.max_sends = max_sends
+        self.followup_days = followup_days
+        self.channel_costs = dict(CHANNEL_COSTS, **(channel_costs or {}))
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def days_overdue(self, partner: Dict, today: Optional[date] = None) -> int:
+        last_followup = partner.get('lastFollowUp') or partner.get('createdAt')
+        if not last_followup:
+            return self.followup_days
+        if isinstance(last_followup, str):
+            last_followup = datetime.fromisoformat(last_followup)
+        if isinstance(last_followup, datetime):
+            last_followup = last_followup.date()
+        days_since = ((today or date.today()) - last_followup).days
+        return max(days_since - self.followup_days, 0)
+
+    def score(self, partner: Dict, channel: Optional[str] = None) -> float:
+        channel = channel or partner_channel(partner)
+        weight = PRIORITY_WEIGHTS.get(partner.get('priopity'), DEFAULT_PRIORITY_WEIGHT)
+        value = weight * (1 + self.days_overdue(partner) / self.followup_days)
+        return value / self.channel_costs.get(channel, 1)
+
+    def push(self, partner: Dict, channel: Optional[str] = None):
+        channel = channel or partner_channel(partner)
+        heapq.heappush(self._heap, (-self.score(partner, channel), next(self._counter), channel, partner))
+
+    def extend(self, partners: Iterable[Dict]):
+        for partner in partners:
+            self.push(partner)
+
+    def ordered(self) -> Iterator[Tuple[Dict, Optional[str]]]:
+        while self._heap:
+            _, _, channel, partner = heapq.heappop(self._heap)
+            yield partner, channel
+
+    def run(self, handler: Callable[[Dict, Optional[str]], bool]) -> Dict:
+        started = time.monotonic()
+        deadline = started + self.time_budget if self.time_budget else None
+        summary = {'processed': 0, 'sent': 0, 'deferred': 0, 'stopped': 'completed'}
+
+        while self._heap:
+            if self.max_sends is not None and summary['sent'] >= self.max_sends:
+                summary['stopped'] = 'send_budget'
+                break
+
+            _, _, channel, partner = heapq.heappop(self._heap)
+            estimated_cost = self.channel_costs.get(channel, 1)
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    summary['deferred'] += 1
+                    summary['stopped'] = 'deadline'
+                    break
+                if estimated_cost > remaining:
+                    logger.info(f"Deferring {partner.get('name')} - {channel} needs ~{estimated_cost:.0f}s, {remaining:.0f}s left")
+                    summary['deferred'] += 1
+                    continue
+
+            task_started = time.monotonic()
+            sent = handler(partner, channel)
+            self._observe_cost(channel, time.monotonic() - task_started)
+
+            summary['processed'] += 1
+            if sent:
+                summary['sent'] += 1
+
+        summary['deferred'] += len(self._heap)
+        summary['elapsed'] = time.monotonic() - started
+        self._heap.clear()
+        logger.info(f"Scheduler finished ({summary['stopped']}): {summary}")
+        return summary
+
+    def _observe_cost(self, channel: Optional[str], seconds: float):
+        previous = self.channel_costs.get(channel, seconds)
+        self.channel_costs[channel] = previous + self.COST_SMOOTHING * (seconds - previous)
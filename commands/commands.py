@@ -1,36 +1,53 @@
 import sys
 import logging
-from typing import Optional
+import os
+from typing import Optional, List
 
-from database import DatabaseManager, PartnerPrinter, PartnerFilter
-from telegram import TelegramService
+from campaign import CampaignPlanner, PlanPrinter, ContactIndex, partner_telegram_target, partner_ids
+from config import DEFAULT_MESSAGE_TEMPLATE
+from database import PartnerCache, PartnerPrinter, PartnerFilter
+from templates import MessageTemplate, TemplateError
 
 logger = logging.getLogger(__name__)
 
 
 class PartnerListCommand:
-    def __init__(self):
-        self.db = DatabaseManager()
+    def __init__(self, cached: bool = False):
+        self.cached = cached
+        self.cache = PartnerCache()
         self.printer = PartnerPrinter()
         self.partner_filter = PartnerFilter()
     
     def execute(self):
         try:
-            with self.db:
-                partners = self.db.get_all_partners()
-                partners = self.partner_filter.filter_partners(
-                    partners,
-                    days_since_followup=30
-                                                    )
-                print(len(partners))
+            partners = self._load_partners()
+            partners = self.partner_filter.filter_partners(
+                partners,
+                days_since_followup=30
+                                                )
+            print(len(partners))
             return partners
         except Exception as e:
             logger.error(f"Error listing partners: {e}")
             sys.exit(1)
+    
+    def _load_partners(self):
+        if self.cached and self.cache.exists():
+            logger.info(f"Using cached partners ({self.cache.age():.0f}s old)")
+            return self.cache.load()
+        
+        from database import DatabaseManager
+        
+        with DatabaseManager() as db:
+            partners = db.get_all_partners()
+        self.cache.save(partners)
+        return partners
 
 
 class PartnerListTelegramCommand:
     def __init__(self):
+        from database import DatabaseManager
+        
         self.db = DatabaseManager()
         self.printer = PartnerPrinter()
     
@@ -49,15 +66,28 @@ class SendMessagesCommand:
         self,
         message: Optional[str] = None,
         telegram_tag: Optional[str] = None,
-        delay: int = 2
+        delay: int = 2,
+        attachments: Optional[List[str]] = None,
+        plan: bool = False
     ):
+        from database import DatabaseManager
+        from telegram import TelegramService
+        
         self.db = DatabaseManager()
         self.telegram_service = TelegramService()
         self.message = message
         self.telegram_tag = telegram_tag
         self.delay = delay
+        self.attachments = attachments or []
+        self.plan = plan
     
     def execute(self):
+        try:
+            MessageTemplate.compile(self.message or DEFAULT_MESSAGE_TEMPLATE).validate()
+        except TemplateError as e:
+            logger.error(str(e))
+            sys.exit(1)
+        
         try:
             with self.db:
                 partners = self._get_partners()
@@ -66,18 +96,30 @@ class SendMessagesCommand:
                     logger.warning("No partners found to message")
                     return
                 
-                if not self._confirm_sending(partners):
+                missing = [path for path in self.attachments if not os.path.isfile(path)]
+                if missing:
+                    logger.error(f"Attachment file(s) not found: {', '.join(missing)}")
+                    return
+                
+                if self.plan:
+                    PlanPrinter.print(CampaignPlanner().plan(partners, self.delay, self.attachments))
+                    return
+                
+                recipients = ContactIndex(partners).recipients()
+                
+                if not self._confirm_sending(recipients):
                     print("Operation cancelled.")
                     return
                 
                 results = self.telegram_service.send_messages_sync(
-                    partners,
+                    recipients,
                     self.message,
-                    self.delay
+                    self.delay,
+                    self.attachments
                 )
                 
                 self._display_results(results)
-                self._update_contacts(partners)
+                self._update_contacts(recipients)
         
         except Exception as e:
             logger.error(f"Error sending Telegram messages: {e}")
@@ -93,8 +135,12 @@ class SendMessagesCommand:
     
     def _confirm_sending(self, partners):
         print(f"\nPreparing to message {len(partners)} partner(s)...")
+        for path in self.attachments:
+            print(f"  Attachment: {path}")
         for partner in partners:
-            print(f"  - {partner['name']} (@{partner['telegram_tag']})")
+            duplicates = len(partner_ids(partner)) - 1
+            suffix = f" [+{duplicates} duplicate row(s)]" if duplicates else ""
+            print(f"  - {partner['name']} (@{partner_telegram_target(partner)}){suffix}")
         
         response = input("\nDo you want to proceed? (yes/no): ")
         return response.lower() in ['yes', 'y']
@@ -105,20 +151,23 @@ class SendMessagesCommand:
         print(f"Failed: {results['failed']}")
     
     def _update_contacts(self, partners):
-        for partner in partners:
-            self.db.update_last_contacted(partner['id'])
+        self.db.update_last_contacted_many(
+            partner_id for partner in partners for partner_id in partner_ids(partner)
+        )
 
 
 class CommandFactory:
     @staticmethod
     def create(action: str, **kwargs):
         commands = {
-            'list': PartnerListCommand,
+            'list': lambda: PartnerListCommand(cached=kwargs.get('cached', False)),
             'list-telegram': PartnerListTelegramCommand,
             'send': lambda: SendMessagesCommand(
                 message=kwargs.get('message'),
                 telegram_tag=kwargs.get('tag'),
-                delay=kwargs.get('delay', 2)
+                delay=kwargs.get('delay', 2),
+                attachments=kwargs.get('attachments'),
+                plan=kwargs.get('plan', False)
             )
         }
         
@@ -1,5 +1,11 @@
-from .config import Config
+from .config import Config, ConfigError
 from .constants import *
 
-__all__ = ['Config', 'PARTNERS_TABLE', 'DEFAULT_MESSAGE_TEMPLATE', 'DEFAULT_DB_PORT', 'DEFAULT_TELEGRAM_SESSION_NAME', 'DEFAULT_MESSAGE_DELAY']
+__all__ = ['Config', 'ConfigError', 'PARTNERS_TABLE', 'DEFAULT_MESSAGE_TEMPLATE', 'DEFAULT_DB_PORT', 'DEFAULT_TELEGRAM_SESSION_NAME', 'DEFAULT_MESSAGE_DELAY',
+           'HISTORY_CACHE_DIR', 'DEFAULT_HISTORY_SYNC_LIMIT', 'TELEGRAM_UPLOAD_TTL',
+           'PARTNER_FIELDS', 'PARTNER_FIELD_DEFAULTS', 'CHANNEL_TELEGRAM', 'CHANNEL_LINKEDIN', 'CHANNEL_UPWORK',
+           'CHANNEL_LINK_FIELDS', 'PRIORITY_WEIGHTS', 'DEFAULT_PRIORITY_WEIGHT', 'DEFAULT_FOLLOWUP_DAYS', 'CHANNEL_COSTS',
+           'TELEGRAM_CONNECT_SECONDS', 'TELEGRAM_CALL_LATENCY', 'TELEGRAM_RATE_LIMITS',
+           'DISPATCH_CONCURRENCY', 'DISPATCH_RATES', 'APPROVAL_LOOKAHEAD', 'BROWSER_POOL_SIZE',
+           'REQUIRED_CONFIG_FIELDS', 'PARTNERS_CACHE_FILE']
 
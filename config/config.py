@@ -1,48 +1,196 @@
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from dotenv import load_dotenv
+from threading import Lock
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
 
-from .constants import DEFAULT_DB_PORT, DEFAULT_TELEGRAM_SESSION_NAME
+from .constants import DEFAULT_DB_PORT, DEFAULT_TELEGRAM_SESSION_NAME, HISTORY_CACHE_DIR, DEFAULT_MESSAGE_DELAY, \
+    DISPATCH_CONCURRENCY, DISPATCH_RATES, TELEGRAM_RATE_LIMITS, APPROVAL_LOOKAHEAD, BROWSER_POOL_SIZE, \
+    REQUIRED_CONFIG_FIELDS
 
 
+class ConfigError(Exception):
+    pass
+
+
+def _env(name, default=None, cast: Callable = str, errors: Optional[list] = None):
+    value = os.getenv(name)
+    if value is None or value == '':
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        errors.append(f"{name}={value!r} is not a valid {cast.__name__}")
+        return default
+
+
+def _env_mapping(name, defaults: Mapping, cast: Callable, errors: list) -> Mapping:
+    """Overrides in the form NAME="key=value,key=value" merged over `defaults`, read-only."""
+    merged = dict(defaults)
+    for item in filter(None, (part.strip() for part in os.getenv(name, '').split(','))):
+        key, _, value = item.partition('=')
+        try:
+            merged[key.strip()] = cast(value.strip()) if value.strip().lower() != 'none' else None
+        except ValueError:
+            errors.append(f"{name}: {item!r} is not key={cast.__name__}")
+    return MappingProxyType(merged)
+
+
+@dataclass(frozen=True)
+class DatabaseConfig:
+    host: str = 'localhost'
+    port: int = DEFAULT_DB_PORT
+    database: Optional[str] = None
+    user: Optional[str] = None
+    password: Optional[str] = None
+
+    def to_dict(self):
+        return {
+            'host': self.host,
+            'port': self.port,
+            'database': self.database,
+            'user': self.user,
+            'password': self.password
+        }
+
+
+@dataclass(frozen=True)
+class TelegramConfig:
+    api_id: Optional[str] = None
+    api_hash: Optional[str] = None
+    phone: Optional[str] = None
+    session_name: str = DEFAULT_TELEGRAM_SESSION_NAME
+
+    def to_dict(self):
+        return {
+            'api_id': self.api_id,
+            'api_hash': self.api_hash,
+            'phone': self.phone,
+            'session_name': self.session_name
+        }
+
+
+@dataclass(frozen=True)
+class TuningConfig:
+    """Pool sizes, rate limits and concurrency; constants.py holds the defaults, env vars override them."""
+    dispatch_concurrency: Mapping[str, int] = field(default_factory=lambda: MappingProxyType(DISPATCH_CONCURRENCY))
+    dispatch_rates: Mapping[str, Optional[float]] = field(default_factory=lambda: MappingProxyType(DISPATCH_RATES))
+    telegram_rate_limits: Mapping[str, float] = field(
+        default_factory=lambda: MappingProxyType(TELEGRAM_RATE_LIMITS))
+    approval_lookahead: int = APPROVAL_LOOKAHEAD
+    browser_pool_size: int = BROWSER_POOL_SIZE
+    message_delay: int = DEFAULT_MESSAGE_DELAY
+
+
+@dataclass(frozen=True)
 class Config:
-    def __init__(self):
-        self.base_dir = Path(__file__).resolve().parent.parent
-        self.env_path = self.base_dir / '.env'
-        load_dotenv(self.env_path)
-        
-        self.db = self.DatabaseConfig()
-        self.telegram = self.TelegramConfig()
-    
-    class DatabaseConfig:
-        def __init__(self):
-            self.host = os.getenv('DB_HOST', 'localhost')
-            self.port = int(os.getenv('DB_PORT', DEFAULT_DB_PORT))
-            self.database = os.getenv('DB_NAME')
-            self.user = os.getenv('DB_USER')
-            self.password = os.getenv('DB_PASSWORD')
-        
-        def to_dict(self):
-            return {
-                'host': self.host,
-                'port': self.port,
-                'database': self.database,
-                'user': self.user,
-                'password': self.password
-            }
-    
-    class TelegramConfig:
-        def __init__(self):
-            self.api_id = os.getenv('TELEGRAM_API_ID')
-            self.api_hash = os.getenv('TELEGRAM_API_HASH')
-            self.phone = os.getenv('TELEGRAM_PHONE')
-            self.session_name = os.getenv('TELEGRAM_SESSION_NAME', DEFAULT_TELEGRAM_SESSION_NAME)
-        
-        def to_dict(self):
-            return {
-                'api_id': self.api_id,
-                'api_hash': self.api_hash,
-                'phone': self.phone,
-                'session_name': self.session_name
-            }
+    """
+    Settings read from the environment (and .env) once per process.
+
+    Use `Config.shared()` instead of constructing one: it loads and validates on first use, and `Config.reload()`
+    re-reads .env and the environment explicitly. Values set in the process environment win over .env; keys the
+    last load took from .env are replaced with the file's current values on reload. Malformed values raise
+    ConfigError on load; missing required values are reported by `validate()`.
+    """
+    base_dir: Path
+    env_path: Path
+    history_dir: Path
+    db: DatabaseConfig
+    telegram: TelegramConfig
+    tuning: TuningConfig
+
+    _shared = None
+    _lock = Lock()
+    # Keys the last load took from .env, with the value they had there
+    _env_file_values = {}
+
+    @classmethod
+    def load(cls, env_path: Optional[Path] = None) -> 'Config':
+        base_dir = Path(__file__).resolve().parent.parent
+        env_path = Path(env_path or base_dir / '.env')
+        cls._load_env_file(env_path)
+        errors = []
+
+        config = cls(
+            base_dir=base_dir,
+            env_path=env_path,
+            history_dir=Path(os.getenv('TELEGRAM_HISTORY_DIR', base_dir / HISTORY_CACHE_DIR)),
+            db=DatabaseConfig(
+                host=_env('DB_HOST', 'localhost'),
+                port=_env('DB_PORT', DEFAULT_DB_PORT, int, errors),
+                database=_env('DB_NAME'),
+                user=_env('DB_USER'),
+                password=_env('DB_PASSWORD')
+            ),
+            telegram=TelegramConfig(
+                api_id=_env('TELEGRAM_API_ID'),
+                api_hash=_env('TELEGRAM_API_HASH'),
+                phone=_env('TELEGRAM_PHONE'),
+                session_name=_env('TELEGRAM_SESSION_NAME', DEFAULT_TELEGRAM_SESSION_NAME)
+            ),
+            tuning=TuningConfig(
+                dispatch_concurrency=_env_mapping('DISPATCH_CONCURRENCY', DISPATCH_CONCURRENCY, int, errors),
+                dispatch_rates=_env_mapping('DISPATCH_RATES', DISPATCH_RATES, float, errors),
+                telegram_rate_limits=_env_mapping('TELEGRAM_RATE_LIMITS', TELEGRAM_RATE_LIMITS, float, errors),
+                approval_lookahead=_env('APPROVAL_LOOKAHEAD', APPROVAL_LOOKAHEAD, int, errors),
+                browser_pool_size=_env('BROWSER_POOL_SIZE', BROWSER_POOL_SIZE, int, errors),
+                message_delay=_env('MESSAGE_DELAY', DEFAULT_MESSAGE_DELAY, int, errors)
+            )
+        )
+        if errors:
+            raise ConfigError("Invalid settings in the environment / .env:\n- " + "\n- ".join(errors))
+        return config
+
+    @classmethod
+    def _load_env_file(cls, env_path: Path):
+        """
+        Like `load_dotenv(env_path)`, but a key still holding the value the previous load took from the file is
+        updated to the file's current value (or removed with it), so edits to .env are seen on reload.
+        """
+        from dotenv import dotenv_values
+
+        current = {key: value for key, value in dotenv_values(env_path).items() if value is not None}
+        for key, previous in cls._env_file_values.items():
+            if os.environ.get(key) != previous:
+                continue  # changed in the process environment since, which wins
+            if key in current:
+                os.environ[key] = current[key]
+            else:
+                del os.environ[key]
+        for key, value in current.items():
+            os.environ.setdefault(key, value)
+        cls._env_file_values = {key: value for key, value in current.items() if os.environ.get(key) == value}
+
+    @classmethod
+    def shared(cls) -> 'Config':
+        with cls._lock:
+            if cls._shared is None:
+                cls._shared = cls.load()
+            return cls._shared
+
+    @classmethod
+    def reload(cls, env_path: Optional[Path] = None) -> 'Config':
+        config = cls.load(env_path)
+        with cls._lock:
+            cls._shared = config
+        return config
+
+    def validate(self, *sections: str) -> 'Config':
+        """
+        Check that the required fields of the given sections ('db', 'telegram') are set.
+
+        Raises:
+            ConfigError: Listing every missing env variable, so all of them can be fixed in one go.
+        """
+        missing = [
+            env_name
+            for section in sections
+            for name, env_name in REQUIRED_CONFIG_FIELDS[section].items()
+            if getattr(getattr(self, section), name) in (None, '')
+        ]
+        if missing:
+            raise ConfigError("PLEASE COPY VARIABLES FROM .env.example TO .env FILE. Missing or empty: "
+                              + ", ".join(missing))
+        return self
 
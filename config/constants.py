@@ -12,3 +12,72 @@ MONTH = DAY * 27
 DEFAULT_DB_PORT = 5432
 DEFAULT_TELEGRAM_SESSION_NAME = 'follow_up_session'
 DEFAULT_MESSAGE_DELAY = 2
+
+HISTORY_CACHE_DIR = '.history'
+DEFAULT_HISTORY_SYNC_LIMIT = 50
+TELEGRAM_UPLOAD_TTL = HOUR * 12
+
+PARTNER_FIELDS = (
+    'id', 'name', 'priopity', 'lastFollowUp', 'createdAt', 'status',
+    'telegramLinkPrimaryLinkUrl', 'upworkLinkPrimaryLinkUrl', 'linkedinLinkPrimaryLinkUrl', 'countryAddressCountry'
+)
+# Rendered for a missing partner field when the template placeholder has no default of its own
+PARTNER_FIELD_DEFAULTS = {'name': 'Unknown'}
+
+CHANNEL_TELEGRAM = 'telegram'
+CHANNEL_LINKEDIN = 'linkedin'
+CHANNEL_UPWORK = 'upwork'
+CHANNEL_LINK_FIELDS = {
+    CHANNEL_TELEGRAM: 'telegramLinkPrimaryLinkUrl',
+    CHANNEL_LINKEDIN: 'linkedinLinkPrimaryLinkUrl',
+    CHANNEL_UPWORK: 'upworkLinkPrimaryLinkUrl'
+}
+
+PRIORITY_WEIGHTS = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+DEFAULT_PRIORITY_WEIGHT = 1
+DEFAULT_FOLLOWUP_DAYS = 30
+# Estimated seconds spent per partner on each channel
+CHANNEL_COSTS = {
+    CHANNEL_TELEGRAM: 5,
+    CHANNEL_LINKEDIN: 1,
+    CHANNEL_UPWORK: 40
+}
+
+TELEGRAM_CONNECT_SECONDS = 2.0
+# Average latency (seconds) and sustained rate limit (calls per second) per Telegram API phase
+TELEGRAM_CALL_LATENCY = {
+    'resolve': 0.3,
+    'history': 0.4,
+    'upload': 1.5,
+    'send': 0.3
+}
+TELEGRAM_RATE_LIMITS = {
+    'resolve': 1.0,
+    'history': 2.0,
+    'upload': 1.0,
+    'send': 1.0
+}
+
+# Dispatcher workers per channel and tasks started per second (None = unlimited)
+DISPATCH_CONCURRENCY = {
+    CHANNEL_TELEGRAM: 3,
+    CHANNEL_UPWORK: 1,
+    CHANNEL_LINKEDIN: 1
+}
+DISPATCH_RATES = {
+    CHANNEL_TELEGRAM: 0.5,
+    CHANNEL_UPWORK: None,
+    CHANNEL_LINKEDIN: None
+}
+APPROVAL_LOOKAHEAD = 3
+# Browser tabs kept for Upwork drafts; the approval queue holds one leased tab per prepared draft
+BROWSER_POOL_SIZE = 3
+
+# Env variables that must be set for each Config section, checked by Config.validate()
+REQUIRED_CONFIG_FIELDS = {
+    'db': {'database': 'DB_NAME', 'user': 'DB_USER', 'password': 'DB_PASSWORD'},
+    'telegram': {'api_id': 'TELEGRAM_API_ID', 'api_hash': 'TELEGRAM_API_HASH', 'phone': 'TELEGRAM_PHONE'}
+}
+
+# Local copy of the last partner list fetched from the database, used by `list --cached`
+PARTNERS_CACHE_FILE = '.cache/partners.json'
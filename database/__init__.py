@@ -1,5 +1,13 @@
-from .database import DatabaseManager, PartnerPrinter, PartnerFilter
-from .queries import PartnerQueries
+from framework_inject.utils.import_util import lazy_exports
 
-__all__ = ['DatabaseManager', 'PartnerPrinter', 'PartnerFilter', 'PartnerQueries']
+# Exported names and the submodule defining each. Submodules are imported on first access, so the partner
+# helpers and cache can be used without importing the database driver.
+_EXPORTS = {
+    'DatabaseManager': '.database',
+    'PartnerPrinter': '.partners',
+    'PartnerFilter': '.partners',
+    'PartnerCache': '.partners',
+    'PartnerQueries': '.queries'
+}
 
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
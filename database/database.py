@@ -1,24 +1,38 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from typing import List, Dict
 import logging
 
 from config import Config
+from framework_inject.metrics import MetricsRegistry
+from framework_inject.tracing import Tracer
 from .queries import PartnerQueries
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+tracer = Tracer.shared()
+
+DB_QUERY_SECONDS = MetricsRegistry.shared().histogram("db_query_seconds", "Database query latency, by query")
+DB_COMMIT_SECONDS = MetricsRegistry.shared().histogram("db_commit_seconds", "Database commit latency, by query")
+DB_ROWS = MetricsRegistry.shared().counter("db_rows_total", "Rows returned or updated, by query")
 
 
 class DatabaseManager:
     def __init__(self):
-        self.config = Config().db.to_dict()
+        self.config = Config.shared().db.to_dict()
         self.connection = None
     
+    @staticmethod
+    @contextmanager
+    def _measure(phase: str, query: str):
+        histogram = DB_COMMIT_SECONDS if phase == 'commit' else DB_QUERY_SECONDS
+        with tracer.span(f'db.{phase}', query=query), histogram.time(query=query):
+            yield
+    
     def connect(self):
         try:
-            self.connection = psycopg2.connect(**self.config)
+            with tracer.span('db.connect'):
+                self.connection = psycopg2.connect(**self.config)
             logger.info("Successfully connected to the database")
         except psycopg2.Error as e:
             logger.error(f"Error connecting to database: {e}")
@@ -41,8 +55,10 @@ class DatabaseManager:
         
         try:
             with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query)
-                partners = cursor.fetchall()
+                with self._measure('query', 'get_all_partners'):
+                    cursor.execute(query)
+                    partners = cursor.fetchall()
+                DB_ROWS.inc(len(partners), query='get_all_partners')
                 logger.info(f"Retrieved {len(partners)} partners from database")
                 return [dict(partner) for partner in partners]
         except psycopg2.Error as e:
@@ -54,8 +70,10 @@ class DatabaseManager:
         
         try:
             with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, (telegram_tag,))
-                partners = cursor.fetchall()
+                with self._measure('query', 'get_partners_by_telegram_tag'):
+                    cursor.execute(query, (telegram_tag,))
+                    partners = cursor.fetchall()
+                DB_ROWS.inc(len(partners), query='get_partners_by_telegram_tag')
                 logger.info(f"Retrieved {len(partners)} partners with tag {telegram_tag}")
                 return [dict(partner) for partner in partners]
         except psycopg2.Error as e:
@@ -67,8 +85,10 @@ class DatabaseManager:
         
         try:
             with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query)
-                partners = cursor.fetchall()
+                with self._measure('query', 'get_partners_with_telegram'):
+                    cursor.execute(query)
+                    partners = cursor.fetchall()
+                DB_ROWS.inc(len(partners), query='get_partners_with_telegram')
                 logger.info(f"Retrieved {len(partners)} partners with telegram tags")
                 return [dict(partner) for partner in partners]
         except psycopg2.Error as e:
@@ -85,100 +105,40 @@ class DatabaseManager:
         
         try:
             with self.connection.cursor() as cursor:
-                cursor.execute(query, params)
-                self.connection.commit()
+                with self._measure('query', 'update_last_contacted'):
+                    cursor.execute(query, params)
+                with self._measure('commit', 'update_last_contacted'):
+                    self.connection.commit()
+                DB_ROWS.inc(cursor.rowcount, query='update_last_contacted')
                 logger.info(f"Updated lastFollowUp for partner ID {partner_id} to {set_date or 'current date'}")
                 return True
         except psycopg2.Error as e:
             logger.error(f"Error updating lastFollowUp: {e}")
             self.connection.rollback()
             return False
-
-
-class PartnerFilter:
-    @staticmethod
-    def normalize_followup_date(partner: Dict) -> Dict:
-        if not partner.get('lastFollowUp') and partner.get('createdAt'):
-            if isinstance(partner['createdAt'], str):
-                from datetime import datetime as dt
-                partner['lastFollowUp'] = dt.fromisoformat(partner['createdAt']).date()
-            else:
-                partner['lastFollowUp'] = partner['createdAt']
-            logger.info(f"Using createdAt as lastFollowUp for {partner.get('name')}")
-        return partner
     
-    @staticmethod
-    def filter_by_followup_date(partners: List[Dict], days_ago: int = 30) -> List[Dict]:
-        cutoff_date = datetime.now().date() - timedelta(days=days_ago)
-        
-        filtered = []
-        for partner in partners:
-            partner = PartnerFilter.normalize_followup_date(partner)
-            last_followup = partner.get('lastFollowUp')
-            if last_followup and last_followup < cutoff_date:
-                filtered.append(partner)
-        
-        logger.info(f"Filtered {len(filtered)} partners with lastFollowUp > {days_ago} days ago")
-        return filtered
-    
-    @staticmethod
-    def filter_by_status(partners: List[Dict], status: str) -> List[Dict]:
-        filtered = [p for p in partners if p.get('status') == status]
-        logger.info(f"Filtered {len(filtered)} partners with status {status}")
-        return filtered
-    
-    @staticmethod
-    def filter_by_priority(partners: List[Dict], priority: str) -> List[Dict]:
-        filtered = [p for p in partners if p.get('priopity') == priority]
-        logger.info(f"Filtered {len(filtered)} partners with priority {priority}")
-        return filtered
-    
-    @staticmethod
-    def filter_partners(
-        partners: List[Dict],
-        status: Optional[str] = None,
-        priority: Optional[str] = None,
-        days_since_followup: Optional[int] = None
-    ) -> List[Dict]:
-        filtered = partners
-        
-        if status:
-            filtered = PartnerFilter.filter_by_status(filtered, status)
-        
-        if priority:
-            filtered = PartnerFilter.filter_by_priority(filtered, priority)
+    def update_last_contacted_many(self, partner_ids: List, set_date=None) -> bool:
+        partner_ids = list(partner_ids)
+        if not partner_ids:
+            return True
         
-        if days_since_followup:
-            filtered = PartnerFilter.filter_by_followup_date(filtered, days_since_followup)
-        
-        return filtered
-
-
-class PartnerPrinter:
-    @staticmethod
-    def print(partners: List[Dict]):
-        if not partners:
-            print("No partners found.")
-            return
-        
-        print("\n" + "="*100)
-        print(f"{'PARTNERS LIST':^100}")
-        print("="*100)
-        
-        for partner in partners:
-            name = partner.get('name', 'N/A')
-            telegram_link = partner.get('telegramLinkPrimaryLinkUrl', 'N/A')
-            upwork_link = partner.get('upworkLinkPrimaryLinkUrl', 'N/A')
-            status = partner.get('status', 'N/A')
-            priority = partner.get('priopity', 'N/A')
-            last_followup = partner.get('lastFollowUp', 'N/A')
-            
-            print(f"\n{name} - {upwork_link}")
-            print(f"  Status: {status} | Priority: {priority} | Last Follow-up: {last_followup}")
-            if telegram_link:
-                print(f"  Telegram: {telegram_link}")
+        if set_date:
+            query = PartnerQueries.update_last_followup_many_with_date()
+            params = (set_date, partner_ids)
+        else:
+            query = PartnerQueries.update_last_followup_many()
+            params = (partner_ids,)
         
-        print("\n" + "="*100)
-        print(f"Total partners: {len(partners)}")
-        print("="*100 + "\n")
-
+        try:
+            with self.connection.cursor() as cursor:
+                with self._measure('query', 'update_last_contacted_many'):
+                    cursor.execute(query, params)
+                with self._measure('commit', 'update_last_contacted_many'):
+                    self.connection.commit()
+                DB_ROWS.inc(cursor.rowcount, query='update_last_contacted_many')
+                logger.info(f"Updated lastFollowUp for {cursor.rowcount} partner(s) {partner_ids} to {set_date or 'current date'}")
+                return True
+        except psycopg2.Error as e:
+            logger.error(f"Error updating lastFollowUp: {e}")
+            self.connection.rollback()
+            return False
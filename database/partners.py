@@ -0,0 +1,145 @@
+from typing import List, Dict, Optional
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import json
+import logging
+import os
+import time
+
+from config import Config, PARTNERS_CACHE_FILE
+
+logger = logging.getLogger(__name__)
+
+
+class PartnerFilter:
+    @staticmethod
+    def normalize_followup_date(partner: Dict) -> Dict:
+        if not partner.get('lastFollowUp') and partner.get('createdAt'):
+            if isinstance(partner['createdAt'], str):
+                from datetime import datetime as dt
+                partner['lastFollowUp'] = dt.fromisoformat(partner['createdAt']).date()
+            else:
+                partner['lastFollowUp'] = partner['createdAt']
+            logger.info("Using createdAt as lastFollowUp for %s", partner.get('name'),
+                        extra={'partner_id': partner.get('id')})
+        return partner
+    
+    @staticmethod
+    def filter_by_followup_date(partners: List[Dict], days_ago: int = 30) -> List[Dict]:
+        cutoff_date = datetime.now().date() - timedelta(days=days_ago)
+        
+        filtered = []
+        for partner in partners:
+            partner = PartnerFilter.normalize_followup_date(partner)
+            last_followup = partner.get('lastFollowUp')
+            if last_followup and last_followup < cutoff_date:
+                filtered.append(partner)
+        
+        logger.info(f"Filtered {len(filtered)} partners with lastFollowUp > {days_ago} days ago")
+        return filtered
+    
+    @staticmethod
+    def filter_by_status(partners: List[Dict], status: str) -> List[Dict]:
+        filtered = [p for p in partners if p.get('status') == status]
+        logger.info(f"Filtered {len(filtered)} partners with status {status}")
+        return filtered
+    
+    @staticmethod
+    def filter_by_priority(partners: List[Dict], priority: str) -> List[Dict]:
+        filtered = [p for p in partners if p.get('priopity') == priority]
+        logger.info(f"Filtered {len(filtered)} partners with priority {priority}")
+        return filtered
+    
+    @staticmethod
+    def filter_partners(
+        partners: List[Dict],
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        days_since_followup: Optional[int] = None
+    ) -> List[Dict]:
+        filtered = partners
+        
+        if status:
+            filtered = PartnerFilter.filter_by_status(filtered, status)
+        
+        if priority:
+            filtered = PartnerFilter.filter_by_priority(filtered, priority)
+        
+        if days_since_followup:
+            filtered = PartnerFilter.filter_by_followup_date(filtered, days_since_followup)
+        
+        return filtered
+
+
+class PartnerPrinter:
+    @staticmethod
+    def print(partners: List[Dict]):
+        if not partners:
+            print("No partners found.")
+            return
+        
+        print("\n" + "="*100)
+        print(f"{'PARTNERS LIST':^100}")
+        print("="*100)
+        
+        for partner in partners:
+            name = partner.get('name', 'N/A')
+            telegram_link = partner.get('telegramLinkPrimaryLinkUrl', 'N/A')
+            upwork_link = partner.get('upworkLinkPrimaryLinkUrl', 'N/A')
+            status = partner.get('status', 'N/A')
+            priority = partner.get('priopity', 'N/A')
+            last_followup = partner.get('lastFollowUp', 'N/A')
+            
+            print(f"\n{name} - {upwork_link}")
+            print(f"  Status: {status} | Priority: {priority} | Last Follow-up: {last_followup}")
+            if telegram_link:
+                print(f"  Telegram: {telegram_link}")
+        
+        print("\n" + "="*100)
+        print(f"Total partners: {len(partners)}")
+        print("="*100 + "\n")
+
+
+class PartnerCache:
+    """
+    Local JSON copy of the last partner list fetched from the database, so `list --cached` can run without
+    connecting (or importing the database driver). Dates round-trip with their type.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or Config.shared().base_dir / PARTNERS_CACHE_FILE)
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, datetime):
+            return {'__datetime__': value.isoformat()}
+        if isinstance(value, date):
+            return {'__date__': value.isoformat()}
+        return str(value)
+
+    @staticmethod
+    def _decode(obj: Dict):
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+        return obj
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def age(self) -> Optional[float]:
+        """Seconds since the cache was written, or None if there is none."""
+        return time.time() - self.path.stat().st_mtime if self.exists() else None
+
+    def load(self) -> List[Dict]:
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f, object_hook=self._decode)
+
+    def save(self, partners: List[Dict]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(partners, f, default=self._encode, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Cached {len(partners)} partners to {self.path}")
@@ -101,3 +101,19 @@ class PartnerQueries:
             SET "lastFollowUp" = %s
             WHERE id = %s
         """
+    
+    @staticmethod
+    def update_last_followup_many():
+        return f"""
+            UPDATE {PARTNERS_TABLE}
+            SET "lastFollowUp" = CURRENT_DATE
+            WHERE id = ANY(%s)
+        """
+    
+    @staticmethod
+    def update_last_followup_many_with_date():
+        return f"""
+            UPDATE {PARTNERS_TABLE}
+            SET "lastFollowUp" = %s
+            WHERE id = ANY(%s)
+        """
@@ -0,0 +1,125 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import asyncio
+import time
+
+from playwright.async_api import async_playwright
+
+from framework_inject.browser import DriverWebSocket, browser, CHROME_PROFILE_DIR, CHROME_VIEWPORT, CHROME_USER_AGENT, \
+    EXTRA_HTTP_HEADERS, HIDE_WEBDRIVER_SCRIPT, BROWSER_ATTACH, STORAGE_STATE_PATH, RESTORE_LOCAL_STORAGE_SCRIPT, \
+    read_storage_state, missing_cookies
+from framework_inject.constants import PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS, BROWSERS, CHROME_BROWSER, \
+    REMOTE_CHROME_BROWSER
+from framework_inject.logger.logger import Logger
+from framework_inject.request_blocker import RequestBlocker
+from framework_inject.screenshots import ScreenshotWriter
+
+
+class AsyncRunBrowser(Logger):
+    """
+    Async counterpart of RunBrowser: one browser per event loop, shared by all async page objects on that loop.
+    """
+    _instances = {}
+
+    def __init__(self, port=None, logger=__file__):
+        super().__init__(logger)
+        self.port = port
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+
+    @classmethod
+    async def get(cls, port=None) -> "AsyncRunBrowser":
+        loop = asyncio.get_running_loop()
+        instance = cls._instances.get(loop)
+        if instance is None:
+            instance = cls(port=port)
+            await instance.start()
+            cls._instances[loop] = instance
+        return instance
+
+    async def start(self):
+        if browser not in BROWSERS:
+            raise Exception("No Such Browser")
+
+        started = time.perf_counter()
+        self.playwright = await async_playwright().start()
+        ws_url = None
+        if browser == REMOTE_CHROME_BROWSER or (browser == CHROME_BROWSER and BROWSER_ATTACH):
+            ws_url = await asyncio.to_thread(DriverWebSocket(port=self.port).get_websocket_debugger_url)
+
+        if browser == REMOTE_CHROME_BROWSER and not ws_url:
+            raise Exception(f"No remote Chrome is listening on port {self.port}")
+        if ws_url:
+            self.browser = await self.playwright.chromium.connect_over_cdp(ws_url)
+            self.context = self.browser.contexts[0]
+        elif browser == CHROME_BROWSER:
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                headless=False,
+                user_data_dir=CHROME_PROFILE_DIR,
+                viewport=CHROME_VIEWPORT,
+                user_agent=CHROME_USER_AGENT
+            )
+        else:
+            raise Exception(f"Async browser is not supported for {browser}")
+
+        await self.context.set_extra_http_headers(EXTRA_HTTP_HEADERS)
+        await self.context.add_init_script(HIDE_WEBDRIVER_SCRIPT)
+        await self.restore_storage_state()
+        if browser == CHROME_BROWSER:
+            await RequestBlocker.shared().attach_async(self.context)
+        self.page = await self.new_page()
+        self.logger.info(f"{'Attached to' if ws_url else 'Launched'} Chrome in {time.perf_counter() - started:.2f}s")
+
+    async def restore_storage_state(self, path=STORAGE_STATE_PATH):
+        state = read_storage_state(path)
+        if not state:
+            return False
+        cookies = missing_cookies(state.get("cookies") or [], await self.context.cookies())
+        if cookies:
+            await self.context.add_cookies(cookies)
+        origins = [entry for entry in state.get("origins") or [] if entry.get("localStorage")]
+        if origins:
+            page = await self.context.new_page()
+            try:
+                await page.route("**/*", self._blank_document)
+                for entry in origins:
+                    await page.goto(entry["origin"])
+                    await page.evaluate(RESTORE_LOCAL_STORAGE_SCRIPT, entry["localStorage"])
+            except Exception as e:
+                self.logger.debug(f"Error restoring localStorage: {e}")
+            finally:
+                await page.close()
+        return True
+
+    @staticmethod
+    async def _blank_document(route):
+        await route.fulfill(status=200, content_type="text/html", body="")
+
+    async def save_storage_state(self, path=STORAGE_STATE_PATH):
+        if not self.context or not path:
+            return
+        try:
+            await self.context.storage_state(path=path)
+        except Exception as e:
+            self.logger.debug(f"Error saving storage state: {e}")
+
+    async def new_page(self):
+        page = await self.context.new_page()
+        page.set_default_timeout(PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS)
+        return page
+
+    async def close_browser(self):
+        """Close the browser and forget the instance for the current loop."""
+        await self.save_storage_state()
+        await asyncio.to_thread(ScreenshotWriter.shared().flush)
+        if self.browser:
+            await self.browser.close()
+        elif self.context:
+            await self.context.close()
+        if self.playwright:
+            await self.playwright.stop()
+        for loop, instance in list(self._instances.items()):
+            if instance is self:
+                del self._instances[loop]
@@ -0,0 +1,515 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import asyncio
+import random
+import time as timer
+from abc import ABC
+from typing import Awaitable, Callable, List, Dict, Any, Optional
+from playwright.async_api import Page, Frame, Locator, Response
+
+from framework_inject.async_browser import AsyncRunBrowser
+from framework_inject.constants import DEFAULT_WAIT_TIME_MS, READY_TIMEOUT_MS, NETWORK_IDLE_MS, \
+    READY_POLL_INTERVAL_MS, LOCATOR_CACHE_SIZE, SCREENSHOT_DIR
+from framework_inject.logger.logger import Logger
+from framework_inject.base.context import Context
+from framework_inject.base.request_tracker import RequestTracker
+from framework_inject.screenshots import ScreenshotWriter, screenshot_options, screenshot_path, cdp_capture_params, \
+    decode_cdp_capture
+from framework_inject.base.geometry import ElementBox, ALL, VISIBLE, IN_VIEWPORT, BOXES_SCRIPT, CLOSEST_SCRIPT, \
+    ELEMENT_CLIP_SCRIPT, to_boxes
+
+
+class AsyncBasePage(ABC, Logger):
+    """
+    `playwright.async_api` flavour of BasePage with the same method surface, awaitable.
+
+    Page objects can't do I/O in __init__, so build them with `await PageClass.create()` (which starts or
+    reuses the browser of the running loop) or pass an existing async `page`.
+    """
+
+    def __init__(self, logger=__file__, page: Optional[Page] = None, run_browser: Optional[AsyncRunBrowser] = None):
+        super().__init__(logger)
+        self.context = Context()
+        self.context["I"] = self
+        self._locators = {}
+        self.run_browser = run_browser
+        self.page = page or (run_browser.page if run_browser else None)
+        self.browser = run_browser.browser if run_browser else None
+        self.browser_context = run_browser.context if run_browser else (page.context if page else None)
+
+    @classmethod
+    async def create(cls, port=None, new_tab: bool = False, **kwargs):
+        run_browser = await AsyncRunBrowser.get(port=port)
+        page = await run_browser.new_page() if new_tab else None
+        return cls(page=page, run_browser=run_browser, **kwargs)
+
+    async def goto(self, url):
+        self._locators.clear()
+        await self.page.goto(url)
+
+    def locator(self, selector: str, frame: Optional[Frame] = None, prev_elem: Optional[Locator] = None) -> Locator:
+        """
+        Return a locator for `selector`, reusing the one built earlier for the same target.
+
+        Locators are lazy (building one costs no protocol call) and auto-wait on every action, so helpers act on them
+        directly instead of waiting for the selector first and querying it again.
+        """
+        target = prev_elem or frame or self.page
+        key = (target, selector)
+        element = self._locators.get(key)
+        if element is None:
+            if len(self._locators) >= LOCATOR_CACHE_SIZE:
+                self._locators.clear()
+            element = self._locators[key] = target.locator(selector)
+        return element
+
+    async def new_tab(self) -> Page:
+        """
+        Open a new tab in the current browser context without switching this page object to it.
+        """
+        return await self.run_browser.new_page()
+
+    async def close_tab(self):
+        """
+        Close the tab this page object is bound to.
+        """
+        if not self.page.is_closed():
+            await self.page.close()
+
+    async def set_auth_token(self, token: str) -> None:
+        """
+        Set an authorization token in localStorage and refresh the page.
+        """
+        self.logger.debug("Set an authorization token")
+        await self.page.evaluate(f"window.localStorage.setItem('token', '{token}');")
+        await self.page.reload()
+
+    async def get_cookies(self) -> List[Dict[str, Any]]:
+        """
+        Get the cookies from the browser context.
+        """
+        return await self.page.context.cookies()
+
+    async def get_element(self, selector: str, frame: Optional[Frame] | Optional[Locator] = None, prev_elem=None,
+                    time=DEFAULT_WAIT_TIME_MS) -> Optional[Locator]:
+        """
+        Get a single element on the page or in a specific frame.
+
+        Args:
+            selector (str): The selector for the element.
+            frame (Frame, optional): The specific frame to search in. Defaults to the main page.
+            prev_elem (Locator, optional): Parent element to search within; returned without waiting.
+
+        Returns:
+            Optional[Locator]: The element if it appeared within `time`, None otherwise.
+        """
+        element = self.locator(selector, frame=frame, prev_elem=prev_elem)
+        if prev_elem:
+            return element
+        try:
+            await element.first.wait_for(timeout=time)
+            return element
+        except Exception as e:
+            self.logger.debug(f"Error getting element from '{selector}': {str(e)}")
+            return None
+
+    async def get_elements_list(self, selector: str, element: Optional[Any] = None, frame: Optional[Frame] = None):
+        """
+        Get a list of elements on the page, in a specific frame, or within a given element.
+
+        Args:
+            selector (str): The selector for the elements.
+            element (Optional[Locator], optional): The parent element to search within. Defaults to None (page level).
+            frame (Frame, optional): The specific frame to search in. Defaults to the main page.
+
+        Returns:
+            List[Locator]: A list of elements matching the selector.
+        """
+        elements = self.locator(selector, frame=frame, prev_elem=element)
+        try:
+            await elements.first.wait_for(timeout=DEFAULT_WAIT_TIME_MS)
+            return await elements.all()
+        except Exception as e:
+            self.logger.debug(f"Error getting elements list from '{selector}': {str(e)}")
+            return []
+
+    async def wait_for_element(self, selector: str, time: int | float = DEFAULT_WAIT_TIME_MS,
+                               frame: Optional[Frame] = None, prev_elem: Optional[Locator] = None, state=None):
+        """
+        Wait for an element to appear on the page or in a specific frame.
+        """
+        target = frame or self.page
+        if prev_elem:
+            if not await prev_elem.locator(selector).first.is_visible():
+                raise Exception("No such Element")
+        else:
+            await target.wait_for_selector(selector, timeout=time, state=state)
+
+    async def wait_for_element_conditional(self, selector: str,
+                                           time: int | float = DEFAULT_WAIT_TIME_MS,
+                                           frame: Optional[Frame] = None,
+                                           state=None,
+                                           prev_elem: Optional[Locator] = None) -> bool:
+        """
+        Wait for an element to appear on the page or in a specific frame, conditionally based on a previous element.
+
+        Returns:
+            bool: True if the element appears within the timeout, False otherwise.
+        """
+        target = frame or self.page
+        try:
+            if prev_elem:
+                return await prev_elem.locator(selector).is_visible()
+            await target.wait_for_selector(selector, timeout=time, state=state)
+            return True
+        except Exception as e:
+            self.logger.debug(f"Exception: {e}")
+            return False
+
+    async def wait_for_enabled(self, selector: str, time: int | float = READY_TIMEOUT_MS,
+                               frame: Optional[Frame] = None) -> bool:
+        """
+        Wait until an element is attached and enabled, polling in the browser instead of sleeping.
+        """
+        target = frame or self.page
+        try:
+            handle = await target.wait_for_selector(selector, timeout=time, state="attached")
+            await target.wait_for_function(
+                "element => !element.disabled && element.getAttribute('aria-disabled') !== 'true'",
+                arg=handle, timeout=time
+            )
+            return True
+        except Exception as e:
+            self.logger.debug(f"Element '{selector}' was not enabled in {time}ms: {e}")
+            return False
+
+    def track_requests(self, url_part: str) -> RequestTracker:
+        """
+        Start counting requests whose URL contains `url_part`; see BasePage.track_requests.
+        """
+        return RequestTracker(self.page, url_part)
+
+    async def wait_for_network_idle(self, tracker: RequestTracker, idle_ms: int = NETWORK_IDLE_MS,
+                                    time: int | float = READY_TIMEOUT_MS) -> bool:
+        """
+        Wait until no tracked request has been in flight for `idle_ms`.
+        """
+        deadline = timer.monotonic() + time / 1000
+        while timer.monotonic() < deadline:
+            if tracker.is_idle(idle_ms):
+                return True
+            await asyncio.sleep(READY_POLL_INTERVAL_MS / 1000)
+        self.logger.debug(f"Requests to '{tracker.url_part}' still in flight after {time}ms")
+        return False
+
+    async def get_element_attribute(self, selector: str, attr: str, frame: Optional[Frame] = None,
+                              prev_elem: Optional[Locator] = None) -> Optional[str]:
+        """
+        Retrieve an attribute of an element on the page or within a specific frame.
+
+        Args:
+            selector (str): The selector for the element.
+            attr (str): The attribute name.
+            frame (Frame, optional): The specific frame to search in. Defaults to the main page.
+            prev_elem (Locator, optional): Parent element to search within.
+
+        Returns:
+            Optional[str]: The attribute value if found, None otherwise.
+        """
+        try:
+            element = self.locator(selector, frame=frame, prev_elem=prev_elem)
+            return await element.get_attribute(attr, timeout=DEFAULT_WAIT_TIME_MS)
+        except Exception as e:
+            self.logger.debug(f"Error retrieving '{attr}' attribute from element '{selector}': {str(e)}")
+            return None
+
+    async def get_iframe(self, iframe_selector: str, parent_frame: Optional[Frame] = None) -> Frame:
+        """
+        Returns the iframe element (handles both top-level and nested iframes).
+        """
+        target = parent_frame or self.page
+        iframe_element = await target.wait_for_selector(iframe_selector)
+        return await iframe_element.content_frame()
+
+    async def get_nested_iframe(self, selectors: list) -> Frame:
+        """
+        Traverses nested iframes and returns the innermost Frame.
+        """
+        current_frame = None
+        for selector in selectors:
+            current_frame = await self.get_iframe(selector, parent_frame=current_frame)
+        return current_frame
+
+    def connect_selectors(self, selectors: list, frame: Optional[Frame] = None):
+        target = frame or self.page
+        for selector in selectors:
+            target = target.locator(selector)
+        return target
+
+    async def click(self, selector: str, frame: Optional[Frame] = None, prev_elem: Optional[Locator] = None):
+        """
+        Click an element on the page or in a specific frame. The locator waits for the element to be actionable.
+        """
+        await self.locator(selector, frame=frame, prev_elem=prev_elem).click()
+
+    async def force_click(self, locator: str, frame: Optional[Frame] = None) -> bool:
+        """
+        Forces a click on the element by evaluating JavaScript if necessary.
+
+        Args:
+            locator (str): The selector for the element to click.
+            frame (Frame, optional): The specific frame to perform the click in. Defaults to the main page.
+
+        Returns:
+            bool: True if the click is successful, False otherwise.
+        """
+        target = frame or self.page
+        try:
+            element = await target.wait_for_selector(locator, timeout=DEFAULT_WAIT_TIME_MS, state="attached")
+            # Visibility/enabled checks and the click happen in a single evaluate
+            clicked = await element.evaluate("""element => {
+                const rect = element.getBoundingClientRect();
+                if (!rect.width || !rect.height || element.disabled) return false;
+                element.click();
+                return true;
+            }""")
+            if clicked:
+                self.logger.debug(f"Successfully clicked element: {locator}")
+            else:
+                self.logger.debug(f"Element found but not interactable: {locator}")
+            return clicked
+        except Exception as e:
+            self.logger.debug(f"Unexpected error during force click: {str(e)}")
+            return False
+
+    async def scroll_and_click(self, selector: str, frame: Optional[Frame] = None):
+        """Scrolls to an element and clicks it; the locator click scrolls into view and moves the mouse itself."""
+        await self.click(selector, frame)
+
+    async def scroll_page(self, selector: str, frame: Optional[Frame] = None):
+        """Scrolls to the element."""
+        target = frame or self.page
+        await target.locator(selector).first.scroll_into_view_if_needed()
+
+    async def scroll_page_to_end(self):
+        await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+    async def move_and_click(self, selector: str, frame: Optional[Frame] = None):
+        await self.click(selector, frame)
+
+    async def fill_text(self, selector: str, text: str, frame: Optional[Frame] = None):
+        """
+        Fill a text field on the page or in a specific frame.
+        """
+        await self.locator(selector, frame=frame).fill(text)
+
+    async def fill_text_slowly(self, selector: str, text: str, frame: Optional[Frame] = None):
+        """
+        Fill a text field on the page or in a specific frame, typing slowly like a human.
+        """
+        element = self.locator(selector, frame=frame)
+        await element.click()
+        await element.press_sequentially(text, delay=random.uniform(50, 150))
+
+    async def move_mouse_to(self, selector: str, frame: Optional[Frame] = None):
+        """
+        Move the mouse pointer to the center of an element on the page or in a specific frame.
+        """
+        await self.locator(selector, frame=frame).hover()
+
+    async def click_and_fill_text(self, selector: str, text: str, frame: Optional[Frame] = None):
+        """
+        Click an input (moving the mouse onto it) and fill it: two round trips on one cached locator.
+        """
+        element = self.locator(selector, frame=frame)
+        await element.click()
+        await element.fill(text)
+
+    async def capture_full_page_screenshot(self, folder: str = SCREENSHOT_DIR, file_name: Optional[str] = None,
+                                     tag: Optional[str] = None, image_format: Optional[str] = None,
+                                     quality: Optional[int] = None, clip: Optional[Dict] = None) -> Optional[str]:
+        """
+        Capture a screenshot of the entire page (or of `clip`) and hand it to the background writer.
+
+        Args:
+            folder (str): The folder where the screenshot will be saved. Defaults to "logs/screenshots".
+            file_name (Optional[str]): The name of the screenshot file. If not provided, a timestamped name will be used.
+            tag (Optional[str]): A tag to include in the file name.
+            image_format (Optional[str]): "png", "jpeg" or "webp". Defaults to SCREENSHOT_FORMAT.
+            quality (Optional[int]): 0-100 for lossy formats. Defaults to SCREENSHOT_QUALITY.
+            clip (Optional[Dict]): {"x", "y", "width", "height"} region of the page instead of the full page.
+
+        Returns:
+            Optional[str]: The path the screenshot is being written to, None if the capture failed.
+        """
+        options = screenshot_options(image_format, quality, clip)
+        file_path = screenshot_path(folder, file_name, tag or "screenshot", options["type"])
+        try:
+            ScreenshotWriter.shared().submit(await self._capture(options), file_path)
+            return file_path
+        except Exception as e:
+            self.logger.debug(f"Error capturing full page screenshot: {str(e)}")
+            return None
+
+    async def capture_element_screenshot(self, selector: str, folder: str = SCREENSHOT_DIR, file_name: Optional[str] = None,
+                                   tag: Optional[str] = None, frame: Optional[Frame] = None,
+                                   prev_elem: Optional[Locator] = None, image_format: Optional[str] = None,
+                                   quality: Optional[int] = None) -> Optional[str]:
+        """
+        Capture a screenshot of a specific element and hand it to the background writer.
+
+        Args:
+            selector (str): The selector of the element to capture.
+            folder (str): The folder where the screenshot will be saved. Defaults to "logs/screenshots".
+            file_name (Optional[str]): The name of the screenshot file. If not provided, a timestamped name will be used.
+            tag (Optional[str]): A tag to include in the file name.
+            image_format (Optional[str]): "png", "jpeg" or "webp". Defaults to SCREENSHOT_FORMAT.
+            quality (Optional[int]): 0-100 for lossy formats. Defaults to SCREENSHOT_QUALITY.
+
+        Returns:
+            Optional[str]: The path the screenshot is being written to, None if the capture failed.
+        """
+        options = screenshot_options(image_format, quality)
+        file_path = screenshot_path(folder, file_name, tag or "element_screenshot", options["type"])
+        try:
+            element = await self.get_element(selector, frame=frame, prev_elem=prev_elem)
+            if not element:
+                raise ValueError(f"Element with selector '{selector}' not found.")
+            ScreenshotWriter.shared().submit(await self._capture(options, element=element.first), file_path)
+            self.logger.info(f"Element screenshot queued for {file_path}")
+            return file_path
+        except Exception as e:
+            self.logger.info(f"Error capturing element screenshot: {str(e)}")
+            return None
+
+    async def _capture(self, options: Dict, element: Optional[Locator] = None) -> bytes:
+        """
+        Encode a screenshot in the browser and return its bytes. PNG/JPEG use Playwright; WebP uses CDP directly.
+        """
+        if options["type"] != "webp":
+            if element is not None:
+                return await element.screenshot(type=options["type"], quality=options.get("quality"))
+            return await self.page.screenshot(full_page="clip" not in options, **options)
+
+        session = await self.page.context.new_cdp_session(self.page)
+        try:
+            if element is not None:
+                clip = await element.evaluate(ELEMENT_CLIP_SCRIPT)
+                params = cdp_capture_params(dict(options, clip=clip))
+            elif "clip" in options:
+                params = cdp_capture_params(options)
+            else:
+                content = (await session.send("Page.getLayoutMetrics"))["cssContentSize"]
+                params = cdp_capture_params(options, {"width": content["width"], "height": content["height"]})
+            return decode_cdp_capture(await session.send("Page.captureScreenshot", params))
+        finally:
+            await session.detach()
+
+    async def get_element_text(self, selector: str, frame: Optional[Frame] = None,
+                         prev_elem: Optional[Locator] = None) -> Optional[str]:
+        """
+        Retrieve the text content of an element on the page or within a specific frame.
+
+        Args:
+            selector (str): The selector for the element.
+            frame (Frame, optional): The specific frame to search in. Defaults to the main page.
+            prev_elem (Locator, optional): Parent element to search within.
+
+        Returns:
+            Optional[str]: The text content of the element if found, None otherwise.
+        """
+        try:
+            element = self.locator(selector, frame=frame, prev_elem=prev_elem)
+            return (await element.inner_text(timeout=DEFAULT_WAIT_TIME_MS)).strip()
+        except Exception as e:
+            self.logger.debug(f"Error retrieving text from element '{selector}': {str(e)}")
+            return None
+
+    async def remove_element_from_dom(self, selector: str, frame: Optional[Frame] = None,
+                                      prev_elem: Optional[Locator] = None):
+        target = prev_elem or frame or self.page
+        self.logger.debug(f"Removing DOM element: {selector}")
+        await target.evaluate(f"""document.querySelector('{selector}').style.display = 'none';""")
+
+    async def restore_element_from_dom(self, selector: str, frame: Optional[Frame] = None,
+                                       prev_elem: Optional[Locator] = None):
+        target = prev_elem or frame or self.page
+        self.logger.debug(f"Restoring DOM element: {selector}")
+        await target.evaluate(f"""document.querySelector('{selector}').style.display = '';""")
+
+    async def intercept_request_data_json(self, request_path, timeout=DEFAULT_WAIT_TIME_MS):
+        try:
+            async with self.page.expect_request(request_path, timeout=timeout) as request_info:
+                request = await request_info.value
+                return request.post_data_json
+        except Exception as e:
+            raise Exception(f"No response captured for {request_path}: {e}")
+
+    async def intercept_response(self, url_part: str, action: Callable[[], Awaitable],
+                                 timeout=DEFAULT_WAIT_TIME_MS) -> Response:
+        """
+        Await `action` and return the first response whose URL contains `url_part`.
+        """
+        try:
+            async with self.page.expect_response(lambda response: url_part in response.url,
+                                                 timeout=timeout) as response_info:
+                await action()
+            return await response_info.value
+        except Exception as e:
+            raise Exception(f"No response captured for {url_part}: {e}")
+
+    async def intercept_response_json(self, url_part: str, action: Callable[[], Awaitable],
+                                      timeout=DEFAULT_WAIT_TIME_MS):
+        return await (await self.intercept_response(url_part, action, timeout)).json()
+
+    async def get_current_scroll_position(self):
+        """Get the current vertical scroll position."""
+        return await self.page.evaluate("window.scrollY")
+
+    async def get_closest_element(self, locator_selector, frame: Optional[Frame] = None) -> Optional[Locator]:
+        """
+        Find the element closest to the current scroll position (the top of the viewport).
+
+        All matches are measured in one in-page evaluate; the result is a locator for the winning match.
+        """
+        elements = self.locator(locator_selector, frame=frame)
+        index = await elements.evaluate_all(CLOSEST_SCRIPT)
+        return elements.nth(index) if index >= 0 else None
+
+    async def get_element_boxes(self, selector: str, frame: Optional[Frame] = None,
+                                mode: str = ALL) -> List[ElementBox]:
+        """
+        Viewport-relative boxes of all elements matching `selector`, measured in a single evaluate.
+
+        Args:
+            mode (str): ALL, VISIBLE (rendered and not visibility:hidden) or IN_VIEWPORT (visible and on screen).
+        """
+        return to_boxes(await self.locator(selector, frame=frame).evaluate_all(BOXES_SCRIPT, mode))
+
+    async def get_visible_elements(self, selector: str, frame: Optional[Frame] = None) -> List[Locator]:
+        elements = self.locator(selector, frame=frame)
+        return [elements.nth(box.index) for box in await self.get_element_boxes(selector, frame, VISIBLE)]
+
+    async def get_elements_in_viewport(self, selector: str, frame: Optional[Frame] = None) -> List[Locator]:
+        elements = self.locator(selector, frame=frame)
+        return [elements.nth(box.index) for box in await self.get_element_boxes(selector, frame, IN_VIEWPORT)]
+
+    async def click_enter(self, selector: Optional[str] = None, frame: Optional[Frame] = None,
+                          delay: Optional[int] = None):
+        """
+        Press the Enter key on the page or on a specific element.
+        """
+        target = frame or self.page
+        try:
+            if selector:
+                await self.wait_for_element(selector, frame=frame)
+                await target.click(selector)
+                self.logger.debug(f"Focused element {selector} before pressing Enter")
+
+            await self.page.keyboard.press("Enter")
+            self.logger.debug("Pressed Enter key")
+
+            if delay:
+                await self.page.wait_for_timeout(delay)
+        except Exception as e:
+            self.logger.debug(f"Error pressing Enter: {str(e)}")
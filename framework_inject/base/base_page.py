@@ -1,35 +1,92 @@
 """Framework: https://github.com/eshut/Framework-Python"""
 
-import datetime
-import os
 import random
+import time as timer
 from abc import ABC
-from typing import List, Dict, Any, Optional
-from playwright.sync_api import Page, Frame, Locator
+from typing import Callable, List, Dict, Any, Optional
+from playwright.sync_api import Page, Frame, Locator, Response
 
 from framework_inject.browser import RunBrowser
-from framework_inject.constants import DEFAULT_WAIT_TIME_MS, LOG_TIME_STRUCTURE
+from framework_inject.constants import DEFAULT_WAIT_TIME_MS, PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS, \
+    READY_TIMEOUT_MS, NETWORK_IDLE_MS, READY_POLL_INTERVAL_MS, LOCATOR_CACHE_SIZE, SCREENSHOT_DIR
 from framework_inject.logger.logger import Logger
 from framework_inject.base.context import Context
+from framework_inject.base.request_tracker import RequestTracker
+from framework_inject.screenshots import ScreenshotWriter, screenshot_options, screenshot_path, cdp_capture_params, \
+    decode_cdp_capture
+from framework_inject.base.geometry import ElementBox, ALL, VISIBLE, IN_VIEWPORT, BOXES_SCRIPT, CLOSEST_SCRIPT, \
+    ELEMENT_CLIP_SCRIPT, to_boxes
 
 
 class BasePage(ABC, Logger):
-    def __init__(self, logger=__file__, port=None, id=0):
+    run_browser_class = RunBrowser
+
+    def __init__(self, logger=__file__, port=None, id=0, page: Optional[Page] = None):
         super().__init__(logger)
         self.port = port
         self.context = Context()
         self.context["I"] = self
-        self.run_browser = RunBrowser(port=port, id=id)
-        self.page = self.run_browser.page
-        self.browser = self.run_browser.browser
-        self.browser_context = self.run_browser.context
+        self._locators = {}
+        self.run_browser = self.run_browser_class(port=port, id=id)
+        self._page = page
+
+    @property
+    def page(self) -> Page:
+        # The shared browser is launched on first use, not when the page object is created
+        if self._page is None:
+            self._page = self.run_browser.page
+        return self._page
+
+    @page.setter
+    def page(self, page: Page):
+        self._page = page
+
+    @property
+    def browser(self):
+        return self.run_browser.browser
+
+    @property
+    def browser_context(self):
+        return self.run_browser.context
 
     def clear(self):
         self.page = self.run_browser.browser.contexts[0].new_page()
 
     def goto(self, url):
+        self._locators.clear()
         self.page.goto(url)
 
+    def locator(self, selector: str, frame: Optional[Frame] = None, prev_elem: Optional[Locator] = None) -> Locator:
+        """
+        Return a locator for `selector`, reusing the one built earlier for the same target.
+
+        Locators are lazy (building one costs no protocol call) and auto-wait on every action, so helpers act on them
+        directly instead of waiting for the selector first and querying it again.
+        """
+        target = prev_elem or frame or self.page
+        key = (target, selector)
+        element = self._locators.get(key)
+        if element is None:
+            if len(self._locators) >= LOCATOR_CACHE_SIZE:
+                self._locators.clear()
+            element = self._locators[key] = target.locator(selector)
+        return element
+
+    def new_tab(self) -> Page:
+        """
+        Open a new tab in the current browser context without switching this page object to it.
+        """
+        page = self.browser_context.new_page()
+        page.set_default_timeout(PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS)
+        return page
+
+    def close_tab(self):
+        """
+        Close the tab this page object is bound to.
+        """
+        if not self.page.is_closed():
+            self.page.close()
+
     def set_auth_token(self, token: str) -> None:
         """
         Set an authorization token in localStorage and refresh the page.
@@ -45,28 +102,24 @@ class BasePage(ABC, Logger):
         return self.page.context.cookies()
 
     def get_element(self, selector: str, frame: Optional[Frame] | Optional[Locator] = None, prev_elem=None,
-                    time=DEFAULT_WAIT_TIME_MS) \
-            -> Locator:
+                    time=DEFAULT_WAIT_TIME_MS) -> Optional[Locator]:
         """
         Get a single element on the page or in a specific frame.
 
         Args:
             selector (str): The selector for the element.
             frame (Frame, optional): The specific frame to search in. Defaults to the main page.
+            prev_elem (Locator, optional): Parent element to search within; returned without waiting.
 
         Returns:
-            Optional[ElementHandle]: The element if found, None otherwise.
+            Optional[Locator]: The element if it appeared within `time`, None otherwise.
         """
-        target = frame or self.page
-
+        element = self.locator(selector, frame=frame, prev_elem=prev_elem)
+        if prev_elem:
+            return element
         try:
-            if prev_elem:
-                element = prev_elem.locator(selector)
-                return element
-            elif self.wait_for_element_conditional(selector, frame=frame, time=time):
-                element = target.locator(selector)
-                return element
-            return None
+            element.first.wait_for(timeout=time)
+            return element
         except Exception as e:
             self.logger.debug(f"Error getting element from '{selector}': {str(e)}")
             return None
@@ -77,23 +130,16 @@ class BasePage(ABC, Logger):
 
         Args:
             selector (str): The selector for the elements.
-            element (Optional[ElementHandle], optional): The parent element to search within. Defaults to None (page level).
+            element (Optional[Locator], optional): The parent element to search within. Defaults to None (page level).
             frame (Frame, optional): The specific frame to search in. Defaults to the main page.
 
         Returns:
-            List[ElementHandle]: A list of elements matching the selector.
+            List[Locator]: A list of elements matching the selector.
         """
-        target = frame or self.page
-        parent = element or target
-
+        elements = self.locator(selector, frame=frame, prev_elem=element)
         try:
-            # Wait for the element (or the frame/parent element) and query the list
-            # parent.locator("//div[contains(@class, 'blackjackCardsStack__card')]").all()
-
-            if self.wait_for_element_conditional(selector, frame=frame):
-                elements = parent.locator(selector).all()
-                return elements
-            return []
+            elements.first.wait_for(timeout=DEFAULT_WAIT_TIME_MS)
+            return elements.all()
         except Exception as e:
             self.logger.debug(f"Error getting elements list from '{selector}': {str(e)}")
             return []
@@ -139,36 +185,69 @@ class BasePage(ABC, Logger):
             self.logger.debug(f"Exception: {e}")
             return False
 
-    def get_element_attribute(self, selector: str, attr: str, frame: Optional[Frame] = None, prev_elem: Optional[Locator] = None) -> Optional[str]:
+    def wait_for_enabled(self, selector: str, time: int | float = READY_TIMEOUT_MS,
+                         frame: Optional[Frame] = None) -> bool:
+        """
+        Wait until an element is attached and enabled, polling in the browser instead of sleeping.
+
+        Returns:
+            bool: True if the element became enabled within the timeout, False otherwise.
+        """
+        target = frame or self.page
+        try:
+            handle = target.wait_for_selector(selector, timeout=time, state="attached")
+            target.wait_for_function("element => !element.disabled && element.getAttribute('aria-disabled') !== 'true'",
+                                     arg=handle, timeout=time)
+            return True
+        except Exception as e:
+            self.logger.debug(f"Element '{selector}' was not enabled in {time}ms: {e}")
+            return False
+
+    def track_requests(self, url_part: str) -> RequestTracker:
+        """
+        Start counting requests whose URL contains `url_part`. Use as a context manager around the action
+        that triggers them, then call `wait_for_network_idle` with the tracker.
+        """
+        return RequestTracker(self.page, url_part)
+
+    def wait_for_network_idle(self, tracker: RequestTracker, idle_ms: int = NETWORK_IDLE_MS,
+                              time: int | float = READY_TIMEOUT_MS) -> bool:
+        """
+        Wait until no tracked request has been in flight for `idle_ms`.
+
+        Returns:
+            bool: True if the tracked traffic settled within the timeout, False otherwise.
+        """
+        deadline = timer.monotonic() + time / 1000
+        while timer.monotonic() < deadline:
+            if tracker.is_idle(idle_ms):
+                return True
+            # wait_for_timeout keeps dispatching Playwright events, unlike time.sleep
+            self.page.wait_for_timeout(READY_POLL_INTERVAL_MS)
+        self.logger.debug(f"Requests to '{tracker.url_part}' still in flight after {time}ms")
+        return False
+
+    def get_element_attribute(self, selector: str, attr: str, frame: Optional[Frame] = None,
+                              prev_elem: Optional[Locator] = None) -> Optional[str]:
         """
-        Retrieve the 'msg' attribute of an element on the page or within a specific frame.
+        Retrieve an attribute of an element on the page or within a specific frame.
 
         Args:
             selector (str): The selector for the element.
+            attr (str): The attribute name.
             frame (Frame, optional): The specific frame to search in. Defaults to the main page.
             prev_elem (Locator, optional): Parent element to search within.
 
         Returns:
-            Optional[str]: The 'msg' attribute value if found, None otherwise.
+            Optional[str]: The attribute value if found, None otherwise.
         """
-        target = frame or self.page
         try:
-            if prev_elem:
-                element = prev_elem.locator(selector)
-            else:
-                element = target.locator(selector)
-            if self.wait_for_element_conditional(selector, frame=frame):
-                # get attribute 'msg'
-                attr_value = element.get_attribute(attr)
-                return attr_value
-            else:
-                self.logger.debug(f"Element not found or timed out for selector: {selector}")
-                return None
+            element = self.locator(selector, frame=frame, prev_elem=prev_elem)
+            return element.get_attribute(attr, timeout=DEFAULT_WAIT_TIME_MS)
         except Exception as e:
-            self.logger.debug(f"Error retrieving 'msg' attribute from element '{selector}': {str(e)}")
+            self.logger.debug(f"Error retrieving '{attr}' attribute from element '{selector}': {str(e)}")
             return None
 
-
     def get_iframe(self, iframe_selector: str, parent_frame: Optional[Frame] = None) -> Frame:
         """
         Returns the iframe element (handles both top-level and nested iframes).
@@ -194,11 +273,9 @@ class BasePage(ABC, Logger):
 
     def click(self, selector: str, frame: Optional[Frame] = None, prev_elem: Optional[Locator] = None):
         """
-        Click an element on the page or in a specific frame.
+        Click an element on the page or in a specific frame. The locator waits for the element to be actionable.
         """
-        target = prev_elem or frame or self.page
-        self.wait_for_element(selector, frame=frame, prev_elem=prev_elem)
-        target.click(selector)
+        self.locator(selector, frame=frame, prev_elem=prev_elem).click()
 
     def force_click(self, locator: str, frame: Optional[Frame] = None) -> bool:
         """
@@ -212,40 +289,27 @@ class BasePage(ABC, Logger):
             bool: True if the click is successful, False otherwise.
         """
         target = frame or self.page
-
         try:
-            if self.wait_for_element_conditional(locator, frame=frame):
-                element = target.query_selector(locator)
-                if element:
-                    self.logger.debug(f"Trying to JS (force) click on element: {locator}")
-
-                    # Check if element is interactable (visible and enabled)
-                    is_visible = element.is_visible()
-                    is_enabled = element.is_enabled()
-
-                    if not is_visible or not is_enabled:
-                        self.logger.debug(
-                            f"Element found but not interactable (visible: {is_visible}, enabled: {is_enabled}): {locator}")
-                        return False
-
-                    # Try force-clicking using JavaScript
-                    target.evaluate("element => element.click()", element)
-                    self.logger.debug(f"Successfully clicked element: {locator}")
-                    return True
-                else:
-                    self.logger.debug(f"Element not found for locator: {locator}")
-                    return False
+            element = target.wait_for_selector(locator, timeout=DEFAULT_WAIT_TIME_MS, state="attached")
+            # Visibility/enabled checks and the click happen in a single evaluate
+            clicked = element.evaluate("""element => {
+                const rect = element.getBoundingClientRect();
+                if (!rect.width || !rect.height || element.disabled) return false;
+                element.click();
+                return true;
+            }""")
+            if clicked:
+                self.logger.debug(f"Successfully clicked element: {locator}")
             else:
-                self.logger.debug(f"Element not found or timed out for locator: {locator}")
-                return False
+                self.logger.debug(f"Element found but not interactable: {locator}")
+            return clicked
         except Exception as e:
             self.logger.debug(f"Unexpected error during force click: {str(e)}")
             return False
 
     def scroll_and_click(self, selector: str, frame: Optional[Frame] = None):
-        """Scrolls to an element and clicks it."""
-        self.scroll_page(selector, frame)
-        self.move_and_click(selector, frame)
+        """Scrolls to an element and clicks it; the locator click scrolls into view and moves the mouse itself."""
+        self.click(selector, frame)
 
     def scroll_page(self, selector: str, frame: Optional[Frame] = None):
         """Scrolls to the element using JavaScript."""
@@ -260,109 +324,118 @@ class BasePage(ABC, Logger):
         self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
 
     def move_and_click(self, selector: str, frame: Optional[Frame] = None):
-        self.move_mouse_to(selector, frame)
         self.click(selector, frame)
 
     def fill_text(self, selector: str, text: str, frame: Optional[Frame] = None):
         """
         Fill a text field on the page or in a specific frame.
         """
-        target = frame or self.page
-        self.wait_for_element(selector, frame=frame)
-        target.fill(selector, text)
+        self.locator(selector, frame=frame).fill(text)
 
     def fill_text_slowly(self, selector: str, text: str, frame: Optional[Frame] = None):
         """
         Fill a text field on the page or in a specific frame, typing slowly like a human.
         """
-        target = frame or self.page
-        self.wait_for_element(selector, frame=frame)
-
-        target.click(selector)  # Ensure the field is focused
-        for char in text:
-            target.press(selector, char)
-            self.page.wait_for_timeout(random.uniform(50, 150))
-
+        element = self.locator(selector, frame=frame)
+        element.click()
+        element.press_sequentially(text, delay=random.uniform(50, 150))
 
     def move_mouse_to(self, selector: str, frame: Optional[Frame] = None):
         """
-        Move the mouse pointer to an element on the page or in a specific frame.
+        Move the mouse pointer to the center of an element on the page or in a specific frame.
         """
-        target = frame or self.page
-        self.wait_for_element(selector, frame=frame)
-        element = target.locator(selector)
-        bounding_box = element.bounding_box()
-        if bounding_box:
-            x = bounding_box["x"] + bounding_box["width"] / 2
-            y = bounding_box["y"] + bounding_box["height"] / 2
-            self.page.mouse.move(x, y)
+        self.locator(selector, frame=frame).hover()
 
     def click_and_fill_text(self, selector: str, text: str, frame: Optional[Frame] = None):
-        self.move_mouse_to(selector, frame)
-        self.click(selector, frame)
-        self.fill_text(selector, text, frame)
+        """
+        Click an input (moving the mouse onto it) and fill it: two round trips on one cached locator.
+        """
+        element = self.locator(selector, frame=frame)
+        element.click()
+        element.fill(text)
 
-    def capture_full_page_screenshot(self, folder: str = "logs/screenshots", file_name: Optional[str] = None,
-                                     tag: Optional[str] = None):
+    def capture_full_page_screenshot(self, folder: str = SCREENSHOT_DIR, file_name: Optional[str] = None,
+                                     tag: Optional[str] = None, image_format: Optional[str] = None,
+                                     quality: Optional[int] = None, clip: Optional[Dict] = None) -> Optional[str]:
         """
-        Capture a screenshot of the entire page and save it to a specified folder.
+        Capture a screenshot of the entire page (or of `clip`) and hand it to the background writer.
 
         Args:
-            folder (str): The folder where the screenshot will be saved. Defaults to the current directory.
+            folder (str): The folder where the screenshot will be saved. Defaults to "logs/screenshots".
             file_name (Optional[str]): The name of the screenshot file. If not provided, a timestamped name will be used.
-        """
-        # Ensure the folder exists
-        os.makedirs(folder, exist_ok=True)
-
-        # Generate a timestamped filename if none is provided
-        if not tag:
-            tag = "screenshot"
-        if not file_name:
-            timestamp = datetime.datetime.now().strftime(f"{LOG_TIME_STRUCTURE}-{tag}.png")
-            file_name = timestamp
-        elif not file_name.endswith(".png"):
-            file_name += ".png"
-
-        # Construct the full path
-        file_path = os.path.join(folder, file_name)
+            tag (Optional[str]): A tag to include in the file name.
+            image_format (Optional[str]): "png", "jpeg" or "webp". Defaults to SCREENSHOT_FORMAT.
+            quality (Optional[int]): 0-100 for lossy formats. Defaults to SCREENSHOT_QUALITY.
+            clip (Optional[Dict]): {"x", "y", "width", "height"} region of the page instead of the full page.
 
+        Returns:
+            Optional[str]: The path the screenshot is being written to, None if the capture failed.
+        """
+        options = screenshot_options(image_format, quality, clip)
+        file_path = screenshot_path(folder, file_name, tag or "screenshot", options["type"])
         try:
-            self.page.screenshot(path=file_path, full_page=True)
-            self.logger.debug(f"Full page screenshot saved to {file_path}")
+            ScreenshotWriter.shared().submit(self._capture(options), file_path)
+            return file_path
         except Exception as e:
             self.logger.debug(f"Error capturing full page screenshot: {str(e)}")
+            return None
 
-    def capture_element_screenshot(self, selector: str, folder: str = "logs/screenshots", file_name: Optional[str] = None,
-                                   tag: Optional[str] = None, frame: Optional[Frame] = None, prev_elem: Optional[Locator] = None):
+    def capture_element_screenshot(self, selector: str, folder: str = SCREENSHOT_DIR, file_name: Optional[str] = None,
+                                   tag: Optional[str] = None, frame: Optional[Frame] = None,
+                                   prev_elem: Optional[Locator] = None, image_format: Optional[str] = None,
+                                   quality: Optional[int] = None) -> Optional[str]:
         """
-        Capture a screenshot of a specific element on the page and save it to a specified folder.
+        Capture a screenshot of a specific element and hand it to the background writer.
 
         Args:
-            element_selector (str): The CSS selector of the element to capture.
+            selector (str): The selector of the element to capture.
             folder (str): The folder where the screenshot will be saved. Defaults to "logs/screenshots".
             file_name (Optional[str]): The name of the screenshot file. If not provided, a timestamped name will be used.
             tag (Optional[str]): A tag to include in the file name.
+            image_format (Optional[str]): "png", "jpeg" or "webp". Defaults to SCREENSHOT_FORMAT.
+            quality (Optional[int]): 0-100 for lossy formats. Defaults to SCREENSHOT_QUALITY.
+
+        Returns:
+            Optional[str]: The path the screenshot is being written to, None if the capture failed.
         """
-        os.makedirs(folder, exist_ok=True)
-        if not tag:
-            tag = "element_screenshot"
-        if not file_name:
-            timestamp = datetime.datetime.now().strftime(f"{LOG_TIME_STRUCTURE}-{tag}.png")
-            file_name = timestamp
-        elif not file_name.endswith(".png"):
-            file_name += ".png"
-        file_path = os.path.join(folder, file_name)
+        options = screenshot_options(image_format, quality)
+        file_path = screenshot_path(folder, file_name, tag or "element_screenshot", options["type"])
         try:
-            element = self.get_element(selector, frame=frame, prev_elem=prev_elem).first
+            element = self.get_element(selector, frame=frame, prev_elem=prev_elem)
             if not element:
                 raise ValueError(f"Element with selector '{selector}' not found.")
-            element.screenshot(path=file_path)
-            self.logger.info(f"Element screenshot saved to {file_path}")
+            ScreenshotWriter.shared().submit(self._capture(options, element=element.first), file_path)
+            self.logger.info(f"Element screenshot queued for {file_path}")
+            return file_path
         except Exception as e:
             self.logger.info(f"Error capturing element screenshot: {str(e)}")
+            return None
 
-    def get_element_text(self, selector: str, frame: Optional[Frame] = None, prev_elem: Optional[Locator] = None) -> \
-    Optional[str]:
+    def _capture(self, options: Dict, element: Optional[Locator] = None) -> bytes:
+        """
+        Encode a screenshot in the browser and return its bytes. PNG/JPEG use Playwright; WebP uses CDP directly.
+        """
+        if options["type"] != "webp":
+            if element is not None:
+                return element.screenshot(type=options["type"], quality=options.get("quality"))
+            return self.page.screenshot(full_page="clip" not in options, **options)
+
+        session = self.page.context.new_cdp_session(self.page)
+        try:
+            if element is not None:
+                clip = element.evaluate(ELEMENT_CLIP_SCRIPT)
+                params = cdp_capture_params(dict(options, clip=clip))
+            elif "clip" in options:
+                params = cdp_capture_params(options)
+            else:
+                content = (session.send("Page.getLayoutMetrics"))["cssContentSize"]
+                params = cdp_capture_params(options, {"width": content["width"], "height": content["height"]})
+            return decode_cdp_capture(session.send("Page.captureScreenshot", params))
+        finally:
+            session.detach()
+
+    def get_element_text(self, selector: str, frame: Optional[Frame] = None,
+                         prev_elem: Optional[Locator] = None) -> Optional[str]:
         """
         Retrieve the text content of an element on the page or within a specific frame.
 
@@ -374,17 +447,9 @@ class BasePage(ABC, Logger):
         Returns:
             Optional[str]: The text content of the element if found, None otherwise.
         """
-        target = frame or self.page
         try:
-            if prev_elem:
-                element = prev_elem.locator(selector)
-            else:
-                element = target.locator(selector)
-            if self.wait_for_element_conditional(selector, frame=frame):
-                return element.inner_text().strip()
-            else:
-                self.logger.debug(f"Element not found or timed out for selector: {selector}")
-                return None
+            element = self.locator(selector, frame=frame, prev_elem=prev_elem)
+            return element.inner_text(timeout=DEFAULT_WAIT_TIME_MS).strip()
         except Exception as e:
             self.logger.debug(f"Error retrieving text from element '{selector}': {str(e)}")
             return None
@@ -407,29 +472,56 @@ class BasePage(ABC, Logger):
         except Exception as e:
             raise Exception(f"No response captured for {request_path}: {e}")
 
+    def intercept_response(self, url_part: str, action: Callable, timeout=DEFAULT_WAIT_TIME_MS) -> Response:
+        """
+        Run `action` (a navigation, click, ...) and return the first response whose URL contains `url_part`.
+
+        Raises:
+            Exception: If no matching response arrives within `timeout`.
+        """
+        try:
+            with self.page.expect_response(lambda response: url_part in response.url, timeout=timeout) as response_info:
+                action()
+            return response_info.value
+        except Exception as e:
+            raise Exception(f"No response captured for {url_part}: {e}")
+
+    def intercept_response_json(self, url_part: str, action: Callable, timeout=DEFAULT_WAIT_TIME_MS):
+        """
+        Like `intercept_response`, returning the decoded JSON body.
+        """
+        return self.intercept_response(url_part, action, timeout).json()
+
     def get_current_scroll_position(self):
         """Get the current vertical scroll position."""
         return self.page.evaluate("window.scrollY")
 
-    def get_closest_element(self, locator_selector):
-        """Find the element closest to the current scroll position."""
-        current_scroll = self.get_current_scroll_position()
+    def get_closest_element(self, locator_selector, frame: Optional[Frame] = None) -> Optional[Locator]:
+        """
+        Find the element closest to the current scroll position (the top of the viewport).
 
-        elements = self.page.query_selector_all(locator_selector)
-        closest_element = None
-        closest_distance = float('inf')
+        All matches are measured in one in-page evaluate; the result is a locator for the winning match.
+        """
+        elements = self.locator(locator_selector, frame=frame)
+        index = elements.evaluate_all(CLOSEST_SCRIPT)
+        return elements.nth(index) if index >= 0 else None
+
+    def get_element_boxes(self, selector: str, frame: Optional[Frame] = None, mode: str = ALL) -> List[ElementBox]:
+        """
+        Viewport-relative boxes of all elements matching `selector`, measured in a single evaluate.
 
-        for element in elements:
-            bounding_box = element.bounding_box()
+        Args:
+            mode (str): ALL, VISIBLE (rendered and not visibility:hidden) or IN_VIEWPORT (visible and on screen).
+        """
+        return to_boxes(self.locator(selector, frame=frame).evaluate_all(BOXES_SCRIPT, mode))
 
-            if bounding_box:
-                element_top = bounding_box['y']
-                distance = abs(element_top - current_scroll)
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_element = element
+    def get_visible_elements(self, selector: str, frame: Optional[Frame] = None) -> List[Locator]:
+        elements = self.locator(selector, frame=frame)
+        return [elements.nth(box.index) for box in self.get_element_boxes(selector, frame, VISIBLE)]
 
-        return closest_element
+    def get_elements_in_viewport(self, selector: str, frame: Optional[Frame] = None) -> List[Locator]:
+        elements = self.locator(selector, frame=frame)
+        return [elements.nth(box.index) for box in self.get_element_boxes(selector, frame, IN_VIEWPORT)]
 
     def click_enter(self, selector: Optional[str] = None, frame: Optional[Frame] = None, delay: Optional[int] = None):
         """
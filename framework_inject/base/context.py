@@ -1,39 +1,85 @@
 """Framework: https://github.com/eshut/Framework-Python"""
 
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Tuple
 
-from typing import Any
+# (owner, values): the owner is the thread / asyncio task that may write to `values` in place
+_context_data: ContextVar[Tuple[Tuple[int, Any], Dict[str, Any]]] = ContextVar("framework_context")
+
+
+def _owner() -> Tuple[int, Any]:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident(), task
 
 
 class Context:
     """
-    A class to store shared values across PageObjects.
+    Values shared across PageObjects, local to the current thread / asyncio task.
     Supports dictionary-like access for getting and setting values.
+
+    Every `Context()` is a view of the same task-local storage, so creating one never resets it. Each thread starts
+    with its own empty storage. Asyncio tasks (and threads run in a copied context) see their parent's values, and
+    their first write makes a private copy, so sibling tasks never overwrite each other's `context["I"]`.
     """
-    _instance = None
 
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(Context, cls).__new__(cls)
-            # Initialize context data here
-            cls._instance.data = {}
-        return cls._instance
+    @staticmethod
+    def _data() -> Dict[str, Any]:
+        try:
+            return _context_data.get()[1]
+        except LookupError:
+            return {}
 
-    def __init__(self):
-        self._data = {}
+    @staticmethod
+    def _writable() -> Dict[str, Any]:
+        owner = _owner()
+        try:
+            data_owner, data = _context_data.get()
+        except LookupError:
+            data_owner, data = None, {}
+        if data_owner != owner:
+            data = dict(data)
+            _context_data.set((owner, data))
+        return data
+
+    @classmethod
+    @contextmanager
+    def scope(cls, **values) -> Iterator["Context"]:
+        """
+        Enter a child scope that starts as a copy of the current one plus `values`. Changes made inside are
+        discarded on exit.
+        """
+        token = _context_data.set((_owner(), {**cls._data(), **values}))
+        try:
+            yield cls()
+        finally:
+            _context_data.reset(token)
 
     def __setitem__(self, key: str, value: Any) -> None:
         """Set a value in the context using dictionary-like syntax."""
-        self._data[key] = value
+        self._writable()[key] = value
 
     def __getitem__(self, key: str) -> Any:
         """Retrieve a value from the context using dictionary-like syntax."""
-        if key not in self._data:
+        data = self._data()
+        if key not in data:
             raise KeyError(f"'{key}' not found in context")
-        return self._data[key]
+        return data[key]
+
+    def __delitem__(self, key: str) -> None:
+        del self._writable()[key]
 
     def __contains__(self, key: str) -> bool:
         """Check if a key exists in the context."""
-        return key in self._data
+        return key in self._data()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data().get(key, default)
 
     def __repr__(self):
-        return f"Context({self._data})"
+        return f"Context({self._data()})"
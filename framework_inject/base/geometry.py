@@ -0,0 +1,50 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+from collections import namedtuple
+
+# Viewport-relative box of the `index`-th element matched by a selector, rounded to CSS pixels
+ElementBox = namedtuple("ElementBox", ["index", "x", "y", "width", "height"])
+
+ALL, VISIBLE, IN_VIEWPORT = "all", "visible", "viewport"
+
+# Run through locator.evaluate_all, so the selector (CSS or XPath) is resolved once in the page and the whole list
+# is measured in a single protocol call. Rows are [index, x, y, width, height].
+BOXES_SCRIPT = """(elements, mode) => {
+    const viewportWidth = window.innerWidth, viewportHeight = window.innerHeight;
+    const rows = [];
+    elements.forEach((element, index) => {
+        const rect = element.getBoundingClientRect();
+        if (mode !== 'all') {
+            if (!rect.width || !rect.height || getComputedStyle(element).visibility === 'hidden') return;
+            if (mode === 'viewport' && (rect.bottom <= 0 || rect.right <= 0 || rect.top >= viewportHeight ||
+                                        rect.left >= viewportWidth)) return;
+        }
+        rows.push([index, Math.round(rect.left), Math.round(rect.top), Math.round(rect.width), Math.round(rect.height)]);
+    });
+    return rows;
+}"""
+
+# Index of the rendered element whose top edge is closest to the top of the viewport (the scroll position), or -1
+CLOSEST_SCRIPT = """elements => {
+    let closest = -1, closestDistance = Infinity;
+    elements.forEach((element, index) => {
+        const rect = element.getBoundingClientRect();
+        if (!rect.width && !rect.height) return;
+        const distance = Math.abs(rect.top);
+        if (distance < closestDistance) {
+            closest = index;
+            closestDistance = distance;
+        }
+    });
+    return closest;
+}"""
+
+
+def to_boxes(rows):
+    return [ElementBox(*row) for row in rows]
+
+# Document-relative box of one element, the clip format of CDP Page.captureScreenshot with captureBeyondViewport
+ELEMENT_CLIP_SCRIPT = """element => {
+    const rect = element.getBoundingClientRect();
+    return {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height};
+}"""
@@ -0,0 +1,44 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import time
+
+
+class RequestTracker:
+    """
+    Counts in-flight requests whose URL contains `url_part` on a page (sync or async Playwright).
+
+    Listeners are plain callables, so the same tracker works with both APIs; the waiting loop lives in
+    BasePage.wait_for_network_idle / AsyncBasePage.wait_for_network_idle.
+    """
+
+    def __init__(self, page, url_part: str):
+        self.page = page
+        self.url_part = url_part
+        self.in_flight = set()
+        self.last_activity = time.monotonic()
+        self.seen = 0
+
+    def __enter__(self):
+        self.page.on("request", self._on_request)
+        self.page.on("requestfinished", self._on_done)
+        self.page.on("requestfailed", self._on_done)
+        return self
+
+    def __exit__(self, *exc):
+        self.page.remove_listener("request", self._on_request)
+        self.page.remove_listener("requestfinished", self._on_done)
+        self.page.remove_listener("requestfailed", self._on_done)
+
+    def _on_request(self, request):
+        if self.url_part in request.url:
+            self.in_flight.add(request)
+            self.seen += 1
+            self.last_activity = time.monotonic()
+
+    def _on_done(self, request):
+        if request in self.in_flight:
+            self.in_flight.discard(request)
+            self.last_activity = time.monotonic()
+
+    def is_idle(self, idle_ms: int) -> bool:
+        return not self.in_flight and (time.monotonic() - self.last_activity) * 1000 >= idle_ms
@@ -1,7 +1,9 @@
 """Framework: https://github.com/eshut/Framework-Python"""
 
 import http
+import json
 import os
+import time
 
 import requests
 from dotenv import load_dotenv
@@ -9,10 +11,13 @@ from playwright.sync_api import sync_playwright
 from framework_inject.utils.json_util import JsonUtil
 
 from framework_inject.constants import DEFAULT_BROWSER_DEBUGGER_ADDRESS, DEFAULT_BROWSER_DEBUGGER_PORT, \
-    REMOTE_ZENROWS_BROWSER
+    REMOTE_ZENROWS_BROWSER, STORAGE_STATE_FILE, DEBUGGER_TIMEOUT_SEC
 from framework_inject.constants import DEFAULT_VIEWPORT_SIZE, PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS, BROWSERS, \
     CHROME_BROWSER, FIREFOX_BROWSER, REMOTE_CHROME_BROWSER, REMOTE_FIREFOX_BROWSER, PLAYWRIGHT_DEFAULT_LOCALE
 from framework_inject.logger.logger import Logger
+from framework_inject.request_blocker import RequestBlocker
+from framework_inject.screenshots import ScreenshotWriter
+from framework_inject.services.http_service import default_session
 
 load_dotenv()
 log_level = os.getenv("LOG_LEVEL")
@@ -21,7 +26,43 @@ browser = os.getenv("BROWSER")
 save_dir = os.getenv("SAVE_DIR")
 firefox_location = os.getenv("FIREFOX_LOCATION")
 ZEN_ROWS_URL = os.getenv("ZEN_ROWS_URL")
-
+STORAGE_STATE_PATH = os.getenv("STORAGE_STATE_PATH", STORAGE_STATE_FILE)
+# Attach to a Chrome already running with --remote-debugging-port instead of launching one when it answers
+BROWSER_ATTACH = os.getenv("BROWSER_ATTACH", "").lower() in ("1", "true", "yes")
+
+CHROME_PROFILE_DIR = "~/~/chrome_profiles/AutomationLikeCrazy"
+CHROME_VIEWPORT = {"width": 1366, "height": 768}
+CHROME_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.6998 Safari/537.36"
+EXTRA_HTTP_HEADERS = {
+    "Accept-Language": "en-US,en;q=0.9",
+    "DNT": "1",  # Do Not Track
+    "Upgrade-Insecure-Requests": "1",
+    "Referer": "https://google.com"
+}
+HIDE_WEBDRIVER_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+# Fills localStorage of the current origin from a storage state snapshot without overwriting newer values
+RESTORE_LOCAL_STORAGE_SCRIPT = """items => {
+    for (const {name, value} of items) {
+        if (localStorage.getItem(name) === null) localStorage.setItem(name, value);
+    }
+}"""
+
+
+def read_storage_state(path=STORAGE_STATE_PATH):
+    """Return the storage state snapshot (cookies and localStorage per origin), or None if there is none yet."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return None
+
+
+def missing_cookies(saved, current):
+    """Cookies from the snapshot the context doesn't have yet, so newer cookies in a persistent profile win."""
+    present = {(cookie["name"], cookie["domain"], cookie["path"]) for cookie in current}
+    return [cookie for cookie in saved if (cookie["name"], cookie["domain"], cookie["path"]) not in present]
 
 class DriverWebSocket(Logger):
     def __init__(self, host=DEFAULT_BROWSER_DEBUGGER_ADDRESS, port=None, logger=__file__):
@@ -34,8 +75,8 @@ class DriverWebSocket(Logger):
 
     def get_websocket_debugger_url(self):
         try:
-            response = requests.get(self.debugger_address)
-        except:
+            response = default_session().get(self.debugger_address, timeout=DEBUGGER_TIMEOUT_SEC)
+        except requests.RequestException:
             return False
 
         if response.status_code == http.HTTPStatus.OK:
@@ -53,51 +94,137 @@ class DriverWebSocket(Logger):
 class ChromeBrowser(Logger):
     def __init__(self, logger=__file__, port=None):
         super().__init__(logger)
-        self.driver_ws_url = DriverWebSocket(port=port).get_websocket_debugger_url()
+        self.port = port
+        self.driver_ws_url = None
         self.playwright = None
         self.browser = None
         self.page = None
         self.context = None
+        self.persist_state = True
 
     def run_browser(self, chrome_profile, proxy=None):
+        started = time.perf_counter()
+        if BROWSER_ATTACH:
+            self.driver_ws_url = DriverWebSocket(port=self.port).get_websocket_debugger_url()
+            if self.driver_ws_url:
+                result = self.attach_browser()
+                self.logger.info(f"Attached to running Chrome in {time.perf_counter() - started:.2f}s")
+                return result
+            self.logger.info("No running Chrome to attach to, launching one")
+
         self.playwright = sync_playwright().start()
         self.context = self.playwright.chromium.launch_persistent_context(headless=False, proxy=proxy,
         user_data_dir=chrome_profile,
-        viewport={"width": 1366, "height": 768},
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.6998 Safari/537.36"
+        viewport=CHROME_VIEWPORT,
+        user_agent=CHROME_USER_AGENT
         )
-        self.context.set_extra_http_headers({
-            "Accept-Language": "en-US,en;q=0.9",
-            "DNT": "1",  # Do Not Track
-            "Upgrade-Insecure-Requests": "1",
-            "Referer": "https://google.com"
-        })
-        self.context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.context.set_extra_http_headers(EXTRA_HTTP_HEADERS)
+        self.context.add_init_script(HIDE_WEBDRIVER_SCRIPT)
+        self.restore_storage_state()
+
+        RequestBlocker.shared().attach(self.context)  # BLOCK IMAGES, FONTS, CSS, MEDIA AND TRACKERS
+
+        self.page = self.context.new_page()
+        self.page.set_viewport_size(CHROME_VIEWPORT)
+        self.page.set_default_timeout(PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS)
+        self.logger.info(f"Launched Chrome in {time.perf_counter() - started:.2f}s")
+        return self.browser, self.page, self.context, self.close_browser
+
+    def attach_browser(self):
+        """
+        Drive an already running Chrome (started with --remote-debugging-port) in its default context, with the same
+        headers, init scripts and request blocking as a launched one.
+        """
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.connect_over_cdp(self.driver_ws_url)
+        self.context = self.browser.contexts[0]
+        self.context.set_extra_http_headers(EXTRA_HTTP_HEADERS)
+        self.context.add_init_script(HIDE_WEBDRIVER_SCRIPT)
+        self.restore_storage_state()
+        RequestBlocker.shared().attach(self.context)
 
-        self.context.route('**/*', lambda route, request: route.abort() if
-            request.resource_type in ['image', 'media', 'font', 'stylesheet'] else route.continue_()) # BLOCK IMAGES
+        self.page = self.context.new_page()
+        self.page.set_default_timeout(PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS)
+        return self.browser, self.page, self.context, self.close_browser
+
+    def run_headless_browser(self):
+        """
+        Headless Chromium in a fresh context seeded from the storage state snapshot, with static resources blocked.
+        Used for API-level checks that never need a rendered page; it does not write the snapshot back.
+        """
+        started = time.perf_counter()
+        self.persist_state = False
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(headless=True)
+        self.context = self.browser.new_context(
+            storage_state=STORAGE_STATE_PATH if read_storage_state() else None,
+            viewport=CHROME_VIEWPORT,
+            user_agent=CHROME_USER_AGENT
+        )
+        self.context.set_extra_http_headers(EXTRA_HTTP_HEADERS)
+        self.context.add_init_script(HIDE_WEBDRIVER_SCRIPT)
+        RequestBlocker.shared().attach(self.context)
 
         self.page = self.context.new_page()
-        self.page.set_viewport_size({"width": 1366, "height": 768})
         self.page.set_default_timeout(PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS)
+        self.logger.info(f"Launched headless Chrome in {time.perf_counter() - started:.2f}s")
         return self.browser, self.page, self.context, self.close_browser
 
+    def restore_storage_state(self, path=STORAGE_STATE_PATH):
+        """
+        Load cookies and localStorage saved by `save_storage_state`, so a fresh profile starts logged in.
+        Only what the context is missing is added; localStorage is written once per origin from a blank page.
+        """
+        state = read_storage_state(path)
+        if not state:
+            return False
+        cookies = missing_cookies(state.get("cookies") or [], self.context.cookies())
+        if cookies:
+            self.context.add_cookies(cookies)
+        origins = [entry for entry in state.get("origins") or [] if entry.get("localStorage")]
+        if origins:
+            page = self.context.new_page()
+            try:
+                page.route("**/*", self._blank_document)
+                for entry in origins:
+                    page.goto(entry["origin"])
+                    page.evaluate(RESTORE_LOCAL_STORAGE_SCRIPT, entry["localStorage"])
+            except Exception as e:
+                self.logger.debug(f"Error restoring localStorage: {e}")
+            finally:
+                page.close()
+        self.logger.debug(f"Restored {len(cookies)} cookie(s) and {len(origins)} origin(s) from {path}")
+        return True
+
+    @staticmethod
+    def _blank_document(route):
+        """Serve an empty page for every origin, so its localStorage can be written without loading the site."""
+        route.fulfill(status=200, content_type="text/html", body="")
+
+    def save_storage_state(self, path=STORAGE_STATE_PATH):
+        """
+        Snapshot cookies and localStorage of the context, e.g. after logging in.
+        """
+        if not self.context or not path or not self.persist_state:
+            return
+        try:
+            self.context.storage_state(path=path)
+            self.logger.debug(f"Saved storage state to {path}")
+        except Exception as e:
+            self.logger.debug(f"Error saving storage state: {e}")
+
     def run_remote_browser(self):
+        self.driver_ws_url = DriverWebSocket(port=self.port).get_websocket_debugger_url()
         self.playwright = sync_playwright().start()
         self.browser = self.playwright.chromium.connect_over_cdp(self.driver_ws_url)
         self.context = self.browser.contexts[0]
-        self.context.set_extra_http_headers({
-            "Accept-Language": "en-US,en;q=0.9",
-            "DNT": "1",  # Do Not Track
-            "Upgrade-Insecure-Requests": "1",
-            "Referer": "https://google.com"
-        })
-        self.context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.context.set_extra_http_headers(EXTRA_HTTP_HEADERS)
+        self.context.add_init_script(HIDE_WEBDRIVER_SCRIPT)
         # self.context.route('**/*', lambda route, request: route.abort() if
         #     request.resource_type in ['image', 'media', 'font', 'stylesheet'] else route.continue_()) # BLOCK IMAGES
 
         self.page = self.context.new_page()
-        self.page.set_viewport_size({"width": 1366, "height": 768})
+        self.page.set_viewport_size(CHROME_VIEWPORT)
         return self.browser, self.page, self.context
 
     def run_zenrows_remote_browser(self):
@@ -144,6 +271,8 @@ class ChromeBrowser(Logger):
         return new_context
 
     def close_browser(self):
+        self.save_storage_state()
+        ScreenshotWriter.shared().flush()
         if self.page:
             self.page.close()
         if self.browser:
@@ -210,7 +339,7 @@ class BrowserFactory(Logger):
                 return browser, page
             elif browsertype == BROWSERS.index(CHROME_BROWSER):
                 # user_data_dir = os.path.expanduser("~/" + self.accounts['chrome_profile'])
-                browser, page, context, close_browser = ChromeBrowser().run_browser(chrome_profile="~/~/chrome_profiles/AutomationLikeCrazy")
+                browser, page, context, close_browser = ChromeBrowser().run_browser(chrome_profile=CHROME_PROFILE_DIR)
                 return browser, page, context, close_browser
             elif browsertype == BROWSERS.index(REMOTE_FIREFOX_BROWSER):
                 browser, page = FireFoxBrowser().run_remote_browser()
@@ -226,20 +355,78 @@ class BrowserFactory(Logger):
             self.logger.error(_e)
 
 
-class RunBrowser(metaclass=Singleton):
-    def __init__(self, port=None, id=0):
-        if browser in BROWSERS:
-            browser_index = BROWSERS.index(browser)
-            self.browser, self.page, self.context, self.close_browser_BF = BrowserFactory(id=id).get_browser(browser_index, port=port)
-        else:
+class RunBrowser(Logger, metaclass=Singleton):
+    """
+    Browser shared by all page objects. Nothing is launched until `page`, `context` or `browser` is first used,
+    so constructing page objects for a run that never reaches the browser costs nothing.
+    """
+
+    def __init__(self, port=None, id=0, logger=__file__):
+        if browser not in BROWSERS:
             raise Exception("No Such Browser")
+        super().__init__(logger)
+        self.port = port
+        self.id = id
+        self.launched = False
+        self._browser = None
+        self._page = None
+        self._context = None
+        self.close_browser_BF = None
+
+    def launch(self):
+        if not self.launched:
+            self._browser, self._page, self._context, self.close_browser_BF = BrowserFactory(id=self.id).get_browser(
+                BROWSERS.index(browser), port=self.port)
+            self.launched = True
+        return self
+
+    @property
+    def browser(self):
+        return self.launch()._browser
+
+    @property
+    def context(self):
+        return self.launch()._context
+
+    @property
+    def page(self):
+        return self.launch()._page
+
+    @page.setter
+    def page(self, new_page):
+        self._page = new_page
 
     def update_page(self, new_page):
         """Method to update the page globally."""
         self.page = new_page
 
+    def save_storage_state(self, path=STORAGE_STATE_PATH):
+        """Snapshot cookies and localStorage of the running browser; no-op if it was never launched."""
+        if self.launched and self._context:
+            try:
+                self._context.storage_state(path=path)
+            except Exception as e:
+                self.logger.debug(f"Error saving storage state: {e}")
+
     def close_browser(self):
         """Method to close the browser and clear singleton instance."""
-        self.close_browser_BF()
-        RunBrowser.clear()
+        if self.launched and self.close_browser_BF:
+            self.close_browser_BF()
+        type(self).clear()
+
+
+class RunHeadlessBrowser(RunBrowser):
+    """
+    Headless browser for probes, separate from the headful RunBrowser (also launched on first use).
+
+    It starts its own Playwright instance, so use it from a different thread than RunBrowser.
+    """
+
+    def launch(self):
+        if not self.launched:
+            self._browser, self._page, self._context, self.close_browser_BF = ChromeBrowser().run_headless_browser()
+            self.launched = True
+        return self
 
+    def save_storage_state(self, path=STORAGE_STATE_PATH):
+        pass
@@ -0,0 +1,129 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Type
+
+from playwright.sync_api import Page
+
+from framework_inject.base.context import Context
+from framework_inject.browser import RunBrowser
+from framework_inject.constants import DEFAULT_BROWSER_POOL_SIZE, PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS
+from framework_inject.logger.logger import Logger
+from framework_inject.request_blocker import RequestBlocker
+
+class PoolExhausted(Exception):
+    pass
+
+
+class PagePool(Logger):
+    """
+    Pool of tabs in one browser process, each leased to a task as a page object instance.
+
+    Tabs are reused between leases instead of being opened and closed per task. A tab that crashed or was
+    closed while leased is discarded and replaced on the next acquire. With `isolated=True` every slot gets
+    its own browser context (separate cookies/storage) when the browser supports it.
+
+    Playwright's sync API is bound to the thread that started it, so a pool must be used from that thread;
+    concurrency comes from keeping several leased tabs loading at once.
+
+    A caller leasing a tab per in-flight item (e.g. ApprovalQueue, one per prepared draft) needs `size` to be at
+    least its lookahead, or `acquire` raises PoolExhausted.
+    """
+
+    def __init__(self, page_class: Type, size: int = DEFAULT_BROWSER_POOL_SIZE, isolated: bool = False,
+                 logger=__file__):
+        super().__init__(logger)
+        self.page_class = page_class
+        self.size = max(size, 1)
+        self.isolated = isolated
+        self.run_browser = RunBrowser()
+        self._idle = deque()
+        self._leased = set()
+        self._crashed = set()
+        self.recycled = 0
+
+    def _new_tab(self) -> Page:
+        if self.isolated and self.run_browser.browser:
+            context = self.run_browser.browser.new_context()
+            if RequestBlocker.shared().is_attached(self.run_browser.context):
+                RequestBlocker.shared().attach(context)
+        else:
+            context = self.run_browser.context
+        page = context.new_page()
+        page.set_default_timeout(PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS)
+        page.on("crash", lambda crashed_page: self._crashed.add(crashed_page))
+        return page
+
+    def acquire(self):
+        """
+        Lease a page object bound to an idle tab, opening a new tab if the pool is not full.
+
+        Raises:
+            PoolExhausted: If all `size` tabs are already leased.
+        """
+        while self._idle:
+            page = self._idle.popleft()
+            if self._is_healthy(page):
+                break
+            self.recycled += 1
+            self._discard(page)
+        else:
+            if len(self._leased) >= self.size:
+                raise PoolExhausted(f"All {self.size} pages are leased")
+            page = self._new_tab()
+
+        self._leased.add(page)
+        return self.page_class(page=page)
+
+    def release(self, page_object, reset: bool = True):
+        """
+        Return a leased page object. Unhealthy tabs are closed and replaced on a later acquire.
+        """
+        page = page_object.page
+        self._leased.discard(page)
+        if not self._is_healthy(page):
+            self.logger.info("Recycling crashed or closed pooled page")
+            self.recycled += 1
+            self._discard(page)
+            return
+        if reset:
+            try:
+                page.goto("about:blank")
+            except Exception as e:
+                self.logger.debug(f"Error resetting pooled page: {e}")
+                self._discard(page)
+                return
+        self._idle.append(page)
+
+    @contextmanager
+    def lease(self):
+        """
+        Lease a page object inside its own Context scope, so `Context()["I"]` is this page object for the
+        duration of the lease.
+        """
+        with Context.scope():
+            page_object = self.acquire()
+            try:
+                yield page_object
+            finally:
+                self.release(page_object)
+
+    def close(self):
+        for page in list(self._idle) + list(self._leased):
+            self._discard(page)
+        self._idle.clear()
+        self._leased.clear()
+
+    def _is_healthy(self, page: Page) -> bool:
+        return page not in self._crashed and not page.is_closed()
+
+    def _discard(self, page: Page):
+        self._crashed.discard(page)
+        try:
+            if not page.is_closed():
+                page.close()
+            if self.isolated and self.run_browser.browser and page.context != self.run_browser.context:
+                page.context.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing pooled page: {e}")
@@ -23,3 +23,54 @@ PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_MS = PLAYWRIGHT_PAGE_DEFAULT_TIMEOUT_SEC * SECON
 PLAYWRIGHT_DEFAULT_LOCALE = "en"
 
 LOG_TIME_STRUCTURE = "-%Y-%m-%d-%H%M-%S"
+
+DEFAULT_BROWSER_POOL_SIZE = 3
+
+READY_TIMEOUT_MS = 5 * SECOND
+DIALOG_READY_TIMEOUT_MS = 15 * SECOND
+NETWORK_IDLE_MS = 500
+READY_POLL_INTERVAL_MS = 100
+LOCATOR_CACHE_SIZE = 64
+
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font", "stylesheet"]
+TRACKER_DOMAINS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googleadservices.com",
+    "facebook.net", "hotjar.com", "segment.io", "segment.com", "bat.bing.com", "clarity.ms",
+    "quantserve.com", "scorecardresearch.com", "fullstory.com", "mxpnl.com", "amplitude.com",
+]
+STORAGE_STATE_FILE = "storage_state.json"
+PROBE_TIMEOUT_MS = 8 * SECOND
+
+SCREENSHOT_DIR = "logs/screenshots"
+SCREENSHOT_FORMATS = ("png", "jpeg", "webp")
+DEFAULT_SCREENSHOT_FORMAT = "png"
+DEFAULT_SCREENSHOT_QUALITY = 80
+DEFAULT_SCREENSHOT_MAX_MB = 200
+
+HTTP_CONNECT_TIMEOUT_SEC = 5
+HTTP_READ_TIMEOUT_SEC = 30
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+HTTP_POOL_SIZE = 10
+HTTP_CACHE_MAX_ENTRIES = 256
+DEBUGGER_TIMEOUT_SEC = 2
+
+LOG_DIR = "logs"
+LOG_FILE = "log.jsonl"
+LOG_CONSOLE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Rotate the JSON log by size, or by time when LOG_ROTATE_WHEN is set (TimedRotatingFileHandler `when`, e.g. "midnight")
+LOG_MAX_BYTES = 20 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# Fraction of DEBUG/INFO records kept per logger name prefix; warnings and errors are never sampled
+LOG_SAMPLING = {
+    "database.partners": 0.1
+}
+# Record attributes copied into JSON lines when set (via log_context/set_log_fields or `extra`)
+LOG_CONTEXT_FIELDS = ("campaign_id", "partner_id", "channel")
+
+# Upper bounds (seconds) of latency histogram buckets
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+METRICS_DIR = "metrics"
+TRACE_DIR = "traces"
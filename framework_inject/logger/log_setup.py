@@ -0,0 +1,179 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from threading import Lock
+from typing import Dict, Optional
+
+from framework_inject.constants import LOG_DIR, LOG_FILE, LOG_CONSOLE_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT, \
+    LOG_SAMPLING, LOG_CONTEXT_FIELDS
+
+_log_fields: ContextVar[Dict] = ContextVar("log_fields", default={})
+_static_fields = {}
+_listener: Optional[QueueListener] = None
+_lock = Lock()
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Add fields (e.g. partner_id) to every record logged in this thread / asyncio task until exit.
+    """
+    token = _log_fields.set({**_log_fields.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_fields.reset(token)
+
+
+def set_log_fields(**fields):
+    """Add fields (e.g. campaign_id) to every record from every thread."""
+    _static_fields.update(fields)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        for key, value in {**_static_fields, **_log_fields.get()}.items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in every 1 / rate DEBUG/INFO records per (logger, message template) for loggers matching a prefix in
+    `rates`; the first record of each template is always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._counts = {}
+
+    def _rate(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        key = (record.name, record.msg)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % round(1 / rate) == 0
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName
+        }
+        for key in LOG_CONTEXT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueue the record as is: message formatting happens on the listener thread rather than in the caller, so
+    arguments must not be mutated after the call.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def _sampling_rates() -> Dict[str, float]:
+    rates = dict(LOG_SAMPLING)
+    for item in filter(None, (part.strip() for part in os.getenv("LOG_SAMPLING", "").split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def _file_handler(path: str) -> logging.Handler:
+    when = os.getenv("LOG_ROTATE_WHEN")
+    if when:
+        return TimedRotatingFileHandler(path, when=when, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+    return RotatingFileHandler(path, maxBytes=int(os.getenv("LOG_MAX_BYTES", LOG_MAX_BYTES)),
+                               backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+
+
+def configure_logging(level=None, log_dir: str = LOG_DIR) -> logging.Logger:
+    """
+    Route every logger through one queue: callers only enqueue records, and a listener thread writes them to the
+    console and to a rotating JSON lines file. Safe to call more than once: only the first call sets up handlers,
+    a later call with an explicit level just updates the root level.
+
+    Args:
+        level: Root level, defaults to LOG_LEVEL from the environment (.env is loaded first) or INFO.
+        log_dir (str): Folder for the JSON log file.
+
+    Environment:
+        LOG_SAMPLING: Extra sampling rates, e.g. "telegram.telegram_bot=0.5".
+        LOG_ROTATE_WHEN / LOG_MAX_BYTES: Time or size based rotation.
+    """
+    global _listener
+    root = logging.getLogger()
+    with _lock:
+        if _listener is not None:
+            if level:
+                root.setLevel(level)
+            return root
+
+        from dotenv import load_dotenv
+
+        # Entry points configure logging at import, before anything else has read .env
+        load_dotenv()
+        level = level or os.getenv("LOG_LEVEL") or logging.INFO
+        os.makedirs(log_dir, exist_ok=True)
+
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(LOG_CONSOLE_FORMAT))
+        file = _file_handler(os.path.join(log_dir, LOG_FILE))
+        file.setFormatter(JsonFormatter())
+
+        handler = DeferredQueueHandler(queue.SimpleQueue())
+        handler.addFilter(SamplingFilter(_sampling_rates()))
+        handler.addFilter(ContextFilter())
+
+        for existing in root.handlers[:]:
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(handler.queue, console, file)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -5,15 +5,7 @@ from logging import LogRecord
 import os
 import time
 import sys
-from dotenv import load_dotenv
-
-from framework_inject.constants import LOG_TIME_STRUCTURE
-
-os.environ['TZ'] = 'Europe/Warsaw'
-time.tzset()
-
-load_dotenv()
-log_level = os.getenv("LOG_LEVEL")
+from framework_inject.logger.log_setup import configure_logging
 
 
 class SingletonLogger:
@@ -26,31 +18,16 @@ class SingletonLogger:
         return cls._instance
 
     def _initialize(self):
-        self.log_level = log_level
+        # Process-wide side effects (timezone, .env, log files) happen on first use rather than at import
+        from dotenv import load_dotenv
+
+        os.environ['TZ'] = 'Europe/Warsaw'
+        time.tzset()
+        load_dotenv()
+        self.log_level = os.getenv("LOG_LEVEL")
+        configure_logging(self.log_level)
+        # Records go through the root queue handler set up by configure_logging
         self.logger = logging.getLogger("UnifiedLogger")
-        self.logger.setLevel(logging.DEBUG)
-
-        if not os.path.exists("logs"):
-            os.mkdir("logs")
-
-        log_time = time.strftime(LOG_TIME_STRUCTURE, time.localtime(time.time()))
-        log_file = os.path.join("logs", f"log-{log_time}.log")
-
-        if not self.logger.handlers:
-            fh = logging.FileHandler(log_file, encoding="utf-8")
-            fh.setLevel(self.log_level)
-
-            ch = logging.StreamHandler()
-            ch.setLevel(self.log_level)
-
-            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            formatter.converter = time.localtime
-
-            fh.setFormatter(formatter)
-            ch.setFormatter(formatter)
-
-            self.logger.addHandler(fh)
-            self.logger.addHandler(ch)
 
         sys.excepthook = self.handle_exception
 
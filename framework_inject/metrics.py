@@ -0,0 +1,227 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import bisect
+import json
+import os
+import time
+from contextlib import contextmanager
+from threading import Lock, Thread
+from typing import Dict, Optional, Sequence, Tuple
+
+from framework_inject.constants import METRICS_LATENCY_BUCKETS, METRICS_DIR
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: Tuple, extra: Tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _summary_key(key: Tuple) -> str:
+    return ",".join(f"{name}={value}" for name, value in key) or "total"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic count per label set, e.g. messages sent by result."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def render(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(key)} {_format_value(value)}"
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {_summary_key(key): value for key, value in self._values.items()}
+
+
+class Histogram:
+    """Latency distribution per label set in fixed buckets, plus count, sum and max."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = METRICS_LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0,
+                                              "max": 0.0}
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+            series["max"] = max(series["max"], value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _quantile(self, series: Dict, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the observed max for the overflow bucket)."""
+        rank, seen = q * series["count"], 0
+        for bound, count in zip(self.buckets, series["counts"]):
+            seen += count
+            if seen >= rank:
+                return min(bound, series["max"])
+        return series["max"]
+
+    def render(self):
+        with self._lock:
+            items = [(key, dict(series, counts=list(series["counts"]))) for key, series in self._series.items()]
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {cumulative}"
+            yield f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {series['count']}"
+            yield f"{self.name}_sum{_format_labels(key)} {_format_value(series['sum'])}"
+            yield f"{self.name}_count{_format_labels(key)} {series['count']}"
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                _summary_key(key): {
+                    "count": series["count"],
+                    "sum": round(series["sum"], 4),
+                    "mean": round(series["sum"] / series["count"], 4),
+                    "p50": round(self._quantile(series, 0.5), 4),
+                    "p95": round(self._quantile(series, 0.95), 4),
+                    "max": round(series["max"], 4)
+                }
+                for key, series in self._series.items()
+            }
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and histograms. Prometheus text is served by `serve(port)` for long-running processes;
+    one-shot CLI runs write `write_summary()` instead.
+    """
+
+    _shared = None
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = Lock()
+        self.started = time.time()
+        self._server = None
+
+    @classmethod
+    def shared(cls) -> "MetricsRegistry":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _get_or_create(self, metric_class, name, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._get_or_create(Counter, name, help)
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = METRICS_LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, buckets)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "seconds": round(time.time() - self.started, 3),
+            "metrics": {metric.name: metric.summary() for metric in metrics if metric.summary()}
+        }
+
+    def write_summary(self, path: Optional[str] = None, run_name: str = "run") -> str:
+        """
+        Write `summary()` as JSON, by default to metrics/<run_name>-<start time>.json. Returns the path.
+        """
+        if path is None:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+            path = os.path.join(METRICS_DIR, f"{run_name}-{stamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve GET /metrics on a daemon thread until the process exits."""
+        if self._server is not None:
+            return self._server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+        return self._server
@@ -0,0 +1,63 @@
+from framework_inject.base.async_base_page import AsyncBasePage
+from framework_inject.constants import READY_TIMEOUT_MS, DIALOG_READY_TIMEOUT_MS
+from framework_inject.metrics import MetricsRegistry
+from framework_inject.request_blocker import RequestBlocker
+from framework_inject.page_object.constants import PROFILE_PAGE_SELECTORS, MESSAGING_REQUEST_PATTERN
+from framework_inject.utils.time_util import StepTimer
+
+DRAFT_STEP_SECONDS = MetricsRegistry.shared().histogram("browser_draft_step_seconds",
+                                                        "Time per step of preparing an Upwork message draft")
+DRAFTS = MetricsRegistry.shared().counter("browser_drafts_total", "Upwork message drafts prepared")
+
+
+class AsyncProfilePage(AsyncBasePage):
+    def __init__(self, logger=__file__, page=None, run_browser=None):
+        super().__init__(logger, page=page, run_browser=run_browser)
+        self.SELECTORS = PROFILE_PAGE_SELECTORS
+        self.timings = StepTimer()
+
+    async def open_profile_page(self, profile_url):
+        await self.goto(profile_url)
+
+    async def open_messanger(self):
+        await self.click(self.SELECTORS["MESSAGE_BUTTON"])
+
+    async def wait_dialog_ready(self):
+        await self.wait_for_element(self.SELECTORS["DIALOG_IFRAME"], time=DIALOG_READY_TIMEOUT_MS, state="attached")
+        iframe = await self.get_iframe(self.SELECTORS["DIALOG_IFRAME"])
+        await self.wait_for_element(self.SELECTORS["PLACEHOLDER_TEXT"], frame=iframe, time=READY_TIMEOUT_MS)
+        return iframe
+
+    async def wait_send_ready(self, iframe) -> bool:
+        return await self.wait_for_enabled(self.SELECTORS["SEND_MESSAGE_BUTTON"], frame=iframe)
+
+    async def fill_message(self, iframe, message):
+        await self.click_and_fill_text(self.SELECTORS["PLACEHOLDER_TEXT"], frame=iframe, text=message)
+        if not await self.wait_send_ready(iframe):
+            self.logger.debug("Send button did not become enabled")
+
+    async def write_and_send_message(self, message):
+        await self.fill_message(await self.wait_dialog_ready(), message)
+
+    async def prepare_draft(self, profile_url, message):
+        self.timings = StepTimer(DRAFT_STEP_SECONDS, trace_prefix="browser")
+        RequestBlocker.shared().reset(self.page)
+        with self.timings.step("open"):
+            await self.open_profile_page(profile_url)
+        with self.track_requests(MESSAGING_REQUEST_PATTERN) as messaging:
+            with self.timings.step("messenger"):
+                await self.open_messanger()
+            with self.timings.step("dialog"):
+                iframe = await self.wait_dialog_ready()
+            with self.timings.step("xhr"):
+                await self.wait_for_network_idle(messaging)
+        with self.timings.step("fill"):
+            await self.fill_message(iframe, message)
+        self.logger.info(f"Draft ready for {profile_url} in {self.timings}, "
+                         f"{RequestBlocker.shared().summary(self.page)}")
+        DRAFTS.inc()
+
+    async def confirm_send_message(self):
+        with self.track_requests(MESSAGING_REQUEST_PATTERN) as messaging:
+            await self.click_enter()
+            await self.wait_for_network_idle(messaging)
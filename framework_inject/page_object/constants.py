@@ -0,0 +1,19 @@
+import os
+
+PROFILE_PAGE_SELECTORS = {
+    "MESSAGE_BUTTON": "//div[contains(@class, 'profile-outer-card')]/section//button[contains(text(), 'Message')]",
+    "DIALOG_IFRAME": "//div[@role='dialog']//iframe",
+    "PLACEHOLDER_TEXT": '//*[@id="__layout"]//p[@data-placeholder]',
+    "INPUT_DIV": "//div[@contenteditable]",
+    "SEND_MESSAGE_BUTTON": '//button[@data-cy="send-message"]'
+}
+
+# Substring of the XHR the messenger dialog fires when it loads a room and when a message is sent
+MESSAGING_REQUEST_PATTERN = "/messages/"
+
+# XHR the Upwork profile page loads its data from, and the flags in it that tell whether the freelancer can be messaged
+PROFILE_DETAILS_REQUEST_PATTERN = "/api/v1/freelancer/profile/"
+PROFILE_MESSAGEABLE_KEYS = ("canMessage", "isMessageable", "canContact", "canBeContacted")
+
+# Probe Upwork profiles headlessly (see ProfileProbe) before preparing drafts
+UPWORK_PROBE = os.getenv("UPWORK_PROBE", "").lower() in ("1", "true", "yes")
@@ -1,36 +1,70 @@
-import random
-
 from framework_inject.base.base_page import BasePage
-from framework_inject.constants import DEFAULT_WAIT_TIME_SEC, SECOND
-from framework_inject.utils.time_util import wait_time, wait_random_time
+from framework_inject.constants import READY_TIMEOUT_MS, DIALOG_READY_TIMEOUT_MS
+from framework_inject.metrics import MetricsRegistry
+from framework_inject.request_blocker import RequestBlocker
+from framework_inject.page_object.constants import PROFILE_PAGE_SELECTORS, MESSAGING_REQUEST_PATTERN
+from framework_inject.utils.time_util import StepTimer
+
+DRAFT_STEP_SECONDS = MetricsRegistry.shared().histogram("browser_draft_step_seconds",
+                                                        "Time per step of preparing an Upwork message draft")
+DRAFTS = MetricsRegistry.shared().counter("browser_drafts_total", "Upwork message drafts prepared")
 
 
 class ProfilePage(BasePage):
-    def __init__(self, logger=__file__, id=0):
-        super().__init__(logger, id=id)
-        self.SELECTORS = {
-            "MESSAGE_BUTTON": "//div[contains(@class, 'profile-outer-card')]/section//button[contains(text(), 'Message')]",
-            "DIALOG_IFRAME": "//div[@role='dialog']//iframe",
-            "PLACEHOLDER_TEXT": '//*[@id="__layout"]//p[@data-placeholder]',
-            "INPUT_DIV": "//div[@contenteditable]",
-            "SEND_MESSAGE_BUTTON": '//button[@data-cy="send-message"]'
-        }
+    def __init__(self, logger=__file__, id=0, page=None):
+        super().__init__(logger, id=id, page=page)
+        self.SELECTORS = PROFILE_PAGE_SELECTORS
+        self.timings = StepTimer()
 
     def open_profile_page(self, profile_url):
         self.goto(profile_url)
 
     def open_messanger(self):
-        self.wait_for_element(self.SELECTORS["MESSAGE_BUTTON"])
         self.click(self.SELECTORS["MESSAGE_BUTTON"])
 
-    def write_and_send_message(self, message):
-        self.wait_for_element(self.SELECTORS["DIALOG_IFRAME"], time=SECOND * 15)
+    def wait_dialog_ready(self):
+        """
+        Wait for the messenger dialog iframe to be attached and its input to be rendered.
+        Returns the dialog frame.
+        """
+        self.wait_for_element(self.SELECTORS["DIALOG_IFRAME"], time=DIALOG_READY_TIMEOUT_MS, state="attached")
         iframe = self.get_iframe(self.SELECTORS["DIALOG_IFRAME"])
-        self.wait_for_element(self.SELECTORS["PLACEHOLDER_TEXT"], frame=iframe)
+        self.wait_for_element(self.SELECTORS["PLACEHOLDER_TEXT"], frame=iframe, time=READY_TIMEOUT_MS)
+        return iframe
+
+    def wait_send_ready(self, iframe) -> bool:
+        return self.wait_for_enabled(self.SELECTORS["SEND_MESSAGE_BUTTON"], frame=iframe)
+
+    def fill_message(self, iframe, message):
         self.click_and_fill_text(self.SELECTORS["PLACEHOLDER_TEXT"], frame=iframe, text=message)
+        if not self.wait_send_ready(iframe):
+            self.logger.debug("Send button did not become enabled")
+
+    def write_and_send_message(self, message):
+        self.fill_message(self.wait_dialog_ready(), message)
+
+    def prepare_draft(self, profile_url, message):
+        self.timings = StepTimer(DRAFT_STEP_SECONDS, trace_prefix="browser")
+        RequestBlocker.shared().reset(self.page)
+        with self.timings.step("open"):
+            self.open_profile_page(profile_url)
+        with self.track_requests(MESSAGING_REQUEST_PATTERN) as messaging:
+            with self.timings.step("messenger"):
+                self.open_messanger()
+            with self.timings.step("dialog"):
+                iframe = self.wait_dialog_ready()
+            with self.timings.step("xhr"):
+                self.wait_for_network_idle(messaging)
+        with self.timings.step("fill"):
+            self.fill_message(iframe, message)
+        self.logger.info(f"Draft ready for {profile_url} in {self.timings}, "
+                         f"{RequestBlocker.shared().summary(self.page)}")
+        DRAFTS.inc()
 
     def confirm_send_message(self):
-        self.click_enter()
+        with self.track_requests(MESSAGING_REQUEST_PATTERN) as messaging:
+            self.click_enter()
+            self.wait_for_network_idle(messaging)
 
     def prepare_and_write_message(self, text):
         if self.wait_for_element_conditional(self.SELECTORS["MESSAGE_CONTAINER_NO_BUTTON"], time=2000):
@@ -40,4 +74,4 @@ class ProfilePage(BasePage):
 
     def send_message(self):
         self.click(self.SELECTORS["SEND_MESSAGE_BUTTON"])
-        self.wait_for_element(self.SELECTORS["MESSAGE_SENT_CONFIRMATION"])
\ No newline at end of file
+        self.wait_for_element(self.SELECTORS["MESSAGE_SENT_CONFIRMATION"])
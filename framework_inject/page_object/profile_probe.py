@@ -0,0 +1,73 @@
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from framework_inject.base.base_page import BasePage
+from framework_inject.browser import RunHeadlessBrowser
+from framework_inject.constants import PROBE_TIMEOUT_MS
+from framework_inject.metrics import MetricsRegistry
+from framework_inject.tracing import Tracer
+from framework_inject.page_object.constants import PROFILE_DETAILS_REQUEST_PATTERN, PROFILE_MESSAGEABLE_KEYS
+
+PROBE_SECONDS = MetricsRegistry.shared().histogram("browser_probe_seconds",
+                                                   "Headless Upwork profile probe latency, by outcome")
+
+
+class ProfileProbe(BasePage):
+    """
+    Checks whether a profile is reachable and messageable from the JSON the profile page fetches for itself.
+
+    Runs in a headless browser with static resources blocked and stops the page load as soon as the profile XHR
+    has been captured, so no DOM is scraped and almost nothing is rendered.
+    """
+    run_browser_class = RunHeadlessBrowser
+
+    def __init__(self, logger=__file__, page=None):
+        super().__init__(logger, page=page)
+
+    def check(self, profile_url: str) -> Dict[str, Any]:
+        """
+        Probe one profile. `reachable` and `messageable` stay None (unknown) when the probe itself fails, e.g. the
+        profile XHR was not seen before PROBE_TIMEOUT_MS; only an actual response decides them.
+        """
+        started = time.perf_counter()
+        result = {"url": profile_url, "reachable": None, "messageable": None, "status": None}
+        try:
+            with Tracer.shared().span("browser.probe", url=profile_url):
+                response = self.intercept_response(
+                    PROFILE_DETAILS_REQUEST_PATTERN,
+                    lambda: self.page.goto(profile_url, wait_until="commit"),
+                    timeout=PROBE_TIMEOUT_MS
+                )
+            # Everything needed is in the XHR; don't let the page finish loading
+            self.page.evaluate("window.stop()")
+            result["status"] = response.status
+            result["reachable"] = response.ok
+            if response.ok:
+                result["messageable"] = self._find_flag(response.json(), PROFILE_MESSAGEABLE_KEYS)
+        except Exception as e:
+            result["error"] = str(e).splitlines()[0] if str(e) else e.__class__.__name__
+            self.logger.warning(f"Probe of {profile_url} failed, keeping the profile: {result['error']}")
+        elapsed = time.perf_counter() - started
+        result["seconds"] = round(elapsed, 2)
+        if result["reachable"] is None:
+            outcome = "error"
+        else:
+            outcome = "reachable" if result["reachable"] else "unreachable"
+        PROBE_SECONDS.observe(elapsed, outcome=outcome)
+        self.logger.debug(f"Probed {profile_url}: {result}")
+        return result
+
+    @staticmethod
+    def _find_flag(data, keys: Iterable[str]) -> Optional[bool]:
+        """Depth-first search for the first boolean under one of `keys`; None if the payload has none of them."""
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, dict):
+                for key in keys:
+                    if isinstance(item.get(key), bool):
+                        return item[key]
+                stack.extend(reversed(list(item.values())))
+            elif isinstance(item, list):
+                stack.extend(reversed(item))
+        return None
@@ -0,0 +1,168 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import atexit
+import base64
+import datetime
+import hashlib
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+from framework_inject.constants import SCREENSHOT_FORMATS, DEFAULT_SCREENSHOT_FORMAT, \
+    DEFAULT_SCREENSHOT_QUALITY, DEFAULT_SCREENSHOT_MAX_MB, LOG_TIME_STRUCTURE
+from framework_inject.logger.logger import Logger
+
+SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", DEFAULT_SCREENSHOT_FORMAT).lower()
+SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", DEFAULT_SCREENSHOT_QUALITY))
+SCREENSHOT_MAX_BYTES = int(float(os.getenv("SCREENSHOT_MAX_MB", DEFAULT_SCREENSHOT_MAX_MB)) * 1024 * 1024)
+
+EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+
+def screenshot_options(image_format: Optional[str] = None, quality: Optional[int] = None,
+                       clip: Optional[Dict] = None) -> Dict:
+    """
+    Normalised capture options. `quality` only applies to lossy formats; WebP is captured through CDP because
+    Playwright's screenshot API only encodes PNG and JPEG.
+    """
+    image_format = (image_format or SCREENSHOT_FORMAT).lower()
+    if image_format == "jpg":
+        image_format = "jpeg"
+    if image_format not in SCREENSHOT_FORMATS:
+        raise ValueError(f"Unsupported screenshot format '{image_format}', expected one of {SCREENSHOT_FORMATS}")
+    options = {"type": image_format}
+    if image_format != "png":
+        options["quality"] = quality if quality is not None else SCREENSHOT_QUALITY
+    if clip:
+        options["clip"] = clip
+    return options
+
+
+def screenshot_path(folder: str, file_name: Optional[str], tag: str, image_format: str) -> str:
+    extension = EXTENSIONS[image_format]
+    if not file_name:
+        file_name = datetime.datetime.now().strftime(f"{LOG_TIME_STRUCTURE}-{tag}{extension}")
+    elif not file_name.endswith(extension):
+        file_name += extension
+    return os.path.join(folder, file_name)
+
+
+def cdp_capture_params(options: Dict, full_page_size: Optional[Dict] = None) -> Dict:
+    """`Page.captureScreenshot` parameters for the given options (used for WebP)."""
+    params = {"format": options["type"], "captureBeyondViewport": bool(full_page_size)}
+    if "quality" in options:
+        params["quality"] = options["quality"]
+    clip = options.get("clip") or ({"x": 0, "y": 0, **full_page_size} if full_page_size else None)
+    if clip:
+        params["clip"] = {"scale": 1, **clip}
+    return params
+
+
+def decode_cdp_capture(result: Dict) -> bytes:
+    return base64.b64decode(result["data"])
+
+
+class ScreenshotWriter(Logger):
+    """
+    Writes captured screenshots on a background thread so the automation thread only pays for the capture.
+
+    Files are deduplicated by content hash: a capture identical to one already on disk is stored as a hard link
+    to it (or skipped where links are unsupported). Once the folder exceeds `max_bytes`, the oldest files are
+    evicted until it fits again. The writer thread is a daemon, so pending files are flushed at interpreter exit.
+    """
+    _shared = None
+
+    def __init__(self, max_bytes: int = SCREENSHOT_MAX_BYTES, logger=__file__):
+        super().__init__(logger)
+        self.max_bytes = max_bytes
+        self._queue = queue.Queue()
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.deduplicated = 0
+        self.evicted = 0
+        atexit.register(self.flush)
+
+    @classmethod
+    def shared(cls) -> "ScreenshotWriter":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def submit(self, data: bytes, file_path: str):
+        """Queue `data` to be written to `file_path`; returns immediately."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((data, file_path))
+
+    def flush(self):
+        """Block until every queued screenshot has been written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            data, file_path = self._queue.get()
+            try:
+                self._write(data, file_path)
+            except Exception as e:
+                self.logger.debug(f"Error writing screenshot {file_path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _index(self, folder: str) -> Dict[str, str]:
+        """Content hash -> path for the files already in `folder`, built once per folder."""
+        if folder not in self._hashes:
+            index = {}
+            for entry in sorted(os.scandir(folder), key=lambda item: item.stat().st_mtime):
+                if entry.is_file():
+                    with open(entry.path, "rb") as existing:
+                        index.setdefault(hashlib.sha256(existing.read()).hexdigest(), entry.path)
+            self._hashes[folder] = index
+        return self._hashes[folder]
+
+    def _write(self, data: bytes, file_path: str):
+        folder = os.path.dirname(file_path) or "."
+        os.makedirs(folder, exist_ok=True)
+        index = self._index(folder)
+        digest = hashlib.sha256(data).hexdigest()
+
+        original = index.get(digest)
+        if original and os.path.exists(original):
+            self.deduplicated += 1
+            try:
+                os.link(original, file_path)
+                self.logger.debug(f"Screenshot {file_path} is identical to {original}, linked")
+            except OSError:
+                self.logger.debug(f"Screenshot {file_path} is identical to {original}, skipped")
+            return
+
+        with open(file_path, "wb") as screenshot:
+            screenshot.write(data)
+        index[digest] = file_path
+        self.written += 1
+        self.logger.debug(f"Screenshot saved to {file_path}")
+        self._evict(folder)
+
+    def _evict(self, folder: str):
+        if not self.max_bytes:
+            return
+        files = sorted((entry for entry in os.scandir(folder) if entry.is_file()), key=lambda item: item.stat().st_mtime)
+        # Hard-linked duplicates share their bytes, so each inode is counted once
+        sizes = {entry.stat().st_ino: entry.stat().st_size for entry in files}
+        total = sum(sizes.values())
+        for entry in files:
+            if total <= self.max_bytes:
+                break
+            stat = os.stat(entry.path)  # DirEntry.stat() is cached, the link count must be current
+            os.remove(entry.path)
+            self.evicted += 1
+            if stat.st_nlink <= 1:
+                total -= sizes.get(stat.st_ino, 0)
+        index = self._hashes.get(folder, {})
+        for digest, path in list(index.items()):
+            if not os.path.exists(path):
+                del index[digest]
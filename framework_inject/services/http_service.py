@@ -1,36 +1,200 @@
 """Framework: https://github.com/eshut/Framework-Python"""
 
+import asyncio
+import time
+import weakref
+from collections import OrderedDict, defaultdict
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode, parse_qs, urlsplit
+
 import requests
-from urllib.parse import urlencode, parse_qs
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from framework_inject.constants import HTTP_CONNECT_TIMEOUT_SEC, HTTP_READ_TIMEOUT_SEC, HTTP_RETRIES, \
+    HTTP_BACKOFF_FACTOR, HTTP_RETRY_STATUSES, HTTP_IDEMPOTENT_METHODS, HTTP_POOL_SIZE, HTTP_CACHE_MAX_ENTRIES
 from framework_inject.logger.logger import Logger
+from framework_inject.metrics import MetricsRegistry
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT_SEC, HTTP_READ_TIMEOUT_SEC)
+
+HTTP_REQUESTS = MetricsRegistry.shared().counter("http_requests_total", "HTTP requests sent, by host")
+HTTP_CONNECTIONS = MetricsRegistry.shared().counter("http_connections_total", "HTTP connections opened, by host")
+HTTP_REUSED = MetricsRegistry.shared().counter("http_connections_reused_total",
+                                               "HTTP requests served on a kept-alive connection, by host")
+EXPORTED_METRICS = {"requests": HTTP_REQUESTS, "connections": HTTP_CONNECTIONS, "reused": HTTP_REUSED}
+
+
+def build_session(retries: int = HTTP_RETRIES, backoff_factor: float = HTTP_BACKOFF_FACTOR,
+                  pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """
+    Session with keep-alive connection pools and retry/backoff on idempotent methods (connection errors and
+    HTTP_RETRY_STATUSES). POST is never retried.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(HTTP_IDEMPOTENT_METHODS),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_default_session = None
+_default_session_lock = Lock()
+
+
+def default_session() -> requests.Session:
+    """Process-wide pooled session for one-off calls (e.g. the CDP debugger endpoint)."""
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = build_session()
+        return _default_session
+
+
+def session_metrics(session: requests.Session) -> Dict[str, Dict[str, int]]:
+    """
+    Per-host requests and connections from the session's urllib3 pools; `reused` is requests served on a kept-alive
+    connection.
+    """
+    metrics = defaultdict(lambda: {"requests": 0, "connections": 0, "reused": 0})
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = metrics[f"{key.key_scheme}://{key.key_host}:{key.key_port}"]
+            host["requests"] += pool.num_requests
+            host["connections"] += pool.num_connections
+            host["reused"] += max(pool.num_requests - pool.num_connections, 0)
+    return dict(metrics)
+
+
+_exported = weakref.WeakKeyDictionary()
+_exported_lock = Lock()
+
+
+def export_session_metrics(session: requests.Session):
+    """
+    Add what the session's pools counted since the last export to the http_* counters of the MetricsRegistry.
+    Tracked per session, so clients sharing one are not counted twice.
+    """
+    current = session_metrics(session)
+    with _exported_lock:
+        previous = _exported.get(session, {})
+        for host, counts in current.items():
+            for field, counter in EXPORTED_METRICS.items():
+                added = counts[field] - previous.get(host, {}).get(field, 0)
+                if added > 0:
+                    counter.inc(added, host=host)
+        _exported[session] = current
+
+
+class ResponseCache:
+    """Small TTL + LRU cache of responses keyed by method, URL and params."""
+
+    def __init__(self, ttl: float, max_entries: int = HTTP_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(method: str, url: str, params=None) -> Tuple:
+        items = sorted(params.items()) if isinstance(params, dict) else params
+        return method.upper(), url, urlencode(items or [], doseq=True)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, response):
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
 
 
 class API(Logger):
-    def __init__(self, site, logger=__file__):
+    """
+    Client for one site on a pooled, retrying session. Per-host connection reuse is exported to the
+    MetricsRegistry after every request (see `export_session_metrics`).
+
+    Args:
+        site (str): Base URL prefixed to every uri.
+        timeout: Seconds, or a (connect, read) tuple. Every call has one, so nothing can hang forever.
+        cache_ttl (Optional[float]): Cache successful GET responses by URL + params for this many seconds.
+        session (Optional[requests.Session]): Share a session (and its connection pools) between clients.
+    """
+
+    def __init__(self, site, logger=__file__, timeout=DEFAULT_TIMEOUT, retries: int = HTTP_RETRIES,
+                 cache_ttl: Optional[float] = None, session: Optional[requests.Session] = None):
         super().__init__(logger)
         self.site = site
+        self.timeout = timeout
+        self.session = session or build_session(retries=retries)
+        self.cache = ResponseCache(cache_ttl) if cache_ttl else None
+
+    def request(self, method, uri, params=None, **kwargs) -> requests.Response:
+        url = self.site + uri
+        cache_key = ResponseCache.key(method, url, params) if self.cache and method.upper() == "GET" else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            response = self.session.request(method, url, params=params, **kwargs)
+        finally:
+            export_session_metrics(self.session)
+        if cache_key and response.ok:
+            self.cache.put(cache_key, response)
+        return response
 
     def status(self, uri):
         '''
         :return: request > request.status_code
         '''
         self.logger.debug("Trying to get status code")
-        req = requests.get(self.site + uri)
-        result = req
-        return result
+        return self.request("GET", uri)
 
     def get(self, uri, params=None, headers=None):
         self.logger.debug("Trying to get Json")
-        response = requests.get(self.site + uri, params=params, headers=headers)
+        response = self.request("GET", uri, params=params, headers=headers)
         response.raise_for_status()
         return response
 
     def post(self, uri, data, headers=None):
         self.logger.debug("Trying to send POST data to: " + str(self.site + uri) + " With data: " + str(data))
-        result = requests.post(self.site + uri, data=data, headers=headers)
+        result = self.request("POST", uri, data=data, headers=headers)
         self.logger.debug("Got response: " + str(result) + "With data: " + str(result.text))
         return result
 
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        return session_metrics(self.session)
+
+    def close(self):
+        self.session.close()
+
     def build_payload(self, **params):
         """
         Constructs a payload string from key-value pairs.
@@ -58,3 +222,105 @@ class API(Logger):
         # Flatten single-item lists for convenience
         return {key: value[0] if len(value) == 1 else value for key, value in parsed.items()}
 
+
+class AsyncAPI(Logger):
+    """
+    aiohttp counterpart of API (aiohttp is imported on first use): one pooled keep-alive connector, timeouts,
+    retry with exponential backoff on idempotent methods, the same optional GET cache, and per-host connection reuse
+    metrics collected through aiohttp tracing and exported to the MetricsRegistry.
+
+    Responses are returned with their body already read, so `await response.json()` / `.text()` work after the
+    connection has gone back to the pool.
+    """
+
+    def __init__(self, site, logger=__file__, timeout=DEFAULT_TIMEOUT, retries: int = HTTP_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR, cache_ttl: Optional[float] = None,
+                 pool_size: int = HTTP_POOL_SIZE):
+        super().__init__(logger)
+        self.site = site
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.cache = ResponseCache(cache_ttl) if cache_ttl else None
+        self._session = None
+        self._metrics = defaultdict(lambda: {"requests": 0, "connections": 0, "reused": 0})
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            connect, read = self.timeout if isinstance(self.timeout, tuple) else (self.timeout, self.timeout)
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(self._on_request_start)
+            trace.on_connection_create_end.append(self._on_connection_created)
+            trace.on_connection_reuseconn.append(self._on_connection_reused)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+                trace_configs=[trace]
+            )
+        return self._session
+
+    async def _on_request_start(self, session, context, params):
+        url = urlsplit(str(params.url))
+        context.host = f"{url.scheme}://{url.hostname}:{url.port or (443 if url.scheme == 'https' else 80)}"
+        self._count(context.host, "requests")
+
+    async def _on_connection_created(self, session, context, params):
+        self._count(context.host, "connections")
+
+    async def _on_connection_reused(self, session, context, params):
+        self._count(context.host, "reused")
+
+    def _count(self, host: str, field: str):
+        self._metrics[host][field] += 1
+        EXPORTED_METRICS[field].inc(host=host)
+
+    async def request(self, method, uri, params=None, **kwargs):
+        url = self.site + uri
+        cache_key = ResponseCache.key(method, url, params) if self.cache and method.upper() == "GET" else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        session = await self._get_session()
+        attempts = self.retries + 1 if method.upper() in HTTP_IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await session.request(method, url, params=params, **kwargs)
+                await response.read()
+            except Exception as e:
+                if last_attempt:
+                    raise
+                self.logger.debug(f"{method} {url} failed ({e}), retrying")
+            else:
+                if response.status not in HTTP_RETRY_STATUSES or last_attempt:
+                    break
+                self.logger.debug(f"{method} {url} returned {response.status}, retrying")
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+        if cache_key and response.ok:
+            self.cache.put(cache_key, response)
+        return response
+
+    async def status(self, uri):
+        return await self.request("GET", uri)
+
+    async def get(self, uri, params=None, headers=None):
+        response = await self.request("GET", uri, params=params, headers=headers)
+        response.raise_for_status()
+        return response
+
+    async def post(self, uri, data, headers=None):
+        self.logger.debug("Trying to send POST data to: " + str(self.site + uri) + " With data: " + str(data))
+        return await self.request("POST", uri, data=data, headers=headers)
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        return {host: dict(counts) for host, counts in self._metrics.items()}
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
@@ -0,0 +1,148 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import io
+import json
+import os
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+ImageSource = Union[str, bytes, Image.Image, np.ndarray]
+
+HASH_SIZE = 8
+DEFAULT_MAX_DISTANCE = 5
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
+
+def load_gray(source: ImageSource, size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Grayscale uint8 array for a path, encoded bytes, PIL image or array, resized in memory to `size` (width, height).
+    Files are only read, never rewritten.
+    """
+    if isinstance(source, np.ndarray):
+        image = Image.fromarray(source)
+    elif isinstance(source, Image.Image):
+        image = source
+    elif isinstance(source, bytes):
+        image = Image.open(io.BytesIO(source))
+    else:
+        image = Image.open(source)
+    image = image.convert("L")
+    if size and image.size != tuple(size):
+        image = image.resize(size, Image.BILINEAR)
+    return np.asarray(image, dtype=np.uint8)
+
+
+class ImageComparator:
+    @staticmethod
+    def diff_percentage(first: ImageSource, second: ImageSource, tolerance: int = 0) -> float:
+        """
+        Percentage of pixels that differ by more than `tolerance` grey levels, with `second` resized to `first`.
+        """
+        reference = load_gray(first)
+        other = load_gray(second, size=(reference.shape[1], reference.shape[0]))
+        diff = np.abs(reference.astype(np.int16) - other.astype(np.int16))
+        return float(np.count_nonzero(diff > tolerance) * 100 / diff.size)
+
+    @staticmethod
+    def average_hash(source: ImageSource, hash_size: int = HASH_SIZE) -> int:
+        """aHash: one bit per cell of a hash_size x hash_size thumbnail, set where the cell is brighter than the mean."""
+        pixels = load_gray(source, size=(hash_size, hash_size)).astype(np.float32)
+        return _bits_to_int(pixels > pixels.mean())
+
+    @staticmethod
+    def difference_hash(source: ImageSource, hash_size: int = HASH_SIZE) -> int:
+        """dHash: one bit per horizontally adjacent pixel pair, set where brightness increases to the right."""
+        pixels = load_gray(source, size=(hash_size + 1, hash_size)).astype(np.int16)
+        return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+    @staticmethod
+    def hamming(first: int, second: int) -> int:
+        return bin(first ^ second).count("1")
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    return np.unpackbits(values.view(np.uint8)).reshape(len(values), -1).sum(axis=1)
+
+
+class ImageHashIndex:
+    """
+    aHash + dHash of previously seen images, so a new image is matched against thousands of them with one vectorised
+    Hamming-distance pass instead of N full-image diffs. Persisted as JSON when `path` is given.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.keys: List[str] = []
+        self._ahashes = np.zeros(0, dtype=np.uint64)
+        self._dhashes = np.zeros(0, dtype=np.uint64)
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def hashes(source: ImageSource) -> Tuple[int, int]:
+        image = source if isinstance(source, Image.Image) else Image.fromarray(load_gray(source))
+        return ImageComparator.average_hash(image), ImageComparator.difference_hash(image)
+
+    def add(self, key: str, source: ImageSource) -> Tuple[int, int]:
+        ahash, dhash = self.hashes(source)
+        self.add_hashes(key, ahash, dhash)
+        return ahash, dhash
+
+    def add_hashes(self, key: str, ahash: int, dhash: int):
+        self.keys.append(key)
+        self._ahashes = np.append(self._ahashes, np.uint64(ahash))
+        self._dhashes = np.append(self._dhashes, np.uint64(dhash))
+
+    def add_folder(self, folder: str) -> int:
+        """Index every image in `folder` that isn't indexed yet; returns the number added."""
+        known = set(self.keys)
+        added = 0
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if path not in known and name.lower().endswith(IMAGE_EXTENSIONS):
+                self.add(path, path)
+                added += 1
+        return added
+
+    def find(self, source: ImageSource, max_distance: int = DEFAULT_MAX_DISTANCE) -> List[Tuple[str, int]]:
+        """
+        Indexed images whose aHash and dHash are both within `max_distance` bits of `source`'s, closest first.
+
+        Returns:
+            List[Tuple[str, int]]: (key, dHash distance) pairs.
+        """
+        if not self.keys:
+            return []
+        ahash, dhash = self.hashes(source)
+        a_distances = _popcount(self._ahashes ^ np.uint64(ahash))
+        d_distances = _popcount(self._dhashes ^ np.uint64(dhash))
+        matches = np.flatnonzero((a_distances <= max_distance) & (d_distances <= max_distance))
+        return sorted(((self.keys[i], int(d_distances[i])) for i in matches), key=lambda match: match[1])
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as index_file:
+            entries: Dict[str, List[str]] = json.load(index_file).get("entries", {})
+        self.keys = list(entries)
+        self._ahashes = np.array([int(a, 16) for a, _ in entries.values()], dtype=np.uint64)
+        self._dhashes = np.array([int(d, 16) for _, d in entries.values()], dtype=np.uint64)
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        entries = {key: [f"{int(a):016x}", f"{int(d):016x}"]
+                   for key, a, d in zip(self.keys, self._ahashes, self._dhashes)}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump({"hash_size": HASH_SIZE, "entries": entries}, index_file)
+        os.replace(tmp_path, path)
@@ -7,12 +7,10 @@ from random import choice
 from string import ascii_lowercase, ascii_uppercase
 from string import digits
 
-import cv2
-import numpy as np
 import pyautogui
-from PIL import Image
 
 from framework.Base.BaseElement import *
+from framework_inject.services.image_service import ImageComparator
 
 FILES = jsonGetter.GetJson.get_file(CONFIG, "Files")
 
@@ -39,19 +37,10 @@ class SysOperations:
 
     @staticmethod
     def compare_images(path_1, path_2):
-        image1 = Image.open(path_1)
-        size = image1.size
-        image2 = Image.open(path_2)
-        image2 = image2.convert("RGB")
-        new_image2 = image2.resize(size)
-        new_image2.save(path_2, quality=95)
-
-        img1 = cv2.imread(path_1, 0)
-        img2 = cv2.imread(path_2, 0)
-
+        """
+        Percentage of differing pixels, with the second image resized to the first in memory (files are untouched).
+        """
         try:
-            res = cv2.absdiff(img2, img1)
-            percentage = (np.count_nonzero(res) * 100) / res.size
-        except:
-            percentage = 99999
-        return percentage
+            return ImageComparator.diff_percentage(path_1, path_2)
+        except Exception:
+            return 99999
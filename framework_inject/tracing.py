@@ -0,0 +1,103 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+from framework_inject.constants import TRACE_DIR
+
+_NOOP = nullcontext()
+_PARTNER_TRACK_BASE = 10 ** 9
+_track: ContextVar[Optional[int]] = ContextVar("trace_track", default=None)
+
+
+class Tracer:
+    """
+    Records nested spans as Chrome trace events (open the exported JSON in Perfetto or chrome://tracing).
+
+    Disabled by default: `span()` and `track()` then return a shared no-op context manager, so instrumented code
+    pays one attribute check. Spans go to the current thread's row unless a `track()` is active, which gives e.g.
+    each partner its own row; tracks follow asyncio tasks and context-copying thread hand-offs.
+    """
+
+    _shared = None
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self._track_ids = itertools.count(1)
+
+    @classmethod
+    def shared(cls) -> "Tracer":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def enable(self):
+        self.enabled = True
+        self.events.append({"ph": "M", "name": "process_name", "pid": os.getpid(), "args": {"name": "campaign"}})
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin) / 1000
+
+    def _tid(self) -> int:
+        track = _track.get()
+        return track if track is not None else threading.get_native_id()
+
+    def span(self, name: str, **args):
+        """Record the block as a complete event named `name`, with `args` shown in the event details."""
+        if not self.enabled:
+            return _NOOP
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name, args):
+        started = self._now_us()
+        try:
+            yield
+        finally:
+            event = {"ph": "X", "name": name, "ts": started, "dur": self._now_us() - started, "pid": os.getpid(),
+                     "tid": self._tid()}
+            if args:
+                event["args"] = args
+            # list.append is atomic, so threads and tasks record without a lock
+            self.events.append(event)
+
+    def track(self, label: str):
+        """Put the spans recorded inside the block on a new row labelled `label`."""
+        if not self.enabled:
+            return _NOOP
+        return self._track(label)
+
+    @contextmanager
+    def _track(self, label):
+        tid = _PARTNER_TRACK_BASE + next(self._track_ids)
+        self.events.append({"ph": "M", "name": "thread_name", "pid": os.getpid(), "tid": tid,
+                            "args": {"name": label}})
+        token = _track.set(tid)
+        try:
+            yield
+        finally:
+            _track.reset(token)
+
+    def export(self, path: Optional[str] = None, run_name: str = "run") -> str:
+        """
+        Write the recorded events as trace-event JSON, by default to traces/<run_name>-<time>.json. Returns the path.
+        """
+        if not path:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR, f"{run_name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        thread_names = [
+            {"ph": "M", "name": "thread_name", "pid": os.getpid(), "tid": thread.native_id,
+             "args": {"name": thread.name}}
+            for thread in threading.enumerate() if thread.native_id is not None
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": thread_names + self.events, "displayTimeUnit": "ms"}, f)
+        return path
@@ -0,0 +1,29 @@
+"""Framework: https://github.com/eshut/Framework-Python"""
+
+import sys
+from importlib import import_module
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[List[str], Callable]:
+    """
+    `__all__` and a module `__getattr__` for a package whose exports are imported on first access.
+
+    Args:
+        package (str): The package's `__name__`.
+        exports (Dict[str, str]): Exported name -> relative submodule defining it, e.g. {'HistoryStore': '.history'}.
+
+    Usage, in the package's __init__.py:
+        __all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
+    """
+    namespace = vars(sys.modules[package])
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(exports[name], package), name)
+        # Cache on the package, so later lookups don't go through __getattr__ again
+        namespace[name] = value
+        return value
+
+    return list(exports), __getattr__
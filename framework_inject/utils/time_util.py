@@ -2,7 +2,9 @@
 
 import time
 import random
+from contextlib import contextmanager
 from framework_inject.constants import DEFAULT_WAIT_TIME_SEC
+from framework_inject.tracing import Tracer
 
 
 def wait_time(sec=DEFAULT_WAIT_TIME_SEC):
@@ -30,3 +32,38 @@ def has_minutes_passed(start_time, minutes):
     elapsed_time = time.time() - start_time
     return elapsed_time >= minutes * 60
 
+
+
+class StepTimer:
+    """
+    Records the wall-clock duration of named steps, e.g. the phases of preparing one profile. With `histogram`, each
+    step is also observed there, labelled by step name; with `trace_prefix`, each step is a "<prefix>.<name>" span.
+    """
+
+    def __init__(self, histogram=None, trace_prefix=None):
+        self.steps = {}
+        self.histogram = histogram
+        self.trace_prefix = trace_prefix
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        span = Tracer.shared().span(f"{self.trace_prefix}.{name}") if self.trace_prefix else None
+        try:
+            if span is None:
+                yield
+            else:
+                with span:
+                    yield
+        finally:
+            self.steps[name] = time.perf_counter() - started
+            if self.histogram is not None:
+                self.histogram.observe(self.steps[name], step=name)
+
+    @property
+    def total(self):
+        return sum(self.steps.values())
+
+    def __str__(self):
+        details = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.steps.items())
+        return f"{self.total:.2f}s ({details})"
@@ -1,13 +1,15 @@
 import argparse
 import sys
 import logging
+import time
 
 from commands import CommandFactory
+from config import Config, ConfigError
+from framework_inject.logger.log_setup import configure_logging, set_log_fields
+from framework_inject.metrics import MetricsRegistry
+from framework_inject.tracing import Tracer
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -29,7 +31,7 @@ class Application:
         parser.add_argument(
             '--message',
             type=str,
-            help='Custom message to send (use {name} as placeholder for partner name)'
+            help='Custom message to send ({field} or {field|default} for partner fields, {?field}...{/field} for conditional text)'
         )
         
         parser.add_argument(
@@ -41,8 +43,41 @@ class Application:
         parser.add_argument(
             '--delay',
             type=int,
-            default=2,
-            help='Delay between messages in seconds (default: 2)'
+            default=None,
+            help='Delay between messages in seconds (default: MESSAGE_DELAY, 2)'
+        )
+        
+        parser.add_argument(
+            '--plan',
+            action='store_true',
+            help='Dry run for send: report recipients, API calls and projected duration without contacting Telegram'
+        )
+        
+        parser.add_argument(
+            '--cached',
+            action='store_true',
+            help='For list: use the partners cached by the last database fetch instead of connecting to the database'
+        )
+        
+        parser.add_argument(
+            '--metrics-port',
+            type=int,
+            help='Serve Prometheus metrics on 127.0.0.1:PORT while the action runs'
+        )
+        
+        parser.add_argument(
+            '--trace',
+            nargs='?',
+            const='',
+            metavar='PATH',
+            help='Record spans and write a Chrome trace for Perfetto (traces/<action>-<time>.json unless PATH is given)'
+        )
+        
+        parser.add_argument(
+            '--attach',
+            action='append',
+            metavar='PATH',
+            help='File to attach to every message (can be repeated); uploaded once per run'
         )
         
         return parser
@@ -50,17 +85,43 @@ class Application:
     def run(self):
         args = self.parser.parse_args()
         
+        if args.action == 'send':
+            set_log_fields(campaign_id=time.strftime('send-%Y%m%d-%H%M%S'))
         logger.info(f"Executing action: {args.action}")
         
+        config = Config.shared()
+        if args.action == 'send' and not args.plan:
+            required = ('db', 'telegram')
+        elif args.action == 'list' and args.cached:
+            required = ()
+        else:
+            required = ('db',)
+        config.validate(*required)
+        
         command = CommandFactory.create(
             args.action,
             message=args.message,
             tag=args.tag,
-            delay=args.delay
+            delay=args.delay if args.delay is not None else config.tuning.message_delay,
+            attachments=args.attach,
+            plan=args.plan,
+            cached=args.cached
         )
         
+        if args.metrics_port:
+            MetricsRegistry.shared().serve(args.metrics_port)
+        if args.trace is not None:
+            Tracer.shared().enable()
+        
         if command:
-            command.execute()
+            try:
+                command.execute()
+            finally:
+                if args.action == 'send' and not args.plan:
+                    path = MetricsRegistry.shared().write_summary(run_name=args.action)
+                    logger.info(f"Run metrics written to {path}")
+                if args.trace is not None:
+                    logger.info(f"Trace written to {Tracer.shared().export(args.trace, run_name=args.action)}")
         else:
             logger.error(f"Unknown action: {args.action}")
             sys.exit(1)
@@ -73,6 +134,9 @@ def main():
     except KeyboardInterrupt:
         print("\n\nOperation cancelled by user.")
         sys.exit(0)
+    except ConfigError as e:
+        logger.error(str(e))
+        sys.exit(1)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         sys.exit(1)
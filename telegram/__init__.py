@@ -1,4 +1,12 @@
-from .telegram_bot import TelegramMessenger, TelegramService
+from framework_inject.utils.import_util import lazy_exports
 
-__all__ = ['TelegramMessenger', 'TelegramService']
+# Exported names and the submodule defining each. Submodules are imported on first access, so Telethon is only
+# loaded by the actions that talk to Telegram.
+_EXPORTS = {
+    'TelegramMessenger': '.telegram_bot',
+    'TelegramService': '.telegram_bot',
+    'HistoryStore': '.history',
+    'AttachmentCache': '.attachments'
+}
 
+__all__, __getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,88 @@
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from telethon.errors import FileReferenceExpiredError, FilePartMissingError
+
+from config import TELEGRAM_UPLOAD_TTL
+from framework_inject.tracing import Tracer
+
+logger = logging.getLogger(__name__)
+tracer = Tracer.shared()
+
+REFERENCE_ERRORS = (FileReferenceExpiredError, FilePartMissingError)
+
+
+class CachedAttachment:
+    def __init__(self, path: str, fingerprint: tuple):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.input_file = None
+        self.uploaded_at = 0.0
+        self.media = None
+
+    def is_upload_fresh(self, ttl: int) -> bool:
+        return self.input_file is not None and time.monotonic() - self.uploaded_at < ttl
+
+
+class AttachmentCache:
+    def __init__(self, client, ttl: int = TELEGRAM_UPLOAD_TTL):
+        self.client = client
+        self.ttl = ttl
+        self._entries: Dict[str, CachedAttachment] = {}
+        self.uploads = 0
+        self.reuses = 0
+
+    @staticmethod
+    def _fingerprint(path: str) -> tuple:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _entry(self, path: str) -> CachedAttachment:
+        path = os.path.abspath(path)
+        fingerprint = self._fingerprint(path)
+        entry = self._entries.get(path)
+        if entry is None or entry.fingerprint != fingerprint:
+            entry = CachedAttachment(path, fingerprint)
+            self._entries[path] = entry
+        return entry
+
+    async def get(self, path: str):
+        entry = self._entry(path)
+
+        if entry.media is not None:
+            self.reuses += 1
+            return entry.media
+
+        if entry.is_upload_fresh(self.ttl):
+            self.reuses += 1
+            return entry.input_file
+
+        with tracer.span('telegram.upload', path=entry.path):
+            entry.input_file = await self.client.upload_file(entry.path)
+        entry.uploaded_at = time.monotonic()
+        self.uploads += 1
+        logger.info(f"Uploaded attachment {entry.path} ({entry.fingerprint[0]} bytes)")
+        return entry.input_file
+
+    def remember(self, path: str, message) -> None:
+        media = getattr(message, 'media', None)
+        if media is not None:
+            self._entry(path).media = media
+
+    def invalidate(self, path: str) -> None:
+        self._entries.pop(os.path.abspath(path), None)
+
+    async def send(self, entity, path: str, caption: Optional[str] = None):
+        try:
+            file = await self.get(path)
+            message = await self.client.send_file(entity, file, caption=caption)
+        except REFERENCE_ERRORS as e:
+            logger.info(f"Cached reference for {path} expired ({e.__class__.__name__}), uploading again")
+            self.invalidate(path)
+            file = await self.get(path)
+            message = await self.client.send_file(entity, file, caption=caption)
+
+        self.remember(path, message)
+        return message
@@ -0,0 +1,117 @@
+import json
+import os
+import re
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from config import Config
+
+
+class HistoryStore:
+    WATERMARKS_FILE = 'watermarks.json'
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory or Config.shared().history_dir)
+        self._watermarks = None
+        self._batch_depth = 0
+        self._dirty = False
+
+    @staticmethod
+    def peer_key(identifier) -> str:
+        return str(identifier).lower()
+
+    @property
+    def watermarks(self) -> Dict[str, Dict]:
+        if self._watermarks is None:
+            path = self.directory / self.WATERMARKS_FILE
+            if path.exists():
+                with open(path, encoding='utf-8') as f:
+                    self._watermarks = json.load(f)
+            else:
+                self._watermarks = {}
+        return self._watermarks
+
+    def get_watermark(self, peer: str) -> int:
+        return self.watermarks.get(peer, {}).get('max_id', 0)
+
+    def get_last_outgoing(self, peer: str) -> Optional[datetime]:
+        last_out = self.watermarks.get(peer, {}).get('last_out')
+        return datetime.fromisoformat(last_out) if last_out else None
+
+    def append(self, peer: str, messages: List[Dict]):
+        if not messages:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = self.watermarks.setdefault(peer, {'max_id': 0, 'last_out': None, 'last_out_id': 0})
+
+        with open(self._log_path(peer), 'a', encoding='utf-8') as f:
+            for msg in messages:
+                f.write(json.dumps(self._pack(msg), ensure_ascii=False, separators=(',', ':')) + '\n')
+                entry['max_id'] = max(entry['max_id'], msg['id'])
+                if msg['out'] and msg['id'] > entry.get('last_out_id', 0):
+                    entry['last_out'] = msg['date'].isoformat()
+                    entry['last_out_id'] = msg['id']
+
+        self._dirty = True
+        if not self._batch_depth:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Write watermarks.json once when the block exits, instead of after every `append` inside it."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def flush(self):
+        if self._dirty:
+            self._save_watermarks()
+            self._dirty = False
+
+    def iter_cached(self, peer: str) -> Iterator[Dict]:
+        path = self._log_path(peer)
+        if not path.exists():
+            return
+
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield self._unpack(json.loads(line))
+
+    def tail(self, peer: str, limit: int) -> List[Dict]:
+        newest = deque(self.iter_cached(peer), maxlen=limit)
+        return sorted(newest, key=lambda msg: msg['id'], reverse=True)
+
+    def _log_path(self, peer: str) -> Path:
+        safe_name = re.sub(r'[^\w-]', '_', peer)
+        return self.directory / f"{safe_name}.jsonl"
+
+    def _save_watermarks(self):
+        path = self.directory / self.WATERMARKS_FILE
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.watermarks, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _pack(msg: Dict) -> list:
+        return [msg['id'], msg['date'].isoformat(), int(msg['out']), msg['from_id'], msg['text'] or '']
+
+    @staticmethod
+    def _unpack(row: list) -> Dict:
+        msg_id, date, out, from_id, text = row
+        return {
+            'id': msg_id,
+            'text': text,
+            'date': datetime.fromisoformat(date),
+            'out': bool(out),
+            'from_id': from_id
+        }
@@ -0,0 +1,22 @@
+import re
+
+
+def parse_telegram_identifier(identifier):
+    identifier = str(identifier).strip()
+    
+    if identifier.startswith('https://web.telegram.org/'):
+        match = re.search(r'#(-?\d+)', identifier)
+        if match:
+            return int(match.group(1))
+    
+    if identifier.startswith('https://t.me/') or identifier.startswith('t.me/'):
+        identifier = identifier.replace('https://t.me/', '')
+        identifier = identifier.replace('t.me/', '')
+        identifier = identifier.split('?')[0]
+        identifier = identifier.lstrip('@')
+        return identifier
+    
+    if identifier.startswith('-') or identifier.isdigit():
+        return int(identifier)
+    
+    return identifier.lstrip('@')
@@ -1,46 +1,43 @@
 from telethon import TelegramClient
 from telethon.errors import FloodWaitError
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, AsyncIterator
 from datetime import datetime, timezone
 import logging
 import asyncio
-import re
 
-from config import Config, DEFAULT_MESSAGE_TEMPLATE
+from config import Config, DEFAULT_MESSAGE_TEMPLATE, DEFAULT_HISTORY_SYNC_LIMIT, CHANNEL_TELEGRAM
+from templates import MessageTemplate
+from campaign.channels import partner_telegram_target
+from .history import HistoryStore
+from .identifiers import parse_telegram_identifier
+from .attachments import AttachmentCache
+from framework_inject.logger.log_setup import log_context
+from framework_inject.metrics import MetricsRegistry
+from framework_inject.tracing import Tracer
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+tracer = Tracer.shared()
+
+TELEGRAM_CALL_SECONDS = MetricsRegistry.shared().histogram("telegram_call_seconds",
+                                                           "Telegram API call latency, by phase")
+TELEGRAM_MESSAGES = MetricsRegistry.shared().counter("telegram_messages_total", "Telegram messages, by result")
+TELEGRAM_FLOOD_WAITS = MetricsRegistry.shared().counter("telegram_flood_waits_total", "FloodWait errors received")
+TELEGRAM_FLOOD_WAIT_SECONDS = MetricsRegistry.shared().counter("telegram_flood_wait_seconds_total",
+                                                               "Seconds Telegram asked to wait in FloodWait errors")
 
 
 class TelegramMessenger:
     def __init__(self):
-        config = Config().telegram
+        config = Config.shared().telegram
         self.api_id = config.api_id
         self.api_hash = config.api_hash
         self.phone = config.phone
         self.session_name = config.session_name
         self.client = None
+        self.history = HistoryStore()
+        self.attachments = None
     
-    @staticmethod
-    def parse_telegram_identifier(identifier):
-        identifier = str(identifier).strip()
-        
-        if identifier.startswith('https://web.telegram.org/'):
-            match = re.search(r'#(-?\d+)', identifier)
-            if match:
-                return int(match.group(1))
-        
-        if identifier.startswith('https://t.me/') or identifier.startswith('t.me/'):
-            identifier = identifier.replace('https://t.me/', '')
-            identifier = identifier.replace('t.me/', '')
-            identifier = identifier.split('?')[0]
-            identifier = identifier.lstrip('@')
-            return identifier
-        
-        if identifier.startswith('-') or identifier.isdigit():
-            return int(identifier)
-        
-        return identifier.lstrip('@')
+    parse_telegram_identifier = staticmethod(parse_telegram_identifier)
     
     async def connect(self) -> bool:
         try:
@@ -50,7 +47,9 @@ class TelegramMessenger:
                 self.api_hash
             )
             
-            await self.client.connect()
+            with tracer.span('telegram.connect'):
+                await self.client.connect()
+            self.attachments = AttachmentCache(self.client)
             
             if not await self.client.is_user_authorized():
                 logger.info("Not authorized. Attempting to sign in...")
@@ -87,7 +86,7 @@ class TelegramMessenger:
             await self.client.disconnect()
             logger.info("Disconnected from Telegram")
     
-    async def send_message(self, username, message: str) -> bool:
+    async def send_message(self, username, message: str, attachments: Optional[List[str]] = None) -> bool:
         if not self.client:
             logger.error("Client not connected")
             return False
@@ -95,43 +94,59 @@ class TelegramMessenger:
         identifier = self.parse_telegram_identifier(username)
         
         try:
-            entity = await self.client.get_entity(identifier)
-            await self.client.send_message(entity, message)
-            logger.info(f"Message sent to {identifier}")
+            with tracer.span('telegram.resolve'), TELEGRAM_CALL_SECONDS.time(phase='resolve'):
+                entity = await self.client.get_entity(identifier)
+            with tracer.span('telegram.send'), TELEGRAM_CALL_SECONDS.time(phase='send'):
+                if attachments:
+                    caption = message
+                    for path in attachments:
+                        await self.attachments.send(entity, path, caption=caption)
+                        caption = None
+                else:
+                    await self.client.send_message(entity, message)
+            logger.info("Message sent to %s", identifier)
+            TELEGRAM_MESSAGES.inc(result='sent')
             return True
             
         except FloodWaitError as e:
             logger.error(f"Flood wait error. Need to wait {e.seconds} seconds")
+            TELEGRAM_FLOOD_WAITS.inc()
+            TELEGRAM_FLOOD_WAIT_SECONDS.inc(e.seconds)
+            TELEGRAM_MESSAGES.inc(result='flood_wait')
             return False
         except Exception as e:
             logger.error(f"Error sending message to {identifier}: {e}")
+            TELEGRAM_MESSAGES.inc(result='failed')
             return False
     
     async def send_message_to_partners(
         self,
         partners: List[Dict],
         message_template: Optional[str] = None,
-        delay_seconds: int = 2
+        delay_seconds: int = 2,
+        attachments: Optional[List[str]] = None
     ) -> Dict[str, int]:
         if not self.client:
             logger.error("Client not connected")
             return {'success': 0, 'failed': 0}
         
-        message = message_template or DEFAULT_MESSAGE_TEMPLATE
+        template = MessageTemplate.compile(message_template or DEFAULT_MESSAGE_TEMPLATE).validate()
+        messages = template.render_many(partners)
         results = {'success': 0, 'failed': 0}
         
-        for partner in partners:
-            telegram_tag = partner.get('telegram_tag')
+        for partner, personalized_message in zip(partners, messages):
+            telegram_tag = partner_telegram_target(partner)
             name = partner.get('name', 'Unknown')
             
             if not telegram_tag:
-                logger.warning(f"Partner {name} has no telegram tag, skipping")
+                logger.warning("Partner %s has no telegram tag, skipping", name,
+                               extra={'partner_id': partner.get('id')})
                 results['failed'] += 1
                 continue
             
-            personalized_message = message.replace('{name}', name)
-            
-            success = await self.send_message(telegram_tag, personalized_message)
+            with log_context(partner_id=partner.get('id'), channel=CHANNEL_TELEGRAM), \
+                    tracer.track(f"partner {name}"), tracer.span('partner', partner_id=partner.get('id')):
+                success = await self.send_message(telegram_tag, personalized_message, attachments)
             
             if success:
                 results['success'] += 1
@@ -139,14 +154,51 @@ class TelegramMessenger:
                 results['failed'] += 1
             
             if delay_seconds > 0:
-                await asyncio.sleep(delay_seconds)
+                with tracer.span('delay', seconds=delay_seconds):
+                    await asyncio.sleep(delay_seconds)
         
         logger.info(
             f"Messaging complete. Success: {results['success']}, "
             f"Failed: {results['failed']}"
         )
+        if attachments:
+            logger.info(
+                f"Attachments uploaded {self.attachments.uploads} time(s), "
+                f"reused {self.attachments.reuses} time(s)"
+            )
         return results
     
+    async def send_message_with_time_check(
+        self,
+        user_id,
+        message: str,
+        min_seconds: int = 60
+    ) -> Dict[str, any]:
+        last_msg_time = await self.get_last_outgoing_message_time(user_id)
+        
+        if last_msg_time:
+            now = datetime.now(timezone.utc)
+            time_diff = (now - last_msg_time).total_seconds()
+            
+            if time_diff < min_seconds:
+                TELEGRAM_MESSAGES.inc(result='too_soon')
+                logger.info("Skipping message to %s. Last message sent %.0f seconds ago", user_id, time_diff)
+                return {
+                    'sent': False,
+                    'reason': 'too_soon',
+                    'seconds_since_last': time_diff,
+                    'min_required': min_seconds,
+                    'last_msg_time': last_msg_time
+                }
+        
+        success = await self.send_message(user_id, message)
+        
+        return {
+            'sent': success,
+            'reason': 'sent' if success else 'send_failed',
+            'last_msg_time': datetime.now(timezone.utc) if success else None
+        }
+    
     async def check_user_exists(self, username) -> bool:
         if not self.client:
             logger.error("Client not connected")
@@ -161,6 +213,60 @@ class TelegramMessenger:
             logger.error(f"User {identifier} not found: {e}")
             return False
     
+    async def iter_new_messages(
+        self,
+        username,
+        first_sync_limit: int = DEFAULT_HISTORY_SYNC_LIMIT
+    ) -> AsyncIterator[Dict]:
+        if not self.client:
+            logger.error("Client not connected")
+            return
+        
+        identifier = self.parse_telegram_identifier(username)
+        peer = self.history.peer_key(identifier)
+        watermark = self.history.get_watermark(peer)
+        
+        with tracer.span('telegram.resolve'), TELEGRAM_CALL_SECONDS.time(phase='resolve'):
+            entity = await self.client.get_entity(identifier)
+        
+        # Resolve is timed on its own above; 'history' covers only fetching the messages
+        if watermark:
+            batch = []
+            try:
+                with tracer.span('telegram.history'), TELEGRAM_CALL_SECONDS.time(phase='history'):
+                    async for msg in self.client.iter_messages(entity, min_id=watermark, reverse=True):
+                        batch.append(self._message_to_dict(msg))
+                        yield batch[-1]
+            finally:
+                self.history.append(peer, batch)
+        else:
+            with tracer.span('telegram.history'), TELEGRAM_CALL_SECONDS.time(phase='history'):
+                batch = [
+                    self._message_to_dict(msg)
+                    async for msg in self.client.iter_messages(entity, limit=first_sync_limit)
+                ]
+            batch.reverse()
+            self.history.append(peer, batch)
+            for msg in batch:
+                yield msg
+        
+        logger.info(f"Synced {len(batch)} new messages from {identifier} (watermark {watermark})")
+    
+    async def iter_history(self, username) -> AsyncIterator[Dict]:
+        peer = self.history.peer_key(self.parse_telegram_identifier(username))
+        
+        for msg in self.history.iter_cached(peer):
+            yield msg
+        
+        async for msg in self.iter_new_messages(username):
+            yield msg
+    
+    async def sync_history(self, username) -> str:
+        identifier = self.parse_telegram_identifier(username)
+        async for _ in self.iter_new_messages(username):
+            pass
+        return self.history.peer_key(identifier)
+    
     async def get_chat_messages(self, username, limit: int = 10) -> List[Dict]:
         if not self.client:
             logger.error("Client not connected")
@@ -169,20 +275,8 @@ class TelegramMessenger:
         identifier = self.parse_telegram_identifier(username)
         
         try:
-            entity = await self.client.get_entity(identifier)
-            messages = await self.client.get_messages(entity, limit=limit)
-            
-            result = []
-            for msg in messages:
-                result.append({
-                    'id': msg.id,
-                    'text': msg.text,
-                    'date': msg.date,
-                    'out': msg.out,
-                    'from_id': msg.from_id
-                })
-            
-            return result
+            peer = await self.sync_history(username)
+            return self.history.tail(peer, limit)
         except Exception as e:
             logger.error(f"Error getting messages from {identifier}: {e}")
             return []
@@ -195,17 +289,21 @@ class TelegramMessenger:
         identifier = self.parse_telegram_identifier(username)
         
         try:
-            entity = await self.client.get_entity(identifier)
-            messages = await self.client.get_messages(entity, limit=50)
-            
-            for msg in messages:
-                if msg.out:
-                    return msg.date
-            
-            return None
+            peer = await self.sync_history(username)
+            return self.history.get_last_outgoing(peer)
         except Exception as e:
             logger.error(f"Error getting last message time from {identifier}: {e}")
             return None
+    
+    @staticmethod
+    def _message_to_dict(msg) -> Dict:
+        return {
+            'id': msg.id,
+            'text': msg.text,
+            'date': msg.date,
+            'out': msg.out,
+            'from_id': msg.sender_id
+        }
 
 
 class TelegramService:
@@ -213,7 +311,8 @@ class TelegramService:
     async def send_messages(
         partners: List[Dict],
         message: Optional[str] = None,
-        delay: int = 2
+        delay: int = 2,
+        attachments: Optional[List[str]] = None
     ) -> Dict[str, int]:
         messenger = TelegramMessenger()
         
@@ -226,7 +325,8 @@ class TelegramService:
             results = await messenger.send_message_to_partners(
                 partners,
                 message,
-                delay
+                delay,
+                attachments
             )
             
             return results
@@ -238,9 +338,10 @@ class TelegramService:
     def send_messages_sync(
         partners: List[Dict],
         message: Optional[str] = None,
-        delay: int = 2
+        delay: int = 2,
+        attachments: Optional[List[str]] = None
     ) -> Dict[str, int]:
-        return asyncio.run(TelegramService.send_messages(partners, message, delay))
+        return asyncio.run(TelegramService.send_messages(partners, message, delay, attachments))
     
     @staticmethod
     async def send_single_message_async(user_id, message: str) -> bool:
@@ -296,29 +397,7 @@ class TelegramService:
                 logger.error("Failed to connect to Telegram")
                 return {'sent': False, 'reason': 'connection_failed'}
             
-            last_msg_time = await messenger.get_last_outgoing_message_time(user_id)
-            
-            if last_msg_time:
-                now = datetime.now(timezone.utc)
-                time_diff = (now - last_msg_time).total_seconds()
-                
-                if time_diff < min_seconds:
-                    logger.info(f"Skipping message to {user_id}. Last message sent {time_diff:.0f} seconds ago")
-                    return {
-                        'sent': False,
-                        'reason': 'too_soon',
-                        'seconds_since_last': time_diff,
-                        'min_required': min_seconds,
-                        'last_msg_time': last_msg_time
-                    }
-            
-            success = await messenger.send_message(user_id, message)
-            
-            return {
-                'sent': success,
-                'reason': 'sent' if success else 'send_failed',
-                'last_msg_time': datetime.now(timezone.utc) if success else None
-            }
+            return await messenger.send_message_with_time_check(user_id, message, min_seconds)
             
         finally:
             await messenger.disconnect()
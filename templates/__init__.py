@@ -0,0 +1,3 @@
+from .message_template import MessageTemplate, TemplateError
+
+__all__ = ['MessageTemplate', 'TemplateError']
@@ -0,0 +1,120 @@
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import PARTNER_FIELDS, PARTNER_FIELD_DEFAULTS
+
+TOKEN_PATTERN = re.compile(r'\{\{|\}\}|\{([?!/]?)([A-Za-z_][A-Za-z0-9_]*)(?:\|([^{}]*))?\}')
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class MessageTemplate:
+    """
+    Message template compiled once into a list of render functions.
+
+    Syntax:
+        {field}                 value of a partner field (PARTNER_FIELD_DEFAULTS or '' when missing)
+        {field|default}         value of a partner field or the default text
+        {?field}...{/field}     fragment rendered only when the field is set
+        {!field}...{/field}     fragment rendered only when the field is empty
+        {{ and }}               literal braces
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.fields = set()
+        nodes, _ = self._parse(0, None)
+        self._render = self._build(nodes)
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def compile(source: str) -> 'MessageTemplate':
+        return MessageTemplate(source)
+
+    def render(self, partner: Dict) -> str:
+        return self._render(partner)
+
+    def render_many(self, partners: Iterable[Dict]) -> List[str]:
+        render = self._render
+        return [render(partner) for partner in partners]
+
+    def validate(self, fields: Iterable[str] = PARTNER_FIELDS) -> 'MessageTemplate':
+        unknown = sorted(self.fields - set(fields))
+        if unknown:
+            raise TemplateError(f"Unknown placeholder(s) in message template: {', '.join(unknown)}")
+        return self
+
+    def _parse(self, position: int, closing: Optional[str]):
+        nodes = []
+        while True:
+            match = TOKEN_PATTERN.search(self.source, position)
+            end = match.start() if match else len(self.source)
+            if end > position:
+                nodes.append(('text', self.source[position:end]))
+            if not match:
+                if closing:
+                    raise TemplateError(f"Unclosed conditional block '{{?{closing}}}'")
+                return nodes, len(self.source)
+
+            position = match.end()
+            token = match.group(0)
+            marker, name, default = match.groups()
+
+            if token in ('{{', '}}'):
+                nodes.append(('text', token[0]))
+            elif marker == '/':
+                if name != closing:
+                    raise TemplateError(f"Unexpected closing tag '{token}'")
+                return nodes, position
+            elif marker in ('?', '!'):
+                self.fields.add(name)
+                children, position = self._parse(position, name)
+                nodes.append(('cond', name, marker == '!', children))
+            else:
+                self.fields.add(name)
+                nodes.append(('field', name, default))
+
+    def _build(self, nodes) -> Callable[[Dict], str]:
+        parts = []
+        for node in nodes:
+            kind = node[0]
+            if kind == 'text':
+                if parts and isinstance(parts[-1], str):
+                    parts[-1] += node[1]
+                else:
+                    parts.append(node[1])
+            elif kind == 'field':
+                parts.append(self._field_renderer(node[1], node[2]))
+            else:
+                parts.append(self._conditional_renderer(node[1], node[2], self._build(node[3])))
+
+        if not parts:
+            return lambda partner: ''
+        if len(parts) == 1 and isinstance(parts[0], str):
+            text = parts[0]
+            return lambda partner: text
+
+        def render(partner: Dict) -> str:
+            return ''.join([part if part.__class__ is str else part(partner) for part in parts])
+
+        return render
+
+    @staticmethod
+    def _field_renderer(name: str, default: Optional[str]) -> Callable[[Dict], str]:
+        fallback = PARTNER_FIELD_DEFAULTS.get(name, '') if default is None else default
+
+        def render(partner: Dict) -> str:
+            value = partner.get(name)
+            return fallback if value is None or value == '' else str(value)
+
+        return render
+
+    @staticmethod
+    def _conditional_renderer(name: str, negate: bool, body: Callable[[Dict], str]) -> Callable[[Dict], str]:
+        def render(partner: Dict) -> str:
+            return body(partner) if bool(partner.get(name)) != negate else ''
+
+        return render
@@ -0,0 +1,112 @@
+import pytest
+
+from config import Config, ConfigError, DISPATCH_CONCURRENCY
+
+pytest.importorskip("dotenv")
+
+ENV_VARS = (
+    'DB_HOST', 'DB_PORT', 'DB_NAME', 'DB_USER', 'DB_PASSWORD',
+    'TELEGRAM_API_ID', 'TELEGRAM_API_HASH', 'TELEGRAM_PHONE', 'TELEGRAM_SESSION_NAME',
+    'DISPATCH_CONCURRENCY', 'DISPATCH_RATES', 'TELEGRAM_RATE_LIMITS', 'APPROVAL_LOOKAHEAD', 'MESSAGE_DELAY',
+    'BROWSER_POOL_SIZE'
+)
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    # Empty values count as unset for Config, and keep a local .env from filling them in
+    for name in ENV_VARS:
+        monkeypatch.setenv(name, '')
+    monkeypatch.setattr(Config, '_env_file_values', {})
+    return monkeypatch
+
+
+def test_defaults():
+    config = Config.load()
+    assert config.db.host == 'localhost'
+    assert config.db.database is None
+    assert dict(config.tuning.dispatch_concurrency) == DISPATCH_CONCURRENCY
+
+
+def test_reads_and_casts_values(environment):
+    environment.setenv('DB_PORT', '6543')
+    environment.setenv('DB_NAME', 'partners')
+    environment.setenv('APPROVAL_LOOKAHEAD', '5')
+    environment.setenv('BROWSER_POOL_SIZE', '6')
+    config = Config.load()
+    assert config.db.port == 6543
+    assert config.db.database == 'partners'
+    assert config.tuning.approval_lookahead == 5
+    assert config.tuning.browser_pool_size == 6
+
+
+def test_mapping_overrides_merge_over_defaults(environment):
+    environment.setenv('DISPATCH_CONCURRENCY', 'telegram=5, upwork=2')
+    environment.setenv('DISPATCH_RATES', 'telegram=none,linkedin=0.25')
+    tuning = Config.load().tuning
+    assert tuning.dispatch_concurrency == dict(DISPATCH_CONCURRENCY, telegram=5, upwork=2)
+    assert tuning.dispatch_rates['telegram'] is None
+    assert tuning.dispatch_rates['linkedin'] == 0.25
+
+
+def test_mappings_are_read_only():
+    with pytest.raises(TypeError):
+        Config.load().tuning.dispatch_concurrency['telegram'] = 10
+
+
+def test_reports_every_malformed_value(environment):
+    environment.setenv('DB_PORT', 'five')
+    environment.setenv('APPROVAL_LOOKAHEAD', '2.5')
+    environment.setenv('DISPATCH_RATES', 'telegram=fast')
+    with pytest.raises(ConfigError) as error:
+        Config.load()
+    message = str(error.value)
+    assert "DB_PORT='five'" in message
+    assert "APPROVAL_LOOKAHEAD='2.5'" in message
+    assert "'telegram=fast'" in message
+
+
+def test_validate_lists_missing_fields(environment):
+    environment.setenv('DB_NAME', 'partners')
+    with pytest.raises(ConfigError) as error:
+        Config.load().validate('db', 'telegram')
+    message = str(error.value)
+    assert 'DB_NAME' not in message
+    for name in ('DB_USER', 'DB_PASSWORD', 'TELEGRAM_API_ID', 'TELEGRAM_API_HASH', 'TELEGRAM_PHONE'):
+        assert name in message
+
+
+def test_validate_passes_when_required_fields_are_set(environment):
+    for name in ('DB_NAME', 'DB_USER', 'DB_PASSWORD'):
+        environment.setenv(name, 'value')
+    config = Config.load()
+    assert config.validate('db') is config
+    assert config.validate() is config
+
+
+def test_reload_replaces_the_shared_config(environment):
+    environment.setattr(Config, '_shared', None)
+    first = Config.shared()
+    assert Config.shared() is first
+    environment.setenv('DB_HOST', 'db.internal')
+    assert Config.reload().db.host == 'db.internal'
+    assert Config.shared() is not first
+
+
+def test_reload_picks_up_env_file_edits(environment, tmp_path):
+    environment.setattr(Config, '_shared', None)
+    env_path = tmp_path / '.env'
+    for name in ('DB_HOST', 'DB_NAME'):
+        environment.delenv(name)
+    environment.setenv('DB_USER', 'from-process')
+    env_path.write_text("DB_HOST=db-1\nDB_NAME=partners\nDB_USER=from-file\n")
+    config = Config.load(env_path)
+    assert (config.db.host, config.db.database, config.db.user) == ('db-1', 'partners', 'from-process')
+
+    env_path.write_text("DB_HOST=db-2\nDB_USER=edited\n")
+    config = Config.reload(env_path)
+    assert config.db.host == 'db-2'
+    # Removed from .env, so no longer set
+    assert config.db.database is None
+    # The process environment still wins over the file
+    assert config.db.user == 'from-process'
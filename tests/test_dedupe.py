@@ -0,0 +1,73 @@
+from campaign import ContactIndex, contact_keys, partner_ids
+
+
+def partner(id, telegram=None, upwork=None, linkedin=None, **fields):
+    return {
+        'id': id,
+        'telegramLinkPrimaryLinkUrl': telegram,
+        'upworkLinkPrimaryLinkUrl': upwork,
+        'linkedinLinkPrimaryLinkUrl': linkedin,
+        **fields
+    }
+
+
+def test_contact_keys_normalize_links():
+    keys = contact_keys(partner(
+        1,
+        telegram='https://t.me/@Alice?start=1',
+        upwork='https://www.upwork.com/freelancers/~01ABC?s=1',
+        linkedin='linkedin.com/in/Alice/details/'
+    ))
+    assert keys == [('telegram', 'alice'), ('upwork', '~01abc'), ('linkedin', 'in/alice')]
+
+
+def test_distinct_partners_stay_separate():
+    recipients = ContactIndex([partner(1, telegram='t.me/a'), partner(2, telegram='t.me/b')]).recipients()
+    assert [recipient['partner_ids'] for recipient in recipients] == [[1], [2]]
+
+
+def test_shared_link_merges_rows():
+    recipients = ContactIndex([
+        partner(1, telegram='https://t.me/alice', name='Alice'),
+        partner(2, telegram='@Alice', upwork='https://www.upwork.com/freelancers/~01abc')
+    ]).recipients()
+    assert len(recipients) == 1
+    recipient = recipients[0]
+    assert recipient['partner_ids'] == [1, 2]
+    assert recipient['name'] == 'Alice'
+    # Channels missing on the first row are filled in from its duplicates
+    assert recipient['upworkLinkPrimaryLinkUrl'] == 'https://www.upwork.com/freelancers/~01abc'
+
+
+def test_merges_are_transitive():
+    # 1 and 3 share nothing directly; 2 links them through telegram and linkedin
+    recipients = ContactIndex([
+        partner(1, telegram='t.me/alice'),
+        partner(3, linkedin='https://linkedin.com/in/alice'),
+        partner(2, telegram='t.me/alice', linkedin='linkedin.com/in/alice/'),
+        partner(4, telegram='t.me/bob')
+    ]).recipients()
+    assert [recipient['partner_ids'] for recipient in recipients] == [[1, 3, 2], [4]]
+
+
+def test_late_bridge_merges_existing_groups():
+    index = ContactIndex([
+        partner(1, telegram='t.me/alice'),
+        partner(2, upwork='~01abc'),
+        partner(3, linkedin='in/alice')
+    ])
+    assert len(index.groups()) == 3
+    index.add(partner(4, telegram='t.me/alice', upwork='~01ABC', linkedin='in/alice'))
+    assert [recipient['partner_ids'] for recipient in index.recipients()] == [[1, 2, 3, 4]]
+
+
+def test_recipient_does_not_modify_input_rows():
+    first = partner(1, telegram='t.me/alice')
+    ContactIndex([first, partner(2, telegram='t.me/alice', upwork='~01abc')]).recipients()
+    assert first['upworkLinkPrimaryLinkUrl'] is None
+    assert 'partner_ids' not in first
+
+
+def test_partner_ids():
+    assert partner_ids({'id': 5}) == [5]
+    assert partner_ids({'id': 5, 'partner_ids': [5, 9]}) == [5, 9]
@@ -0,0 +1,84 @@
+import pytest
+
+from templates import MessageTemplate, TemplateError
+
+
+def render(source, **partner):
+    return MessageTemplate.compile(source).render(partner)
+
+
+def test_compile_caches_by_source():
+    assert MessageTemplate.compile("Hi {name}") is MessageTemplate.compile("Hi {name}")
+
+
+def test_compile_collects_fields():
+    template = MessageTemplate.compile("{name} {?status}({status}){/status} {!id}?{/id}")
+    assert template.fields == {'name', 'status', 'id'}
+
+
+def test_plain_text():
+    assert render("Hello there") == "Hello there"
+    assert render("") == ""
+
+
+def test_field_value():
+    assert render("Hi {name}!", name="Ann") == "Hi Ann!"
+    assert render("#{id}", id=7) == "#7"
+
+
+def test_missing_name_falls_back_to_unknown():
+    assert render("Hi {name}!") == "Hi Unknown!"
+    assert render("Hi {name}!", name="") == "Hi Unknown!"
+    assert render("Hi {name}!", name=None) == "Hi Unknown!"
+
+
+def test_missing_field_without_fallback_is_empty():
+    assert render("[{status}]") == "[]"
+
+
+def test_explicit_default():
+    assert render("Hi {name|friend}!") == "Hi friend!"
+    assert render("Hi {name|friend}!", name="Ann") == "Hi Ann!"
+    assert render("Hi {name|}!") == "Hi !"
+
+
+def test_conditional_blocks():
+    source = "Hi{?name} {name}{/name}{!name} there{/name}!"
+    assert render(source, name="Ann") == "Hi Ann!"
+    assert render(source) == "Hi there!"
+
+
+def test_nested_conditional_blocks():
+    source = "{?name}{name}{?status} ({status}){/status}{/name}"
+    assert render(source, name="Ann", status="LEAD") == "Ann (LEAD)"
+    assert render(source, name="Ann") == "Ann"
+    assert render(source, status="LEAD") == ""
+
+
+def test_literal_braces():
+    assert render("{{name}} is {name}", name="Ann") == "{name} is Ann"
+
+
+def test_render_many():
+    template = MessageTemplate.compile("Hi {name}")
+    assert template.render_many([{'name': 'Ann'}, {}]) == ["Hi Ann", "Hi Unknown"]
+
+
+@pytest.mark.parametrize("source", ["{?name}unclosed", "stray {/name}", "{?name}x{/status}"])
+def test_malformed_blocks(source):
+    with pytest.raises(TemplateError):
+        MessageTemplate(source)
+
+
+def test_validate_accepts_partner_fields():
+    template = MessageTemplate.compile("{name} {upworkLinkPrimaryLinkUrl}")
+    assert template.validate() is template
+
+
+def test_validate_rejects_unknown_fields():
+    with pytest.raises(TemplateError, match="first_name, nickname"):
+        MessageTemplate.compile("{nickname} {?first_name}x{/first_name}").validate()
+
+
+def test_validate_with_custom_fields():
+    MessageTemplate.compile("{nickname}").validate(fields=['nickname'])
@@ -0,0 +1,90 @@
+from datetime import date
+
+from campaign import CampaignScheduler
+
+LAST_FOLLOWUP = date(2024, 1, 1).isoformat()
+
+
+def partner(id, priority='LOW', channel='linkedin'):
+    return {
+        'id': id,
+        'name': f'partner-{id}',
+        'priopity': priority,
+        'lastFollowUp': LAST_FOLLOWUP,
+        f'{channel}LinkPrimaryLinkUrl': f'https://example.com/{id}'
+    }
+
+
+def run(scheduler, partners, sent=lambda partner, channel: True):
+    calls = []
+
+    def handler(partner, channel):
+        calls.append((partner['id'], channel))
+        return sent(partner, channel)
+
+    scheduler.extend(partners)
+    return scheduler.run(handler), calls
+
+
+def test_runs_highest_priority_first():
+    summary, calls = run(CampaignScheduler(), [partner(1, 'LOW'), partner(2, 'HIGH'), partner(3, 'MEDIUM')])
+    assert [id for id, _ in calls] == [2, 3, 1]
+    assert summary['processed'] == 3
+    assert summary['sent'] == 3
+    assert summary['deferred'] == 0
+    assert summary['stopped'] == 'completed'
+
+
+def test_cheaper_channel_wins_at_equal_priority():
+    _, calls = run(CampaignScheduler(), [partner(1, channel='upwork'), partner(2, channel='telegram')])
+    assert calls == [(2, 'telegram'), (1, 'upwork')]
+
+
+def test_equal_scores_keep_insertion_order():
+    _, calls = run(CampaignScheduler(), [partner(id) for id in range(5)])
+    assert [id for id, _ in calls] == list(range(5))
+
+
+def test_stops_at_max_sends():
+    summary, calls = run(CampaignScheduler(max_sends=2), [partner(id) for id in range(5)])
+    assert len(calls) == 2
+    assert summary['sent'] == 2
+    assert summary['deferred'] == 3
+    assert summary['stopped'] == 'send_budget'
+
+
+def test_unsent_partners_do_not_use_the_send_budget():
+    summary, calls = run(CampaignScheduler(max_sends=2), [partner(id) for id in range(5)],
+                         sent=lambda partner, channel: partner['id'] % 2 == 0)
+    assert [id for id, _ in calls] == [0, 1, 2]
+    assert summary['processed'] == 3
+    assert summary['sent'] == 2
+
+
+def test_defers_partners_too_expensive_for_the_time_left():
+    scheduler = CampaignScheduler(time_budget=10)
+    summary, calls = run(scheduler, [partner(1, 'HIGH', channel='upwork'), partner(2, channel='linkedin')])
+    assert calls == [(2, 'linkedin')]
+    assert summary['deferred'] == 1
+    assert summary['stopped'] == 'completed'
+
+
+def test_stops_at_deadline(monkeypatch):
+    clock = iter([0, 0, 5, 100, 100, 100])
+    monkeypatch.setattr('campaign.scheduler.time.monotonic', lambda: next(clock))
+    summary, calls = run(CampaignScheduler(time_budget=10), [partner(1), partner(2), partner(3)])
+    assert calls == [(1, 'linkedin')]
+    assert summary['deferred'] == 2
+    assert summary['stopped'] == 'deadline'
+
+
+def test_learns_channel_cost():
+    scheduler = CampaignScheduler(channel_costs={'linkedin': 10})
+    scheduler._observe_cost('linkedin', 0)
+    assert scheduler.channel_costs['linkedin'] == 10 * (1 - CampaignScheduler.COST_SMOOTHING)
+
+
+def test_run_empties_the_queue():
+    scheduler = CampaignScheduler(max_sends=1)
+    run(scheduler, [partner(1), partner(2)])
+    assert len(scheduler) == 0